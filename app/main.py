@@ -22,13 +22,24 @@ from app.ui.introduction_ui import IntroductionController, IntroductionTab
 from app.ui.mailbox_ui import MailboxUI
 from app.ui.mis_ui import MISUI
 from app.ui.telecom_ui import TelecomUI
+from modules.subject_triangulation.candidates import candidate_triangles, triangle_costs
 from modules.subject_triangulation.model import Triangle
+from shared.level_of_detail import enable_scroll_zoom
+from shared.telemetry import SolverProgress, StatusBarSink
 # Visualization imports
 from shared.visualization import (plot_antenna_solution, plot_mailbox_solution,
                                   plot_mis_solution, plot_telecom_solution,
                                   plot_triangulation_solution)
 
 
+def solver_progress(widget):
+    """SolverProgress reporting to the status bar of the widget's main window"""
+    window = widget.window()
+    if isinstance(window, QMainWindow):
+        return SolverProgress([StatusBarSink(window.statusBar())])
+    return None
+
+
 class MatplotlibCanvas(FigureCanvasQTAgg):
     def __init__(self, parent=None):
         fig = Figure(figsize=(5, 5))
@@ -37,6 +48,15 @@ class MatplotlibCanvas(FigureCanvasQTAgg):
         self.axes = fig.add_subplot(111)
         fig.tight_layout()
 
+    def show_figure(self, fig):
+        """Display a figure built by shared.visualization on this canvas"""
+        # Rebind the figure so that redraws triggered by its artists (level-of-detail
+        # layers, zoom) reach this canvas; event callbacks live on the figure.
+        fig.set_canvas(self)
+        self.figure = fig
+        enable_scroll_zoom(self)
+        self.draw()
+
 
 class MailboxController:
     """Controller for mailbox location module"""
@@ -151,7 +171,7 @@ class MailboxController:
                 max_coverage_level=params['max_coverage_level']
             )
 
-            result = solver.solve()
+            result = solver.solve(progress=solver_progress(self.parent))
             self.display_mailbox_results(result)
             self.plot_mailbox_solution(demand, result, radius)
             self.ui.lblMailboxStatus.setText("Status: Optimization completed")
@@ -190,8 +210,7 @@ class MailboxController:
             coverage_info=result['coverage_info'],
             radius=radius
         )
-        self.mailbox_canvas.figure = fig
-        self.mailbox_canvas.draw()
+        self.mailbox_canvas.show_figure(fig)
 
 
 class TelecomController:
@@ -376,7 +395,7 @@ class TelecomController:
                 budget=data['budget']
             )
 
-            result = solver.solve()
+            result = solver.solve(progress=solver_progress(self.parent))
             self.display_telecom_results(result)
             self.plot_telecom_solution(data['nodes'], result['selected_links'])
 
@@ -411,8 +430,7 @@ class TelecomController:
     def plot_telecom_solution(self, nodes, selected_links):
         self.telecom_canvas.figure.clear()
         fig = plot_telecom_solution(nodes, selected_links)
-        self.telecom_canvas.figure = fig
-        self.telecom_canvas.draw()
+        self.telecom_canvas.show_figure(fig)
 
 class AntennaController:
     """Controller for antenna placement module"""
@@ -545,7 +563,7 @@ class AntennaController:
                 max_antennas=data['max_antennas']
             )
 
-            result = solver.solve()
+            result = solver.solve(progress=solver_progress(self.parent))
             self.display_antenna_results(result)
             self.plot_antenna_solution(data['users'], result['selected_sites'], data['coverage_radius'])
 
@@ -584,8 +602,7 @@ class AntennaController:
     def plot_antenna_solution(self, users, selected_sites, coverage_radius):
         self.antenna_canvas.figure.clear()
         fig = plot_antenna_solution(users, selected_sites, coverage_radius)
-        self.antenna_canvas.figure = fig
-        self.antenna_canvas.draw()
+        self.antenna_canvas.show_figure(fig)
 
 
 class MISController:
@@ -743,7 +760,7 @@ class MISController:
                 weights=weights
             )
 
-            result = solver.solve()
+            result = solver.solve(progress=solver_progress(self.parent))
             self.display_mis_results(result)
             self.plot_mis_solution(data['tasks'], data['conflicts'], result['selected_tasks'])
 
@@ -780,8 +797,7 @@ class MISController:
     def plot_mis_solution(self, tasks, conflicts, selected_tasks):
         self.mis_canvas.figure.clear()
         fig = plot_mis_solution(tasks, conflicts, selected_tasks)
-        self.mis_canvas.figure = fig
-        self.mis_canvas.draw()
+        self.mis_canvas.show_figure(fig)
 
 
 from app.styles import STYLESHEET
@@ -832,6 +848,7 @@ class TriangulationController:
         # Setup connections
         self.ui.btnAddPoint.clicked.connect(self.add_point)
         self.ui.btnAddTriangle.clicked.connect(self.add_triangle)
+        self.ui.btnDelaunay.clicked.connect(self.generate_triangles)
         self.ui.btnSolve.clicked.connect(self.solve)
 
         # Setup matplotlib canvas
@@ -859,6 +876,23 @@ class TriangulationController:
         self.ui.tableTriangles.insertRow(row)
         self.ui.update_status(f"Added triangle row {row}")
 
+    def generate_triangles(self):
+        """Fill the triangle table with the Delaunay triangles of the points"""
+        points, _ = self.parse_input_data()
+        xy = [(p['x'], p['y']) for p in points]
+        triangles = candidate_triangles(xy)
+        if not len(triangles):
+            self.ui.update_status("Delaunay needs 3 non-collinear points", is_error=True)
+            return
+
+        costs = triangle_costs(xy, triangles)
+        self.ui.tableTriangles.setRowCount(len(triangles))
+        for row, (vertices, cost) in enumerate(zip(triangles.tolist(), costs.tolist())):
+            for col, v in enumerate(vertices):
+                self.ui.tableTriangles.setItem(row, col, QTableWidgetItem(str(v)))
+            self.ui.tableTriangles.setItem(row, 3, QTableWidgetItem(f"{cost:.3f}"))
+        self.ui.update_status(f"Generated {len(triangles)} Delaunay triangles")
+
     def parse_input_data(self):
         """Parse data from UI tables"""
         # Parse points
@@ -929,10 +963,11 @@ class TriangulationController:
             self.structure.min_triangles = self.ui.spinMinTriangles.value()
             self.structure.max_triangles = self.ui.spinMaxTriangles.value()
             self.structure.budget = self.ui.spinBudget.value()
+            self.structure.exact_partition = self.ui.chkExactPartition.isChecked()
 
             # Solve
             solver = SimpleTriangulationSolver(self.structure)
-            result = solver.solve_with_gurobi()
+            result = solver.solve_with_gurobi(progress=solver_progress(self.parent))
 
             # Display results
             self.display_results(result)
@@ -964,6 +999,24 @@ class TriangulationController:
         # Format successful results
         coverage_pct = result['coverage_rate'] * 100
 
+        # Heuristic solutions come with a lower bound on the optimal cost
+        extra_rows = ""
+        if result.get('lower_bound') is not None:
+            gap = f" (gap {100 * result['gap']:.1f}%)" if result.get('gap') is not None else ""
+            extra_rows = f"""
+            <tr style='background-color: #f8f9fa;'>
+                <td style='padding: 5px;'><b>Lower Bound:</b></td>
+                <td style='padding: 5px;'>{result['lower_bound']:.2f} €{gap}</td>
+            </tr>"""
+
+        # Exact partitions report the share of the hull area they tile
+        if result.get('area_coverage') is not None:
+            extra_rows += f"""
+            <tr>
+                <td style='padding: 5px;'><b>Hull Area Covered:</b></td>
+                <td style='padding: 5px;'>{result['covered_area']:.2f}/{result['hull_area']:.2f} ({100 * result['area_coverage']:.1f}%)</td>
+            </tr>"""
+
         html = f"""
         <h3 style='color: #2ecc71;'>✅ Optimization Successful</h3>
         <hr>
@@ -987,7 +1040,7 @@ class TriangulationController:
             <tr>
                 <td style='padding: 5px;'><b>Method:</b></td>
                 <td style='padding: 5px;'>{result.get('method', 'Gurobi')}</td>
-            </tr>
+            </tr>{extra_rows}
         </table>
 
         <h4>Selected Triangles:</h4>
@@ -1051,8 +1104,7 @@ class TriangulationController:
                 selected_triangles=triangles_data,
                 title="Truss Structure Optimization"
             )
-            self.canvas.figure = fig
-            self.canvas.draw()
+            self.canvas.show_figure(fig)
 
         except Exception as e:
             print(f"Error plotting: {e}")
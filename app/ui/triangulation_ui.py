@@ -198,6 +198,33 @@ class TriangulationUI(QWidget):
         self.spinBudget.setStyleSheet(self._get_doublespinbox_style())
         param_layout.addRow("💰 Budget:", self.spinBudget)
 
+        # Exact partition mode
+        self.chkExactPartition = QCheckBox("Exact partition (no overlap)")
+        self.chkExactPartition.setToolTip(
+            "Select non-overlapping triangles tiling the convex hull of the points")
+        self.chkExactPartition.setStyleSheet("""
+            QCheckBox {
+                spacing: 8px;
+                font-weight: bold;
+                color: #2c3e50;
+            }
+            QCheckBox::indicator {
+                width: 18px;
+                height: 18px;
+                border: 2px solid #bdc3c7;
+                border-radius: 3px;
+                background-color: white;
+            }
+            QCheckBox::indicator:checked {
+                background-color: #1abc9c;
+                border-color: #16a085;
+            }
+            QCheckBox::indicator:hover {
+                border-color: #1abc9c;
+            }
+        """)
+        param_layout.addRow("", self.chkExactPartition)
+
         # Objective function
         self.comboObjective = QComboBox()
         self.comboObjective.addItems([
@@ -241,8 +268,14 @@ class TriangulationUI(QWidget):
         self.btnAddTriangle.setProperty("class", "action")
         self.btnAddTriangle.setMinimumHeight(35)
 
+        self.btnDelaunay = QPushButton("🕸 Delaunay Triangles")
+        self.btnDelaunay.setProperty("class", "action")
+        self.btnDelaunay.setMinimumHeight(35)
+        self.btnDelaunay.setToolTip("Replace the triangles with the Delaunay triangles of the points")
+
         action_buttons_layout.addWidget(self.btnAddPoint)
         action_buttons_layout.addWidget(self.btnAddTriangle)
+        action_buttons_layout.addWidget(self.btnDelaunay)
 
         left_layout.addLayout(action_buttons_layout)
 
@@ -5,202 +5,25 @@ Left-click node: toggle support (orange square)
 Right-click node: set load node (red circle)
 Run -> solver finds areas, forces, and topology (z)
 """
-import math
 import numpy as np
-from itertools import combinations
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                                QLabel, QSpinBox, QDoubleSpinBox, QFileDialog,
-                               QSplitter, QGroupBox, QFormLayout, QTextEdit, QFrame)
+                               QSplitter, QGroupBox, QFormLayout, QTextEdit, QFrame,
+                               QComboBox, QCheckBox, QDialog)
 from PySide6.QtCore import Qt
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
 
-# Try to import Gurobi
-try:
-    import gurobipy as gp
-    from gurobipy import GRB
-    GUROBI_AVAILABLE = True
-except ImportError as e:
-    gp = None
-    GRB = None
-    GUROBI_AVAILABLE = False
-    GurobiImportError = e
-
-
-# ---------- Geometry utils ----------
-def length_and_dir(nodes, edge):
-    i, j = edge
-    xi, yi = nodes[i]
-    xj, yj = nodes[j]
-    dx = xj - xi
-    dy = yj - yi
-    L = math.hypot(dx, dy)
-    if L == 0:
-        return 0.0, 0.0, 0.0
-    return L, dx / L, dy / L
-
-
-# ---------- Solver ----------
-def solve_physical_truss(nodes, edges, supports, load_node, load_vector,
-                         rho=7850.0, sigma_allow=250e6,
-                         A_min=1e-6, A_max=5e-4,
-                         min_bar_ratio=0.02, length_penalty=0.0,
-                         time_limit=60, mip_gap=1e-3, verbose=False):
-    """
-    Physical truss optimization solver
-    
-    Parameters:
-    -----------
-    nodes: list of (x,y)
-    edges: list of (i,j) candidate edges (undirected, i<j)
-    supports: list of bool (True if node is fixed support)
-    load_node: index of node with external load
-    load_vector: (Fx,Fy) applied at load_node (N)
-    
-    Returns:
-    --------
-    dict with areas, forces, z, objective, A_max...
-    """
-    if gp is None:
-        raise RuntimeError(f"Gurobi not available: {GurobiImportError}")
-
-    n_nodes = len(nodes)
-    n_edges = len(edges)
-    
-    # Precompute geometry
-    L = [0.0] * n_edges
-    dirx = [0.0] * n_edges
-    diry = [0.0] * n_edges
-    incident = [[] for _ in range(n_nodes)]
-    
-    for k, e in enumerate(edges):
-        Li, dx, dy = length_and_dir(nodes, e)
-        L[k] = Li
-        dirx[k] = dx
-        diry[k] = dy
-        i, j = e
-        incident[i].append(k)
-        incident[j].append(k)
-
-    # Required nodes for connectivity: supports + load_node
-    required_nodes = [i for i, s in enumerate(supports) if s]
-    if load_node is not None and load_node not in required_nodes:
-        required_nodes.append(load_node)
-    if len(required_nodes) < 2:
-        raise RuntimeError("At least two required nodes (supports + load) needed for connectivity.")
-
-    # Build Gurobi model
-    m = gp.Model("physical_truss")
-    if not verbose:
-        m.setParam('OutputFlag', 0)
-    m.setParam('TimeLimit', float(time_limit))
-    m.setParam('MIPGap', float(mip_gap))
-
-    # Variables
-    A = m.addVars(n_edges, lb=0.0, ub=A_max, name="A")  # cross sectional areas
-    F = m.addVars(n_edges, lb=-GRB.INFINITY, ub=GRB.INFINITY, name="F")  # axial forces
-    z = m.addVars(n_edges, vtype=GRB.BINARY, name="z")  # topology on/off
-
-    # Flow variables for connectivity
-    R = len(required_nodes)
-    f = {}
-    for k, (i, j) in enumerate(edges):
-        f[(i, j)] = m.addVar(lb=0.0, ub=R, name=f"f_{i}_{j}")
-        f[(j, i)] = m.addVar(lb=0.0, ub=R, name=f"f_{j}_{i}")
-        # flow only if edge active
-        m.addConstr(f[(i, j)] <= R * z[k])
-        m.addConstr(f[(j, i)] <= R * z[k])
-
-    # Objective: minimize weight + length_penalty * sum(L * z)
-    weight = gp.quicksum(rho * A[k] * L[k] for k in range(n_edges))
-    length_pen = length_penalty * gp.quicksum(L[k] * z[k] for k in range(n_edges)) if length_penalty > 0 else 0
-    m.setObjective(weight + length_pen, GRB.MINIMIZE)
-
-    # Equilibrium constraints
-    for ni in range(n_nodes):
-        if supports[ni]:
-            continue
-        sum_x = gp.LinExpr()
-        sum_y = gp.LinExpr()
-        for k, (i, j) in enumerate(edges):
-            dx = dirx[k]
-            dy = diry[k]
-            if i == ni:
-                sum_x += F[k] * dx
-            elif j == ni:
-                sum_x += -F[k] * dx
-
-            if i == ni:
-                sum_y += F[k] * dy
-            elif j == ni:
-                sum_y += -F[k] * dy
-
-        # External loads
-        Fx, Fy = (0.0, 0.0)
-        if load_node == ni:
-            Fx, Fy = load_vector
-        m.addConstr(sum_x == Fx, name=f"eq_x_{ni}")
-        m.addConstr(sum_y == Fy, name=f"eq_y_{ni}")
-
-    # Stress constraints
-    for k in range(n_edges):
-        m.addConstr(F[k] <= sigma_allow * A[k], name=f"stress_pos_{k}")
-        m.addConstr(-F[k] <= sigma_allow * A[k], name=f"stress_neg_{k}")
-        # Link A <-> z
-        m.addConstr(A[k] <= A_max * z[k], name=f"A_up_{k}")
-        m.addConstr(A[k] >= A_min * z[k], name=f"A_low_{k}")
-
-    # Ensure each required node has at least one incident active member
-    for v in required_nodes:
-        if incident[v]:
-            m.addConstr(gp.quicksum(z[e] for e in incident[v]) >= 1, name=f"req_conn_{v}")
-
-    # Flow conservation for connectivity
-    root = required_nodes[0]
-    for v in range(n_nodes):
-        inflow = gp.LinExpr()
-        outflow = gp.LinExpr()
-        
-        for (i, j) in edges:
-            if j == v:
-                inflow += f[(i, j)]
-                outflow += f[(j, i)]
-            if i == v:
-                outflow += f[(i, j)]
-                inflow += f[(j, i)]
-
-        if v == root:
-            m.addConstr(outflow - inflow == R - 1, name=f"flow_root")
-        elif v in required_nodes:
-            m.addConstr(inflow - outflow == 1, name=f"flow_req_{v}")
-        else:
-            m.addConstr(inflow - outflow == 0, name=f"flow_free_{v}")
-
-    # Minimum sparsity constraint
-    min_bars = max(1, int(min_bar_ratio * n_edges))
-    m.addConstr(gp.quicksum(z[k] for k in range(n_edges)) >= min_bars, name="min_bars")
-
-    # Solve
-    m.optimize()
-
-    status = m.Status
-    if status not in (GRB.OPTIMAL, GRB.SUBOPTIMAL, GRB.TIME_LIMIT):
-        raise RuntimeError(f"Solver status {status}")
-
-    areas = [A[k].X for k in range(n_edges)]
-    forces = [F[k].X for k in range(n_edges)]
-    zs = [z[k].X for k in range(n_edges)]
-    objective = m.ObjVal if m.SolCount > 0 else None
-
-    return {
-        'areas': areas,
-        'forces': forces,
-        'z': zs,
-        'objective': objective,
-        'status': status,
-        'A_max': A_max,
-        'model': m
-    }
+from modules.subject_truss.ground_structure import (FULL, NEAREST, WINDOW,
+                                                   GroundStructure, window_edges)
+from modules.subject_truss.continuation import TrussModel
+from modules.subject_truss.solver import (GUROBI_AVAILABLE, MEMBER_ADDING, MILP,
+                                         GurobiImportError, length_and_dir,
+                                         solve_physical_truss)
+from shared.level_of_detail import ViewportLayer, enable_scroll_zoom
+from shared.telemetry import SolverProgress, StatusBarSink
 
 
 class TrussOptimizerCanvas(FigureCanvas):
@@ -215,14 +38,21 @@ class TrussOptimizerCanvas(FigureCanvas):
         self.load_node = None
         self.last_solution = []
         self.last_A_max = 5e-4
+        enable_scroll_zoom(self)
         
     def clear_plot(self):
         """Clear the plot"""
         self.ax.clear()
         self.draw()
         
-    def draw_truss(self, nodes, supports, load_node, last_solution=None, last_A_max=5e-4):
-        """Draw the truss structure"""
+    def draw_truss(self, nodes, supports, load_node, last_solution=None, last_A_max=5e-4,
+                   edges=None):
+        """Draw the truss structure (edges: candidate members, default 2.0 window)"""
+        # Keep the user's zoom across redraws of the same grid (clicks, solves)
+        keep_view = None
+        if self.nodes and nodes == self.nodes:
+            keep_view = (self.ax.get_xlim(), self.ax.get_ylim())
+
         self.ax.clear()
         self.nodes = nodes
         self.supports = supports
@@ -232,49 +62,65 @@ class TrussOptimizerCanvas(FigureCanvas):
             self.last_solution = last_solution
             self.last_A_max = last_A_max
         
+        xy = np.asarray(self.nodes, dtype=float).reshape(-1, 2)
+
         # Find max coordinates for setting limits
-        max_x = max(x for x, y in self.nodes) if self.nodes else 1
-        max_y = max(y for x, y in self.nodes) if self.nodes else 1
-        
-        # Draw candidate edges (near neighbors)
-        for i, j in combinations(range(len(nodes)), 2):
-            xi, yi = nodes[i]
-            xj, yj = nodes[j]
-            di = abs(xi - xj)
-            dj = abs(yi - yj)
-            if di <= 2.0 and dj <= 2.0:
-                self.ax.plot([xi, xj], [yi, yj], color='lightgray', linewidth=0.6, zorder=1)
+        max_x = xy[:, 0].max() if len(xy) else 1
+        max_y = xy[:, 1].max() if len(xy) else 1
+        
+        # Draw candidate edges
+        candidates = edges if edges is not None else window_edges(nodes)
+        if candidates:
+            self.ax.add_collection(LineCollection(xy[np.asarray(candidates)], colors='lightgray',
+                                                  linewidths=0.6, zorder=1))
         
         # Draw active solution
         max_lw = 8.0
         if self.last_solution:
-            for (i, j, area, force) in self.last_solution:
-                xi, yi = self.nodes[i]
-                xj, yj = self.nodes[j]
-                lw = max(1.0, (area / self.last_A_max) * max_lw)
-                col = 'tab:red' if force > 1e-9 else ('tab:blue' if force < -1e-9 else 'white')
-                self.ax.plot([xi, xj], [yi, yj], color=col, alpha=0 if col=="white" else 1, 
-                            linewidth=lw, zorder=4)
+            ends = np.array([(i, j) for (i, j, _, _) in self.last_solution], dtype=int)
+            areas = np.array([area for (_, _, area, _) in self.last_solution])
+            forces = np.array([force for (_, _, _, force) in self.last_solution])
+            active = np.abs(forces) > 1e-9
+            if active.any():
+                lws = np.maximum(1.0, (areas[active] / self.last_A_max) * max_lw)
+                cols = np.where(forces[active] > 0, 'tab:red', 'tab:blue')
+                self.ax.add_collection(LineCollection(xy[ends[active]], colors=cols.tolist(),
+                                                      linewidths=lws, zorder=4))
         
         # Draw nodes
-        for idx, (x, y) in enumerate(self.nodes):
-            if self.supports[idx]:
-                self.ax.scatter([x], [y], marker='s', s=100, color='orange', zorder=5)
-            elif self.load_node == idx:
-                self.ax.scatter([x], [y], marker='o', s=100, color='red', zorder=6)
-                # Draw load arrow
-                arrow_len = 0.8
-                self.ax.annotate('', xy=(x, y - arrow_len), xytext=(x, y),
-                               arrowprops=dict(facecolor='red', edgecolor='red', lw=2, 
-                                             arrowstyle='-|>', shrinkA=0, mutation_scale=20),
-                               zorder=7)
-            else:
-                self.ax.scatter([x], [y], marker='o', s=30, color='k', zorder=3)
-            self.ax.text(x + 0.05, y + 0.05, str(idx), color='black', fontsize=8)
+        support_mask = np.asarray(self.supports, dtype=bool)
+        load_mask = np.zeros(len(xy), dtype=bool)
+        if self.load_node is not None:
+            load_mask[self.load_node] = True
+        load_mask &= ~support_mask
+        free_mask = ~(support_mask | load_mask)
+
+        self.ax.scatter(xy[free_mask, 0], xy[free_mask, 1], marker='o', s=30, color='k', zorder=3)
+        self.ax.scatter(xy[support_mask, 0], xy[support_mask, 1], marker='s', s=100,
+                        color='orange', zorder=5)
+        if load_mask.any():
+            x, y = xy[self.load_node]
+            self.ax.scatter([x], [y], marker='o', s=100, color='red', zorder=6)
+            # Draw load arrow
+            arrow_len = 0.8
+            self.ax.annotate('', xy=(x, y - arrow_len), xytext=(x, y),
+                           arrowprops=dict(facecolor='red', edgecolor='red', lw=2, 
+                                         arrowstyle='-|>', shrinkA=0, mutation_scale=20),
+                           zorder=7)
+
+        # Node indices only once few enough nodes are in view
+        ViewportLayer(self.ax, xy, labels=[str(idx) for idx in range(len(xy))],
+                      label_kwargs=dict(xytext=(3, 3), textcoords='offset points',
+                                        color='black', fontsize=8),
+                      points=False)
         
         self.ax.set_aspect('equal', 'box')
-        self.ax.set_xlim(-1, max_x + 1)
-        self.ax.set_ylim(-1, max_y + 1)
+        if keep_view:
+            self.ax.set_xlim(*keep_view[0])
+            self.ax.set_ylim(*keep_view[1])
+        else:
+            self.ax.set_xlim(-1, max_x + 1)
+            self.ax.set_ylim(-1, max_y + 1)
         self.ax.set_xticks([])
         self.ax.set_yticks([])
         self.ax.set_title("Truss Physical Optimizer", fontsize=12, fontweight='bold')
@@ -398,6 +244,52 @@ class TrussOptimizerUI(QWidget):
         bottom_layout.addWidget(self.time_spin)
         form.addRow("⏱️ Solver:", bottom_row)
 
+        # Ground structure connectivity
+        self.connectivity_combo = QComboBox()
+        self.connectivity_combo.addItem("Neighbours (2.0 window)", WINDOW)
+        self.connectivity_combo.addItem("Nearest 8", NEAREST)
+        self.connectivity_combo.addItem("Full (no overlaps)", FULL)
+        form.addRow("🕸️ Candidates:", self.connectivity_combo)
+
+        # Solution mode: (mode, polish)
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItem("Topology MILP", (MILP, False))
+        self.mode_combo.addItem("LP (member adding)", (MEMBER_ADDING, False))
+        self.mode_combo.addItem("LP + MILP polish", (MEMBER_ADDING, True))
+        form.addRow("🧮 Mode:", self.mode_combo)
+
+        # Mirror symmetry reduction (MILP mode)
+        # Off by default: the reduced MILP only searches mirror-symmetric designs
+        self.symmetry_check = QCheckBox("Detect mirror symmetry")
+        self.symmetry_check.setChecked(False)
+        self.symmetry_check.setToolTip("Faster MILP restricted to mirror-symmetric designs; "
+                                       "an asymmetric design may be lighter")
+        form.addRow("🪞 Symmetry:", self.symmetry_check)
+
+        # Continuation sweep of the load or the allowable stress (MILP)
+        sweep_row = QWidget()
+        sweep_layout = QHBoxLayout(sweep_row)
+        sweep_layout.setContentsMargins(0, 0, 0, 0)
+        self.sweep_combo = QComboBox()
+        self.sweep_combo.addItem("Load (N)", 'load')
+        self.sweep_combo.addItem("Allowable Stress (Pa)", 'sigma')
+        self.sweep_from_spin = QDoubleSpinBox()
+        self.sweep_from_spin.setRange(-1e9, 1e9)
+        self.sweep_from_spin.setValue(-500)
+        self.sweep_to_spin = QDoubleSpinBox()
+        self.sweep_to_spin.setRange(-1e9, 1e9)
+        self.sweep_to_spin.setValue(-5000)
+        self.sweep_steps_spin = QSpinBox()
+        self.sweep_steps_spin.setRange(2, 100)
+        self.sweep_steps_spin.setValue(10)
+        sweep_layout.addWidget(self.sweep_combo)
+        sweep_layout.addWidget(self.sweep_from_spin)
+        sweep_layout.addWidget(QLabel("→"))
+        sweep_layout.addWidget(self.sweep_to_spin)
+        sweep_layout.addWidget(QLabel("Steps:"))
+        sweep_layout.addWidget(self.sweep_steps_spin)
+        form.addRow("📈 Sweep:", sweep_row)
+
         left_layout.addWidget(control_card)
 
         # Action buttons
@@ -407,7 +299,9 @@ class TrussOptimizerUI(QWidget):
         self.clear_btn = QPushButton("Clear Supports/Load")
         self.export_btn = QPushButton("Export CSV")
         self.export_btn.setEnabled(False)
+        self.sweep_btn = QPushButton("Sweep")
         actions.addWidget(self.solve_btn)
+        actions.addWidget(self.sweep_btn)
         actions.addWidget(self.clear_btn)
         actions.addWidget(self.export_btn)
         left_layout.addLayout(actions)
@@ -463,6 +357,23 @@ class TrussOptimizerUI(QWidget):
 
         main_layout.addWidget(splitter)
 
+    def show_sweep(self, values, masses, label):
+        """Plot the mass against the swept parameter in a dialog"""
+        dialog = QDialog(self)
+        dialog.setWindowTitle("📈 Continuation Sweep")
+        dialog.resize(640, 440)
+        fig = Figure(figsize=(6, 4))
+        canvas = FigureCanvas(fig)
+        ax = fig.add_subplot(111)
+        ax.plot(values, masses, 'o-', color='#16a085')
+        ax.set_xlabel(label)
+        ax.set_ylabel("Mass (kg)")
+        ax.grid(True, alpha=0.3)
+        fig.tight_layout()
+        QVBoxLayout(dialog).addWidget(canvas)
+        dialog.show()
+        self._sweep_dialog = dialog
+
 
 class TrussOptimizerController:
     """Controller for Truss Physical Optimizer"""
@@ -484,6 +395,11 @@ class TrussOptimizerController:
         self.load_node = None
         self.last_solution = []
         self.last_A_max = 5e-4
+        self.ground_structure = GroundStructure()
+        # MILP kept between runs for warm-started re-solves
+        self.truss_model = None
+        self.truss_model_key = None
+        self.truss_model_load = 0.0
         
         # Setup connections
         self.setup_connections()
@@ -497,6 +413,8 @@ class TrussOptimizerController:
         self.ui.solve_btn.clicked.connect(self.run_optimization)
         self.ui.clear_btn.clicked.connect(self.clear_all)
         self.ui.export_btn.clicked.connect(self.export_csv)
+        self.ui.sweep_btn.clicked.connect(self.run_sweep)
+        self.ui.connectivity_combo.currentIndexChanged.connect(self.change_connectivity)
         
         # Connect canvas mouse events
         self.ui.canvas.mpl_connect("button_press_event", self.on_canvas_click)
@@ -521,6 +439,15 @@ class TrussOptimizerController:
         self.draw()
         self.update_status(f"Generated {nx}x{ny} grid with {len(self.nodes)} nodes")
         
+    def change_connectivity(self):
+        """Switch the ground structure connectivity level"""
+        self.ground_structure.set_connectivity(self.ui.connectivity_combo.currentData())
+        self.last_solution = []
+        self.ui.export_btn.setEnabled(False)
+        self.draw()
+        edges = self.ground_structure.edges(self.nodes)
+        self.update_status(f"{self.ui.connectivity_combo.currentText()}: {len(edges)} candidate bars")
+
     def clear_all(self):
         """Clear all supports and load"""
         self.supports = [False] * len(self.nodes)
@@ -564,68 +491,150 @@ class TrussOptimizerController:
     def draw(self):
         """Draw the current state"""
         self.ui.canvas.draw_truss(self.nodes, self.supports, self.load_node, 
-                                 self.last_solution, self.last_A_max)
+                                 self.last_solution, self.last_A_max,
+                                 edges=self.ground_structure.edges(self.nodes))
         
-    def run_optimization(self):
-        """Run the physical truss optimization"""
+    def _candidate_edges(self):
+        """Check the inputs; candidate edges, or None after warning the user"""
         from PySide6.QtWidgets import QMessageBox
-        from PySide6.QtWidgets import QApplication
-        
+
         if not GUROBI_AVAILABLE:
             QMessageBox.critical(self.parent, "Gurobi Missing", 
                                f"Gurobi is not available: {GurobiImportError}\n"
                                "Please install Gurobi to use this feature.")
-            return
+            return None
             
         # Check inputs
         supports_count = sum(1 for s in self.supports if s)
         if supports_count < 2:
             QMessageBox.warning(self.parent, "Supports Required", 
                               "Select at least two fixed supports (left-click nodes).")
-            return
+            return None
         if self.load_node is None:
             QMessageBox.warning(self.parent, "Load Required", 
                               "Set a load node (right-click a node).")
-            return
+            return None
             
-        # Build candidate edges (near neighbors)
-        edges = []
-        for i, j in combinations(range(len(self.nodes)), 2):
-            xi, yi = self.nodes[i]
-            xj, yj = self.nodes[j]
-            if abs(xi - xj) <= 2.0 and abs(yi - yj) <= 2.0:
-                edges.append((i, j))
+        # Candidate edges (cached until the grid or connectivity changes)
+        edges = self.ground_structure.edges(self.nodes)
                 
         if not edges:
             QMessageBox.critical(self.parent, "No Edges", 
                                "No candidate edges found. Try a different grid configuration.")
-            return
-            
-        # Get parameters
+            return None
+        return edges
+
+    def _milp_model(self, edges):
+        """
+        MILP for the current inputs: the previous model with its parameters
+        updated in place while the grid, supports, load node, candidates and
+        symmetry setting are unchanged, a new one otherwise.
+        """
         sigma = float(self.ui.sigma_spin.value())
-        min_ratio = float(self.ui.min_ratio_spin.value())
-        alpha = float(self.ui.len_pen_spin.value())
-        tlim = int(self.ui.time_spin.value())
         load_val = float(self.ui.load_spin.value())
         A_max_val = float(self.ui.A_max_spin.value())
-        load_vec = (0.0, load_val)  # Vertical load
+        params = {
+            'sigma_allow': sigma,
+            'A_max': A_max_val,
+            'min_bar_ratio': float(self.ui.min_ratio_spin.value()),
+            'length_penalty': float(self.ui.len_pen_spin.value()),
+            'time_limit': int(self.ui.time_spin.value()),
+        }
+        symmetry = self.ui.symmetry_check.isChecked()
+        key = (tuple(self.nodes), tuple(self.supports), self.load_node, tuple(edges), symmetry)
+
+        if self.truss_model is None or key != self.truss_model_key or self.truss_model_load == 0:
+            self.truss_model = TrussModel(
+                self.nodes, edges, self.supports, self.load_node, (0.0, load_val),  # Vertical load
+                rho=7850.0, A_min=1e-6, mip_gap=1e-3, verbose=False,
+                symmetry=symmetry, **params
+            )
+            self.truss_model_key = key
+            self.truss_model_load = load_val
+        else:
+            self.truss_model.update(load_factor=load_val / self.truss_model_load, **params)
+        return self.truss_model
+
+    def run_optimization(self):
+        """Run the physical truss optimization"""
+        from PySide6.QtWidgets import QMessageBox
+        from PySide6.QtWidgets import QApplication
+        
+        edges = self._candidate_edges()
+        if edges is None:
+            return
+            
+        mode, polish = self.ui.mode_combo.currentData()
         
         self.update_status("Solving optimization...")
         QApplication.processEvents()  # Update UI
         
+        progress = SolverProgress([StatusBarSink(self.ui.status_label)])
         try:
-            result = solve_physical_truss(
-                self.nodes, edges, self.supports, self.load_node, load_vec,
-                rho=7850.0, sigma_allow=sigma,
-                A_min=1e-6, A_max=A_max_val,
-                min_bar_ratio=min_ratio, length_penalty=alpha,
-                time_limit=tlim, mip_gap=1e-3, verbose=False
-            )
+            if mode == MILP:
+                # Warm-started from the previous run when only parameters changed
+                result = self._milp_model(edges).solve(progress=progress)
+            else:
+                result = solve_physical_truss(
+                    self.nodes, edges, self.supports, self.load_node,
+                    (0.0, float(self.ui.load_spin.value())),  # Vertical load
+                    rho=7850.0, sigma_allow=float(self.ui.sigma_spin.value()),
+                    A_min=1e-6, A_max=float(self.ui.A_max_spin.value()),
+                    min_bar_ratio=float(self.ui.min_ratio_spin.value()),
+                    length_penalty=float(self.ui.len_pen_spin.value()),
+                    time_limit=int(self.ui.time_spin.value()), mip_gap=1e-3, verbose=False,
+                    mode=mode, polish=polish, progress=progress
+                )
         except Exception as e:
             QMessageBox.critical(self.parent, "Solver Error", str(e))
             self.update_status(f"Error: {str(e)}", is_error=True)
             return
             
+        active_count = self.show_result(result, edges)
+        self.update_status(f"Optimization complete: {active_count} active bars")
+
+    def run_sweep(self):
+        """Trace the mass against the load or the allowable stress by continuation"""
+        from PySide6.QtWidgets import QMessageBox
+        from PySide6.QtWidgets import QApplication
+
+        edges = self._candidate_edges()
+        if edges is None:
+            return
+
+        parameter = self.ui.sweep_combo.currentData()
+        values = np.linspace(self.ui.sweep_from_spin.value(), self.ui.sweep_to_spin.value(),
+                             self.ui.sweep_steps_spin.value())
+        model = self._milp_model(edges)
+        if parameter == 'load':
+            # Loads are swept as factors of the model's reference load
+            steps = model.sweep('load_factor', values / self.truss_model_load)
+        else:
+            steps = model.sweep('sigma_allow', values)
+
+        masses = []
+        result = None
+        try:
+            for k, (_, result) in enumerate(steps):
+                masses.append(self._mass(result, edges))
+                self.update_status(f"Sweep {k + 1}/{len(values)}: mass {masses[-1]:.4f} kg")
+                QApplication.processEvents()  # Update UI
+        except Exception as e:
+            QMessageBox.critical(self.parent, "Solver Error", str(e))
+            self.update_status(f"Error: {str(e)}", is_error=True)
+            return
+
+        self.show_result(result, edges)
+        self.ui.show_sweep(values[:len(masses)], masses, self.ui.sweep_combo.currentText())
+        self.update_status(f"Sweep complete: {len(masses)} solves")
+
+    def _mass(self, result, edges):
+        """Mass of the active bars of a result (kg)"""
+        return sum(7850.0 * result['areas'][k] * length_and_dir(self.nodes, e)[0]
+                   for k, e in enumerate(edges) if result['z'][k] > 0.5)
+
+    def show_result(self, result, edges):
+        """Draw a solver result and fill the results panel; returns the active bar count"""
         # Process results
         areas = result['areas']
         forces = result['forces']
@@ -648,6 +657,19 @@ class TrussOptimizerController:
         
         # Display results
         obj_weight = result['objective'] if result['objective'] is not None else 0.0
+        solver_details = ""
+        if result.get('symmetry'):
+            solver_details += (f"<b>Symmetry:</b> {', '.join(result['symmetry'])} "
+                               f"({result['model'].NumVars} variables)<br>"
+                               "<span style='color: #e67e22'>⚠ Restricted to mirror-symmetric "
+                               "designs: an asymmetric design may be lighter</span><br>")
+        if result.get('warm_start'):
+            solver_details += "<b>Warm Start:</b> previous design<br>"
+        if 'iterations' in result:
+            solver_details += (f"<b>Member Adding:</b> {result['iterations']} LP solves, "
+                               f"{result['active_members']}/{len(edges)} members priced in, "
+                               f"LP mass {result['lp_objective']:.4f} kg"
+                               f"{'' if result['converged'] else ' (not converged)'}<br>")
         
         results_text = f"""
         <b>OPTIMIZATION RESULTS</b>
@@ -657,6 +679,7 @@ class TrussOptimizerController:
         <b>Active Bars:</b> {active_count}/{len(edges)}<br>
         <b>Total Mass:</b> {total_weight:.4f} kg (ρ=7850 kg/m³)<br>
         <b>Maximum Area (A_max):</b> {self.last_A_max:.2e} m²<br>
+        {solver_details}
         <br>
         <b>Visualization:</b><br>
         • <span style='color: red'>Red bars</span>: Tension (force > 0)<br>
@@ -665,7 +688,7 @@ class TrussOptimizerController:
         """
         
         self.ui.results_text.setText(results_text)
-        self.update_status(f"Optimization complete: {active_count} active bars")
+        return active_count
         
     def export_csv(self):
         """Export results to CSV"""
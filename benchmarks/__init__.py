@@ -0,0 +1,11 @@
+"""
+Performance benchmarks
+
+Run a benchmark as a module from the repository root, e.g.:
+    python -m benchmarks.truss_build
+
+benchmarks.run solves seeded synthetic instances of every problem type
+(benchmarks.generators) and compares the results with a baseline file:
+    python -m benchmarks.run --output baseline.json
+    python -m benchmarks.run --baseline baseline.json
+"""
@@ -0,0 +1,191 @@
+"""
+Seeded synthetic instances for the six problem types.
+
+Every generator takes the instance size n (the main element count: demand
+points, network nodes, users, tasks, points or truss nodes) and a seed, and
+returns the keyword arguments of the matching solver in the dict and list
+formats the solvers consume. The same (n, seed) always gives the same
+instance.
+
+Neighbour structures (network links, candidate triangles, conflicts) are
+built locally, so generating stays near-linear up to SIZES['huge']. Some
+solvers still build dense data (the telecom demand matrix, the MIS
+adjacency matrix, the antenna connection costs), which is what the large
+sizes are meant to expose.
+"""
+import numpy as np
+from scipy.spatial import cKDTree
+
+from modules.subject_truss.ground_structure import window_edges
+
+# Named sizes, from toy to 100k elements
+SIZES = {
+    'toy': 10,
+    'small': 100,
+    'medium': 1_000,
+    'large': 10_000,
+    'huge': 100_000,
+}
+
+
+def _rng(seed):
+    return np.random.default_rng(seed)
+
+
+def _points(rng, n, half_width):
+    """n uniform points in the square [-half_width, half_width]^2"""
+    return rng.uniform(-half_width, half_width, size=(n, 2)).round(3)
+
+
+def mailbox(n, seed=0):
+    """n demand points in [-10, 10]^2, about sqrt(n)/2 mailboxes"""
+    rng = _rng(seed)
+    xy = _points(rng, n, 10.0)
+    population = rng.integers(1, 100, size=n)
+    num_mailboxes = max(2, int(round(np.sqrt(n) / 2)))
+    return {
+        'demand_points': [{'x': float(x), 'y': float(y), 'population': int(p)}
+                          for (x, y), p in zip(xy.tolist(), population.tolist())],
+        'num_mailboxes': num_mailboxes,
+        'radius': round(10.0 / np.sqrt(num_mailboxes), 3),
+    }
+
+
+def telecom(n, seed=0, k=4):
+    """
+    n network nodes, links both ways to the k nearest neighbours (the solver
+    routes flow along 'from' -> 'to'), gravity-model demands scaled so that
+    a node's demand fits on its links
+    """
+    rng = _rng(seed)
+    xy = _points(rng, n, 5.0 * np.sqrt(n))
+    k = min(k, n - 1)
+    pairs = set()
+    if k > 0:
+        _, idx = cKDTree(xy).query(xy, k=k + 1)
+        for i, row in enumerate(idx[:, 1:].tolist()):
+            pairs.update((i, j) if i < j else (j, i) for j in row)
+    pairs = sorted(pairs)
+
+    weight = rng.integers(1, 10, size=n).astype(float)
+    demands = np.rint(np.outer(weight, weight) * rng.uniform(0.5, 1.5, size=(n, n))
+                      * 20.0 / max(n - 1, 1))
+    np.fill_diagonal(demands, 0)
+    return {
+        'nodes': [{'id': i, 'name': f"N{i}", 'x': float(x), 'y': float(y)}
+                  for i, (x, y) in enumerate(xy.tolist())],
+        'potential_links': [{'from': i, 'to': j,
+                             'distance': round(float(np.hypot(*(xy[i] - xy[j]))), 3)}
+                            for a, b in pairs for i, j in ((a, b), (b, a))],
+        'demands': demands.astype(int).tolist(),
+    }
+
+
+def antenna(n, seed=0):
+    """n users and about sqrt(n) candidate sites, radius sized for ~4 sites per user"""
+    rng = _rng(seed)
+    half_width = 5.0 * np.sqrt(n / 10.0) + 5.0
+    users = _points(rng, n, half_width)
+    n_sites = max(3, int(round(np.sqrt(n))))
+    sites = _points(rng, n_sites, half_width)
+    demand = rng.integers(1, 20, size=n)
+    radius = 2 * half_width * np.sqrt(4.0 / (np.pi * n_sites))
+    return {
+        'users': [{'id': i, 'x': float(x), 'y': float(y), 'demand': int(d)}
+                  for i, ((x, y), d) in enumerate(zip(users.tolist(), demand.tolist()))],
+        'candidate_sites': [{'id': j, 'name': f"S{j}", 'x': float(x), 'y': float(y)}
+                            for j, (x, y) in enumerate(sites.tolist())],
+        'coverage_radius': round(float(radius), 3),
+    }
+
+
+def mis(n, seed=0, resources=4, horizon=None):
+    """
+    n tasks with a time window on one of a few resources; tasks overlapping
+    on the same resource conflict (an interval graph per resource)
+    """
+    rng = _rng(seed)
+    horizon = horizon or 10.0 * n / resources
+    start = rng.uniform(0, horizon, size=n).round(2)
+    duration = rng.integers(1, 30, size=n)
+    resource = rng.integers(0, resources, size=n)
+    priority = rng.integers(1, 6, size=n)
+    tasks = [{'id': i, 'name': f"T{i}", 'duration': int(d), 'priority': int(p),
+              'resource': f"R{r}", 'start': float(s)}
+             for i, (s, d, r, p) in enumerate(zip(start.tolist(), duration.tolist(),
+                                                  resource.tolist(), priority.tolist()))]
+
+    # Sweep every resource in start order, keeping the tasks still running
+    end = start + duration
+    conflicts = []
+    for r in range(resources):
+        running = []
+        for i in np.flatnonzero(resource == r)[np.argsort(start[resource == r])].tolist():
+            running = [j for j in running if end[j] > start[i]]
+            conflicts.extend((j, i) if j < i else (i, j) for j in running)
+            running.append(i)
+    conflicts.sort()
+    return {'tasks': tasks, 'conflicts': conflicts}
+
+
+def triangulation(n, seed=0, k=4):
+    """
+    n points and candidate triangles joining every point to pairs of its k
+    nearest neighbours, costed by area plus perimeter
+
+    Returns 'points' as (x, y) and 'triangles' as ((i, j, k), cost), for
+    TrussStructure.add_points/add_triangles, and the structure parameters.
+    """
+    rng = _rng(seed)
+    xy = _points(rng, n, 10.0)
+    k = min(k, n - 1)
+    triangles = set()
+    if k >= 2:
+        _, idx = cKDTree(xy).query(xy, k=k + 1)
+        for i, row in enumerate(idx[:, 1:].tolist()):
+            for a in range(k):
+                for b in range(a + 1, k):
+                    triangles.add(tuple(sorted((i, row[a], row[b]))))
+    tri = np.array(sorted(triangles), dtype=np.int64).reshape(-1, 3)
+    p, q, r = xy[tri[:, 0]], xy[tri[:, 1]], xy[tri[:, 2]]
+    area = 0.5 * np.abs((q[:, 0] - p[:, 0]) * (r[:, 1] - p[:, 1])
+                        - (r[:, 0] - p[:, 0]) * (q[:, 1] - p[:, 1]))
+    perimeter = (np.hypot(*(q - p).T) + np.hypot(*(r - q).T) + np.hypot(*(p - r).T))
+    cost = (1.0 + area + 0.1 * perimeter).round(4)
+    return {
+        'points': [tuple(pt) for pt in xy.tolist()],
+        'triangles': list(zip(map(tuple, tri.tolist()), cost.tolist())),
+        'max_triangles': n,
+        'budget': float(cost.sum()),
+    }
+
+
+def truss(n, seed=0):
+    """
+    A grid of about n nodes (twice as wide as high), supports at the bottom
+    corners and a vertical load of random magnitude at a random top node
+    """
+    rng = _rng(seed)
+    ny = max(2, int(round(np.sqrt(n / 2))))
+    nx = max(2, n // ny)
+    nodes = [(float(i), float(j)) for j in range(ny) for i in range(nx)]
+    supports = [False] * len(nodes)
+    supports[0] = supports[nx - 1] = True
+    load_node = (ny - 1) * nx + int(rng.integers(0, nx))
+    return {
+        'nodes': nodes,
+        'edges': window_edges(nodes),
+        'supports': supports,
+        'load_node': load_node,
+        'load_vector': (0.0, -float(rng.integers(1, 10)) * 1000.0),
+    }
+
+
+GENERATORS = {
+    'mailbox': mailbox,
+    'telecom': telecom,
+    'antenna': antenna,
+    'mis': mis,
+    'triangulation': triangulation,
+    'truss': truss,
+}
@@ -0,0 +1,278 @@
+"""
+Benchmark runner over the synthetic instances of benchmarks.generators.
+
+Every (problem, size) pair is generated from the seed, solved, and its
+timings block turned into one record: generation, build (data + model
+assembly), solve and extract times, model size, peak memory (with --memory,
+measured in a separate traced run so tracing does not slow the timed ones)
+and objective. Records are written to a JSON results file and, given a
+baseline results file, compared with it: slower phases, higher memory and
+changed objectives are reported as regressions and the exit code is 1.
+
+Every record also has the solver-runtime milestones of the fastest solve
+(shared.telemetry.MilestoneSink): time to the first feasible solution, its
+objective, and time to the first incumbent within --gap. The MILP solvers
+start Gurobi from their heuristic solutions; --no-warm-start turns that off
+to measure what the starts save (run both with --output and compare).
+Without a start, telecom keeps its SolutionLimit of 1 and stops at its
+first solution, so it has no time to gap; with the start it runs to its
+MIPGap of 10%, which --gap 0.1 measures.
+
+Usage:
+    python -m benchmarks.run [--problems mis truss] [--sizes toy small]
+                             [--repeat 3] [--memory] [--output results.json]
+                             [--baseline baseline.json] [--tolerance 0.25]
+                             [--backend highs] [--no-warm-start] [--gap 0.01]
+
+--backend picks the MILP backend of the solvers that have one (mis, telecom,
+antenna, triangulation); mailbox and truss always run on Gurobi, and are
+skipped when gurobipy is not installed.
+"""
+import argparse
+import datetime
+import json
+import platform
+import sys
+import time
+
+from modules.subject_antenna_placement.solver import AntennaPlacementSolver
+from modules.subject_mis_scheduling.solver import MISSolver
+from modules.subject_telecom_network.solver import TelecomNetworkSolver
+from modules.subject_triangulation.model import TrussStructure
+from modules.subject_triangulation.solver import SimpleTriangulationSolver
+from shared.backends import GUROBI_AVAILABLE, default_backend
+from shared.gurobi_utils import set_profile
+from shared.telemetry import MilestoneSink, SolverProgress
+from shared.timings import BUILD, DATA, EXTRACT, HEURISTIC, OPTIMIZE
+
+from .generators import GENERATORS, SIZES
+
+try:
+    import gurobipy as gp
+except ImportError:
+    gp = None
+
+# Default sizes; 'large' and 'huge' have to be asked for
+DEFAULT_SIZES = ('toy', 'small', 'medium')
+
+# Phase times below this (s) are never reported as regressions
+MIN_SECONDS = 0.05
+
+# Relative objective change reported as a regression
+OBJECTIVE_TOLERANCE = 1e-6
+
+# Default target gap of the time-to-gap milestone
+MILESTONE_GAP = 0.01
+
+# Problems whose solvers need gurobipy (imported when run)
+GUROBI_ONLY = ('mailbox', 'truss')
+
+
+def _mailbox(instance, trace_memory, backend, progress, warm_start):
+    from modules.subject_mailbox_location.solver import MailboxLocationSolver
+    return MailboxLocationSolver(**instance).solve(progress, trace_memory=trace_memory)
+
+
+def _truss(instance, trace_memory, backend, progress, warm_start):
+    from modules.subject_truss.solver import solve_physical_truss
+    return solve_physical_truss(**instance, progress=progress, trace_memory=trace_memory)
+
+
+def _triangulation(instance, trace_memory, backend, progress, warm_start):
+    structure = TrussStructure()
+    structure.add_points(instance['points'])
+    vertices, costs = zip(*instance['triangles']) if instance['triangles'] else ((), ())
+    structure.add_triangles(vertices, costs)
+    structure.max_triangles = instance['max_triangles']
+    structure.budget = instance['budget']
+    return SimpleTriangulationSolver(structure).solve_milp(backend, progress, trace_memory,
+                                                           warm_start)
+
+
+# (instance, trace_memory, backend, progress, warm_start) -> result
+SOLVERS = {
+    'mailbox': _mailbox,
+    'telecom': lambda inst, tm, b, p, ws: TelecomNetworkSolver(**inst).solve(
+        p, trace_memory=tm, backend=b, warm_start=ws),
+    'antenna': lambda inst, tm, b, p, ws: AntennaPlacementSolver(**inst).solve(
+        p, trace_memory=tm, backend=b, warm_start=ws),
+    'mis': lambda inst, tm, b, p, ws: MISSolver(**inst).solve(
+        p, trace_memory=tm, backend=b, warm_start=ws),
+    'triangulation': _triangulation,
+    'truss': _truss,
+}
+
+
+def _phase(timings, *names):
+    return round(sum(timings['phases'].get(name, {}).get('wall', 0.0) for name in names), 6)
+
+
+def run_one(problem, size, seed, repeat=1, memory=False, backend=None, warm_start=True,
+            gap=MILESTONE_GAP):
+    """Benchmark record of one instance (fastest of `repeat` solves)"""
+    n = SIZES[size]
+    backend = backend or default_backend()
+    record = {'problem': problem, 'size': size, 'n': n, 'seed': seed, 'backend': backend,
+              'warm_start': warm_start}
+    start = time.perf_counter()
+    instance = GENERATORS[problem](n, seed)
+    record['generate'] = round(time.perf_counter() - start, 6)
+
+    try:
+        best = None
+        for _ in range(repeat):
+            milestones = MilestoneSink(gap)
+            result = SOLVERS[problem](instance, False, backend,
+                                      SolverProgress([milestones], interval=0.05), warm_start)
+            if best is None or result['timings']['wall'] < best['timings']['wall']:
+                best, best_milestones = result, milestones.summary()
+        timings = best['timings']
+        record.update({
+            'status': str(best.get('status')),
+            'objective': best.get('objective', best.get('total_cost')),
+            'build': _phase(timings, DATA, BUILD),
+            'heuristic': _phase(timings, HEURISTIC),
+            'solve': _phase(timings, OPTIMIZE),
+            'extract': _phase(timings, EXTRACT),
+            'wall': timings['wall'],
+            'cpu': timings['cpu'],
+            'rows': timings.get('rows'),
+            'cols': timings.get('cols'),
+            'nonzeros': timings.get('nonzeros'),
+        })
+        record.update(best_milestones)
+        if memory:
+            record['peak_memory'] = SOLVERS[problem](instance, True, backend, None,
+                                                     warm_start)['timings']['peak_memory']
+    except Exception as e:
+        record['error'] = f"{type(e).__name__}: {e}"
+    return record
+
+
+def compare(records, baseline, tolerance=0.25, min_seconds=MIN_SECONDS):
+    """
+    Regressions of records against baseline records (same problem, size and seed;
+    records of another backend are compared too, their objectives should match).
+
+    Returns:
+        List of messages
+    """
+    reference = {(r['problem'], r['size'], r['seed']): r for r in baseline}
+    messages = []
+    for record in records:
+        key = (record['problem'], record['size'], record['seed'])
+        base = reference.get(key)
+        if base is None:
+            continue
+        label = f"{record['problem']}/{record['size']}"
+        if 'error' in record and 'error' not in base:
+            messages.append(f"{label}: fails ({record['error']})")
+            continue
+        if 'error' in record or 'error' in base:
+            continue
+        for field in ('build', 'solve', 'extract', 'wall'):
+            new, old = record[field], base[field]
+            if new > old * (1 + tolerance) and new - old > min_seconds:
+                messages.append(f"{label}: {field} {old:.3f}s -> {new:.3f}s")
+        if record.get('peak_memory') and base.get('peak_memory'):
+            new, old = record['peak_memory'], base['peak_memory']
+            if new > old * (1 + tolerance):
+                messages.append(f"{label}: peak memory {old / 2**20:.1f} MB -> {new / 2**20:.1f} MB")
+        new, old = record['objective'], base['objective']
+        if (new is None) != (old is None) or (
+                new is not None and abs(new - old) > OBJECTIVE_TOLERANCE * max(1.0, abs(old))):
+            messages.append(f"{label}: objective {old} -> {new}")
+        if record['status'] != base['status']:
+            messages.append(f"{label}: status {base['status']} -> {record['status']}")
+    return messages
+
+
+def _print_record(record):
+    if 'error' in record:
+        print(f"{record['problem']:>14} {record['size']:>7} {record['n']:>7}  {record['error']}")
+        return
+    objective = f"{record['objective']:.6g}" if record['objective'] is not None else "-"
+    memory = f"{record['peak_memory'] / 2**20:.1f}" if 'peak_memory' in record else "-"
+    first = f"{record['first_solution']:.3f}" if record['first_solution'] is not None else "-"
+    to_gap = f"{record['time_to_gap']:.3f}" if record['time_to_gap'] is not None else "-"
+    print(f"{record['problem']:>14} {record['size']:>7} {record['n']:>7} "
+          f"{record['generate']:>9.3f} {record['build']:>9.3f} {record['solve']:>9.3f} "
+          f"{record['extract']:>9.3f} {first:>9} {to_gap:>9} {memory:>8} {objective:>12}  "
+          f"{record['status']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--problems', nargs='+', choices=sorted(GENERATORS),
+                        default=sorted(GENERATORS), help="Problem types")
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=list(DEFAULT_SIZES),
+                        help="Instance sizes")
+    parser.add_argument('--seed', type=int, default=0, help="Instance seed")
+    parser.add_argument('--repeat', type=int, default=1, help="Solves per instance (fastest kept)")
+    parser.add_argument('--memory', action='store_true',
+                        help="Measure the tracemalloc peak in an extra run")
+    parser.add_argument('--output', default='benchmark_results.json', help="Results file")
+    parser.add_argument('--baseline', help="Results file to compare with")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Relative slowdown or memory growth reported as a regression")
+    parser.add_argument('--backend', choices=['gurobi', 'highs'], default=default_backend(),
+                        help="MILP backend of the mis, telecom, antenna and triangulation solvers")
+    parser.add_argument('--threads', type=int, help="Gurobi thread budget (default: all cores)")
+    parser.add_argument('--no-warm-start', dest='warm_start', action='store_false',
+                        help="Do not start Gurobi from the heuristic solutions")
+    parser.add_argument('--gap', type=float, default=MILESTONE_GAP,
+                        help="Target gap of the time-to-gap milestone")
+    parser.add_argument('--verbose', action='store_true', help="Keep the Gurobi log")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        set_profile(OutputFlag=0)
+    set_profile(Threads=args.threads)
+    if not GUROBI_AVAILABLE:
+        skipped = [problem for problem in args.problems if problem in GUROBI_ONLY]
+        if skipped:
+            print(f"Skipping {', '.join(skipped)}: gurobipy is not installed")
+        args.problems = [problem for problem in args.problems if problem not in GUROBI_ONLY]
+
+    print(f"{'problem':>14} {'size':>7} {'n':>7} {'gen (s)':>9} {'build (s)':>9} "
+          f"{'solve (s)':>9} {'extr (s)':>9} {'first (s)':>9} {'to gap (s)':>9} {'mem (MB)':>8} "
+          f"{'objective':>12}  status")
+    records = []
+    for problem in args.problems:
+        for size in args.sizes:
+            record = run_one(problem, size, args.seed, args.repeat, args.memory, args.backend,
+                             args.warm_start, args.gap)
+            _print_record(record)
+            records.append(record)
+
+    results = {
+        'meta': {
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'gurobi': '.'.join(map(str, gp.gurobi.version())) if GUROBI_AVAILABLE else None,
+            'backend': args.backend,
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'threads': args.threads,
+            'warm_start': args.warm_start,
+            'gap': args.gap,
+        },
+        'results': records,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        messages = compare(records, baseline, args.tolerance)
+        for message in messages:
+            print(f"REGRESSION {message}")
+        if messages:
+            sys.exit(1)
+        print(f"No regression against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Micro-benchmark for the truss model build phase.
+
+Times build_physical_truss (model assembly only, no optimize) on square grids
+with the default window ground structure. The build cost should grow linearly
+with the number of candidate members; the legacy per-node scan of every member
+is timed on the smaller grids for comparison.
+
+Usage:
+    python -m benchmarks.truss_build [--sizes 10 20 50 100] [--legacy-max 30]
+"""
+import argparse
+import time
+
+import gurobipy as gp
+from gurobipy import GRB
+
+from modules.subject_truss.ground_structure import window_edges
+from modules.subject_truss.solver import build_physical_truss, member_geometry
+
+
+def grid(n):
+    """n x n unit grid, supports at the two bottom corners, load at the top center"""
+    nodes = [(float(i), float(j)) for j in range(n) for i in range(n)]
+    supports = [False] * len(nodes)
+    supports[0] = supports[n - 1] = True
+    load_node = (n - 1) * n + n // 2
+    return nodes, supports, load_node
+
+
+def legacy_build(nodes, edges, supports, load_node, load_vector):
+    """Equilibrium and flow rows assembled the pre-vectorization way (O(nodes x members))"""
+    _, dirx, diry = member_geometry(nodes, edges)
+    m = gp.Model("legacy_truss")
+    m.setParam('OutputFlag', 0)
+    F = m.addVars(len(edges), lb=-GRB.INFINITY, name="F")
+    f = {}
+    for (i, j) in edges:
+        f[(i, j)] = m.addVar(lb=0.0, name=f"f_{i}_{j}")
+        f[(j, i)] = m.addVar(lb=0.0, name=f"f_{j}_{i}")
+    for ni in range(len(nodes)):
+        if not supports[ni]:
+            sum_x, sum_y = gp.LinExpr(), gp.LinExpr()
+            for k, (i, j) in enumerate(edges):
+                if i == ni:
+                    sum_x += F[k] * dirx[k]
+                    sum_y += F[k] * diry[k]
+                elif j == ni:
+                    sum_x += -F[k] * dirx[k]
+                    sum_y += -F[k] * diry[k]
+            Fx, Fy = load_vector if ni == load_node else (0.0, 0.0)
+            m.addConstr(sum_x == Fx)
+            m.addConstr(sum_y == Fy)
+        inflow, outflow = gp.LinExpr(), gp.LinExpr()
+        for (i, j) in edges:
+            if j == ni:
+                inflow += f[(i, j)]
+                outflow += f[(j, i)]
+            if i == ni:
+                outflow += f[(i, j)]
+                inflow += f[(j, i)]
+        m.addConstr(inflow - outflow == 0)
+    m.update()
+    return m
+
+
+def _timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def run(sizes, legacy_max):
+    print(f"{'grid':>9} {'nodes':>7} {'members':>8} {'rows':>8} {'nnz':>9} "
+          f"{'build (s)':>10} {'us/member':>10} {'legacy (s)':>11}")
+    for n in sizes:
+        nodes, supports, load_node = grid(n)
+        edges = window_edges(nodes)
+        elapsed, (m, _) = _timed(build_physical_truss, nodes, edges, supports,
+                                 load_node, (0.0, -1000.0))
+        m.update()
+        legacy = ""
+        if n <= legacy_max:
+            legacy_elapsed, legacy_model = _timed(legacy_build, nodes, edges, supports,
+                                                  load_node, (0.0, -1000.0))
+            legacy = f"{legacy_elapsed:.3f}"
+            legacy_model.dispose()
+        print(f"{n:>4}x{n:<4} {len(nodes):>7} {len(edges):>8} {m.NumConstrs:>8} "
+              f"{m.NumNZs:>9} {elapsed:>10.3f} {1e6 * elapsed / len(edges):>10.2f} "
+              f"{legacy:>11}")
+        m.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 20, 30, 50, 75, 100],
+                        help="Grid side lengths")
+    parser.add_argument('--legacy-max', type=int, default=30,
+                        help="Largest grid on which the legacy assembly is timed")
+    args = parser.parse_args()
+    run(args.sizes, args.legacy_max)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark of the two connectivity formulations of the truss MILP.
+
+FLOW adds two flow variables and two linking rows per member plus one
+conservation row per node; LAZY_CUTS drops them and separates connectivity
+cuts with union-find in a callback. Both are solved on the same grids with
+a length penalty, which makes the topology part of the objective.
+
+Usage:
+    python -m benchmarks.truss_connectivity [--grids 5x4 7x4 6x4] [--time-limit 30]
+"""
+import argparse
+import time
+
+import gurobipy as gp
+
+from modules.subject_truss.ground_structure import window_edges
+from modules.subject_truss.solver import FLOW, LAZY_CUTS, build_physical_truss
+
+
+def grid_problem(nx, ny):
+    """nx x ny grid, supports at the bottom corners, load at the top center"""
+    nodes = [(float(i), float(j)) for j in range(ny) for i in range(nx)]
+    supports = [False] * len(nodes)
+    supports[0] = supports[nx - 1] = True
+    return nodes, supports, (ny - 1) * nx + nx // 2
+
+
+def run(grids, length_penalty, time_limit):
+    print(f"{'grid':>7} {'mode':>10} {'vars':>7} {'rows':>7} {'build (s)':>10} "
+          f"{'solve (s)':>10} {'objective':>11} {'gap':>8} {'cuts':>10}")
+    for nx, ny in grids:
+        nodes, supports, load_node = grid_problem(nx, ny)
+        edges = window_edges(nodes)
+        for connectivity in (FLOW, LAZY_CUTS):
+            start = time.perf_counter()
+            m, v = build_physical_truss(nodes, edges, supports, load_node, (0.0, -1000.0),
+                                        length_penalty=length_penalty,
+                                        time_limit=time_limit, connectivity=connectivity)
+            m.update()
+            build = time.perf_counter() - start
+
+            start = time.perf_counter()
+            try:
+                m.optimize(v['callback'])
+                solve = f"{time.perf_counter() - start:.2f}"
+                objective = f"{m.ObjVal:.5f}" if m.SolCount > 0 else "-"
+                gap = f"{m.MIPGap:.4f}" if m.SolCount > 0 else "-"
+            except gp.GurobiError as e:
+                solve, objective, gap = "n/a", f"({e.errno})", "-"
+            callback = v['callback']
+            cuts = f"{callback.cuts_added}/{callback.user_cuts_added}" if callback else "-"
+            print(f"{nx:>3}x{ny:<3} {connectivity:>10} {m.NumVars:>7} {m.NumConstrs:>7} "
+                  f"{build:>10.3f} {solve:>10} {objective:>11} {gap:>8} {cuts:>10}")
+            m.dispose()
+
+
+def _grid(text):
+    nx, ny = text.lower().split('x')
+    return int(nx), int(ny)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--grids', type=_grid, nargs='+', default=[(5, 4), (7, 4), (6, 4), (8, 5)],
+                        help="Grid sizes as NXxNY")
+    parser.add_argument('--length-penalty', type=float, default=0.5)
+    parser.add_argument('--time-limit', type=float, default=30,
+                        help="Solver time limit per run (s)")
+    args = parser.parse_args()
+    run(args.grids, args.length_penalty, args.time_limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark of the truss MILP against the number of load cases.
+
+Every case loads one node of the top row (cycling along it) with a vertical
+load and a horizontal component of alternating sign. The build time should
+grow linearly with the number of cases, since the geometry and equilibrium
+matrix are shared; the solve time shows the cost of the coupled model.
+
+Usage:
+    python -m benchmarks.truss_load_cases [--grid 8 5] [--cases 1 2 4 8]
+"""
+import argparse
+import time
+
+import gurobipy as gp
+
+from modules.subject_truss.ground_structure import window_edges
+from modules.subject_truss.solver import build_physical_truss
+
+
+def load_cases(nx, ny, n_cases, load=-1000.0):
+    """n_cases single-node cases along the top row of an nx x ny grid"""
+    top = [(ny - 1) * nx + i for i in range(nx)]
+    return [(top[c % nx], ((-1) ** c * 0.3 * abs(load), load)) for c in range(n_cases)]
+
+
+def run(nx, ny, case_counts, time_limit):
+    nodes = [(float(i), float(j)) for j in range(ny) for i in range(nx)]
+    supports = [False] * len(nodes)
+    supports[0] = supports[nx - 1] = True
+    edges = window_edges(nodes)
+    print(f"{nx}x{ny} grid, {len(edges)} candidate members")
+    print(f"{'cases':>6} {'vars':>8} {'rows':>8} {'nnz':>9} {'build (s)':>10} "
+          f"{'solve (s)':>10} {'objective':>12}")
+    for n_cases in case_counts:
+        start = time.perf_counter()
+        m, _ = build_physical_truss(nodes, edges, supports, None, None,
+                                    time_limit=time_limit,
+                                    load_cases=load_cases(nx, ny, n_cases))
+        m.update()
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        try:
+            m.optimize()
+            solve = f"{time.perf_counter() - start:.3f}"
+            objective = f"{m.ObjVal:.5f}" if m.SolCount > 0 else "-"
+        except gp.GurobiError as e:
+            solve, objective = "n/a", f"({e.errno})"
+        print(f"{n_cases:>6} {m.NumVars:>8} {m.NumConstrs:>8} {m.NumNZs:>9} "
+              f"{build:>10.3f} {solve:>10} {objective:>12}")
+        m.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--grid', type=int, nargs=2, default=[8, 5], metavar=('NX', 'NY'),
+                        help="Grid size")
+    parser.add_argument('--cases', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help="Numbers of load cases")
+    parser.add_argument('--time-limit', type=float, default=60,
+                        help="Solver time limit per run (s)")
+    args = parser.parse_args()
+    run(*args.grid, args.cases, args.time_limit)
+
+
+if __name__ == "__main__":
+    main()
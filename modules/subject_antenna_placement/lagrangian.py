@@ -0,0 +1,355 @@
+"""
+Relaxation lagrangienne du placement d'antennes.
+
+Le modèle est une localisation avec capacités modulaires:
+
+    min  Σⱼ Cⱼ yⱼ + Σᵢⱼ Dᵢⱼ xᵢⱼ
+    s.c. Σⱼ xᵢⱼ = 1                 pour chaque utilisateur i ayant un site accessible
+         xᵢⱼ <= yⱼ,  Σᵢ xᵢⱼ <= Σₖ Kₖ zⱼₖ,  Σₖ zⱼₖ = yⱼ,  Σⱼ yⱼ <= max_antennas
+
+En relâchant l'affectation avec des multiplicateurs λᵢ, le problème se
+sépare par site: le site j ouvert prend au plus K_max = max(Kₖ) utilisateurs
+(les niveaux de capacité n'ont pas de coût), ceux de coût réduit
+Dᵢⱼ - λᵢ le plus négatif. C'est un sac à dos à poids unitaires, résolu en
+forme close par un tri: vⱼ = Cⱼ + somme des K_max coûts réduits les plus
+négatifs, et le site est ouvert si vⱼ < 0 (les max_antennas plus négatifs
+au plus). L(λ) = Σᵢ λᵢ + Σⱼ ouverts vⱼ est une borne inférieure du coût
+optimal pour tout λ.
+
+Les multiplicateurs suivent un sous-gradient (gᵢ = 1 - Σⱼ xᵢⱼ) avec le pas
+de Polyak θ (UB - L(λ)) / ||g||², θ divisé par 2 quand la borne stagne.
+Régulièrement, les sites ouverts par la relaxation sont réparés en une
+solution faisable (affectation gloutonne avec capacités, sites ajoutés
+pour les utilisateurs restants, sites vides fermés), qui donne la borne
+supérieure UB.
+
+Toutes les étapes travaillent sur les paires accessibles (Dᵢⱼ fini) en
+tableaux NumPy.
+"""
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import linprog
+from scipy.sparse.csgraph import breadth_first_order
+
+from shared.backends import FEASIBLE, NO_SOLUTION, OPTIMAL
+from shared.telemetry import DONE, MIP, relative_gap
+
+# Itérations de sous-gradient au plus
+ITERATIONS = 300
+
+# θ initial du pas de Polyak, et sa valeur minimale avant l'arrêt
+STEP = 2.0
+MIN_STEP = 1e-4
+
+# Itérations sans amélioration de la borne avant de diviser θ par 2
+PATIENCE = 10
+
+# Réparation toutes les REPAIR_EVERY itérations (et à la dernière), si les sites
+# ouverts par la relaxation ont changé depuis la précédente
+REPAIR_EVERY = 5
+
+# Gap relatif (UB - LB) / UB d'arrêt
+TOLERANCE = 1e-4
+
+
+def accessible_pairs(connection_costs):
+    """Paires accessibles (utilisateurs, sites, coûts) d'une matrice (U, S) où inf = hors rayon"""
+    D = np.asarray(connection_costs, dtype=float)
+    users, sites = np.nonzero(np.isfinite(D))
+    return users, sites, D[users, sites]
+
+
+def subproblem(lam, users, sites, costs, setup_costs, capacity, max_antennas=None):
+    """
+    Relaxation pour des multiplicateurs donnés, en forme close par site
+
+    Returns:
+        (L(λ), sites ouverts (S,) bool, paires affectées (P,) bool)
+    """
+    S = len(setup_costs)
+    reduced = costs - lam[users]
+    order = np.lexsort((reduced, sites))
+    site_sorted, reduced_sorted = sites[order], reduced[order]
+    rank = np.arange(len(order)) - np.searchsorted(site_sorted, site_sorted)
+    take = (rank < capacity) & (reduced_sorted < 0)
+    value = setup_costs + np.bincount(site_sorted[take], weights=reduced_sorted[take], minlength=S)
+
+    opened = value < 0
+    if max_antennas is not None and opened.sum() > max_antennas:
+        opened = np.zeros(S, dtype=bool)
+        opened[np.argsort(value, kind='stable')[:max_antennas]] = True
+    assigned = np.zeros(len(users), dtype=bool)
+    assigned[order[take]] = True
+    assigned &= opened[sites]
+    return float(lam.sum() + value[opened].sum()), opened, assigned
+
+
+def assign(opened, users, sites, costs, capacity, num_users):
+    """
+    Affectation gloutonne aux sites ouverts, avec capacités: à chaque tour,
+    chaque utilisateur non affecté se propose à son site ouvert le moins cher
+    qui a encore de la place, et chaque site accepte les propositions les
+    moins chères dans sa capacité restante
+
+    Returns:
+        Site de chaque utilisateur (U,), -1 si non affecté
+    """
+    site_of = np.full(num_users, -1)
+    load = np.zeros(len(opened), dtype=np.int64)
+    by_cost = np.argsort(costs, kind='stable')
+    users, sites, costs = users[by_cost], sites[by_cost], costs[by_cost]
+    candidate = opened[sites]
+    while True:
+        candidate &= (site_of[users] < 0) & (load[sites] < capacity)
+        pending = np.flatnonzero(candidate)
+        if not len(pending):
+            return site_of
+        # Proposition de chaque utilisateur: sa première paire (la moins chère)
+        _, first = np.unique(users[pending], return_index=True)
+        proposal = pending[first]
+        # Acceptation par site, par coût croissant, dans la capacité restante
+        proposal = proposal[np.lexsort((costs[proposal], sites[proposal]))]
+        site_sorted = sites[proposal]
+        rank = np.arange(len(proposal)) - np.searchsorted(site_sorted, site_sorted)
+        accepted = proposal[rank < capacity - load[site_sorted]]
+        site_of[users[accepted]] = sites[accepted]
+        load += np.bincount(sites[accepted], minlength=len(opened))
+
+
+def augment(site_of, opened, users, sites, capacity, missing):
+    """
+    Placer les utilisateurs `missing` dont tous les sites ouverts sont pleins
+    par chemins augmentants: un parcours en largeur sur le graphe des sites
+    (j -> k si un utilisateur affecté à j peut passer à k) cherche un site
+    ouvert non plein, puis chaque utilisateur du chemin se décale d'un site
+
+    Returns:
+        site_of mis à jour (modifié sur place)
+    """
+    S = len(opened)
+    load = np.bincount(site_of[site_of >= 0], minlength=S)
+    reachable = opened[sites]
+    for i in np.flatnonzero(missing).tolist():
+        # Arcs j -> k, chacun avec un utilisateur témoin (paire p)
+        current = site_of[users]
+        movable = np.flatnonzero(reachable & (current >= 0) & (current != sites))
+        witness = np.full((S + 1, S), -1)
+        witness[current[movable], sites[movable]] = movable
+        # Le nœud S est la source: l'utilisateur i vers ses sites ouverts
+        own = np.flatnonzero(reachable & (users == i))
+        witness[S, sites[own]] = own
+        rows, cols = np.nonzero(witness >= 0)
+        graph = sp.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(S + 1, S + 1))
+        order, predecessor = breadth_first_order(graph, S, return_predecessors=True)
+        free = order[order < S]
+        free = free[load[free] < capacity]
+        if not len(free):
+            continue
+        k = int(free[0])
+        load[k] += 1
+        while predecessor[k] != S:
+            j = int(predecessor[k])
+            site_of[users[witness[j, k]]] = k
+            k = j
+        site_of[i] = k
+    return site_of
+
+
+def repair(opened, users, sites, costs, setup_costs, capacity, num_users, max_antennas=None,
+           min_coverage=0):
+    """
+    Solution faisable à partir de sites ouverts: affectation gloutonne, puis
+    tant que des utilisateurs accessibles restent non affectés, ouverture du
+    site qui en atteint le plus par unité de coût d'installation, chemins
+    augmentants quand aucun site ne peut plus être ouvert, et enfin
+    fermeture des sites sans utilisateur
+
+    Returns:
+        (coût, sites ouverts (S,) bool, site de chaque utilisateur (U,)), ou
+        None si des utilisateurs accessibles restent non affectés ou si moins
+        de min_coverage utilisateurs sont couverts
+    """
+    opened = opened.copy()
+    assignable = np.zeros(num_users, dtype=bool)
+    assignable[users] = True
+    while True:
+        site_of = assign(opened, users, sites, costs, capacity, num_users)
+        missing = assignable & (site_of < 0)
+        if not missing.any():
+            break
+        reach = np.bincount(sites[missing[users] & ~opened[sites]], minlength=len(opened))
+        if not reach.any() or (max_antennas is not None and opened.sum() >= max_antennas):
+            # Plus de site à ouvrir: décaler les utilisateurs déjà affectés
+            site_of = augment(site_of, opened, users, sites, capacity, missing)
+            if (assignable & (site_of < 0)).any():
+                return None
+            break
+        gain = np.minimum(reach, capacity) / np.maximum(setup_costs, 1e-9)
+        opened[np.argmax(np.where(reach > 0, gain, -1.0))] = True
+
+    if (site_of >= 0).sum() < min_coverage:
+        return None
+    opened &= np.bincount(site_of[site_of >= 0], minlength=len(opened)) > 0
+    pair_cost = dict(zip(zip(users.tolist(), sites.tolist()), costs.tolist()))
+    connection = sum(pair_cost[i, j] for i, j in enumerate(site_of.tolist()) if j >= 0)
+    return float(setup_costs[opened].sum() + connection), opened, site_of
+
+
+def optimal_assignment(opened, users, sites, costs, capacity, num_users):
+    """
+    Affectation de coût minimum aux sites ouverts: un problème de transport,
+    dont la relaxation continue (HiGHS via scipy.optimize.linprog) a une
+    solution entière car sa matrice est totalement unimodulaire
+
+    Returns:
+        (coût de connexion, site de chaque utilisateur (U,)), ou None si
+        les sites ouverts ne peuvent pas servir tous les utilisateurs accessibles
+    """
+    keep = np.flatnonzero(opened[sites])
+    assignable = np.unique(users)
+    if not np.isin(assignable, users[keep]).all():
+        return None
+    row = np.searchsorted(assignable, users[keep])
+    pairs = np.arange(len(keep))
+    res = linprog(costs[keep],
+                  A_eq=sp.csr_matrix((np.ones(len(keep)), (row, pairs)),
+                                     shape=(len(assignable), len(keep))),
+                  b_eq=np.ones(len(assignable)),
+                  A_ub=sp.csr_matrix((np.ones(len(keep)), (sites[keep], pairs)),
+                                     shape=(len(opened), len(keep))),
+                  b_ub=np.full(len(opened), float(capacity)),
+                  bounds=(0, 1), method='highs')
+    if res.status != 0:
+        return None
+    chosen = keep[res.x > 0.5]
+    site_of = np.full(num_users, -1)
+    site_of[users[chosen]] = sites[chosen]
+    return float(costs[chosen].sum()), site_of
+
+
+def initial_multipliers(users, sites, costs, setup_costs, capacity, num_users):
+    """λᵢ = min sur ses sites de Dᵢⱼ + Cⱼ partagé entre les utilisateurs que j peut servir"""
+    reach = np.bincount(sites, minlength=len(setup_costs))
+    share = setup_costs[sites] / np.maximum(np.minimum(reach[sites], capacity), 1)
+    lam = np.full(num_users, np.inf)
+    np.minimum.at(lam, users, costs + share)
+    return np.where(np.isfinite(lam), lam, 0.0)
+
+
+def solve_lagrangian(connection_costs, setup_costs, capacities, max_antennas=None, min_coverage=0,
+                     iterations=ITERATIONS, time_limit=None, progress=None,
+                     name="Antenna_Placement"):
+    """
+    Borne inférieure lagrangienne et meilleure solution réparée
+
+    Args:
+        connection_costs: Matrice (U, S) des coûts de connexion, inf hors rayon
+        setup_costs: Coûts d'installation (S,)
+        capacities: Niveaux de capacité (nombre d'utilisateurs)
+        max_antennas: Nombre maximum de sites ouverts, None sans limite
+        min_coverage: Nombre minimum d'utilisateurs couverts par la solution réparée
+        iterations: Itérations de sous-gradient au plus
+        time_limit: Temps maximum (s), None sans limite
+        progress: SolverProgress optionnel, reçoit un événement à chaque
+            amélioration de l'une des bornes puis l'événement DONE
+
+    Returns:
+        dict avec 'objective' (None sans solution réparée), 'opened' (S,) bool,
+        'site_of' (U,) (-1 si non affecté), 'lower_bound', 'gap', 'iterations'
+        et 'status' (OPTIMAL, FEASIBLE ou NO_SOLUTION de shared.backends)
+    """
+    start = time.perf_counter()
+    D = np.asarray(connection_costs, dtype=float)
+    num_users = D.shape[0]
+    setup_costs = np.asarray(setup_costs, dtype=float)
+    capacity = int(max(capacities))
+    users, sites, costs = accessible_pairs(D)
+    assignable = np.zeros(num_users, dtype=bool)
+    assignable[users] = True
+
+    lam = initial_multipliers(users, sites, costs, setup_costs, capacity, num_users)
+    theta = STEP
+    lower_bound = -np.inf
+    best = None
+    stalled = 0
+    done = 0
+    tried = None  # Sites ouverts de la dernière réparation
+
+    def emit(phase, **extra):
+        if progress is None:
+            return
+        incumbent = best[0] if best is not None else None
+        bound = float(lower_bound) if np.isfinite(lower_bound) else None
+        progress.emit(dict({'model': name, 'phase': phase,
+                            'time': round(time.perf_counter() - start, 4),
+                            'incumbent': incumbent, 'bound': bound,
+                            'gap': relative_gap(incumbent, bound), 'nodes': None}, **extra))
+
+    for done in range(1, iterations + 1):
+        value, opened, assigned = subproblem(lam, users, sites, costs, setup_costs, capacity,
+                                             max_antennas)
+        improved = value > lower_bound + 1e-9 * max(1.0, abs(value))
+        if improved:
+            lower_bound = value
+            stalled = 0
+        else:
+            stalled += 1
+            if stalled >= PATIENCE:
+                theta /= 2
+                stalled = 0
+
+        last = done == iterations or theta < MIN_STEP or (
+            time_limit is not None and time.perf_counter() - start >= time_limit)
+        if (done % REPAIR_EVERY == 0 or last) and not np.array_equal(opened, tried):
+            tried = opened
+            repaired = repair(opened, users, sites, costs, setup_costs, capacity, num_users,
+                              max_antennas, min_coverage)
+            if repaired is not None and (best is None or repaired[0] < best[0]):
+                best = repaired
+                improved = True
+        if improved:
+            emit(MIP)
+        if last or (best is not None and best[0] - lower_bound <= TOLERANCE * abs(best[0])):
+            break
+
+        # Sous-gradient des contraintes d'affectation relâchées
+        g = np.where(assignable, 1.0, 0.0) - np.bincount(users[assigned], minlength=num_users)
+        norm = float(g @ g)
+        if norm == 0:
+            # La solution relâchée affecte chaque utilisateur une fois: ses
+            # sites ouverts donnent l'incumbent avant l'arrêt
+            if not np.array_equal(opened, tried):
+                repaired = repair(opened, users, sites, costs, setup_costs, capacity, num_users,
+                                  max_antennas, min_coverage)
+                if repaired is not None and (best is None or repaired[0] < best[0]):
+                    best = repaired
+                    emit(MIP)
+            break
+        target = best[0] if best is not None else lower_bound + abs(lower_bound) * 0.1 + 1.0
+        lam = lam + theta * (target - value) / norm * g
+
+    if best is not None:
+        # Affectation exacte pour les sites de la meilleure solution
+        exact = optimal_assignment(best[1], users, sites, costs, capacity, num_users)
+        if exact is not None and setup_costs[best[1]].sum() + exact[0] < best[0]:
+            best = (float(setup_costs[best[1]].sum()) + exact[0], best[1], exact[1])
+            emit(MIP)
+
+    objective = best[0] if best is not None else None
+    gap = relative_gap(objective, float(lower_bound))
+    if objective is None:
+        status = NO_SOLUTION
+    else:
+        status = OPTIMAL if gap is not None and gap <= TOLERANCE else FEASIBLE
+    emit(DONE, status=status)
+    return {
+        'objective': objective,
+        'opened': best[1] if best is not None else np.zeros(len(setup_costs), dtype=bool),
+        'site_of': best[2] if best is not None else np.full(num_users, -1),
+        'lower_bound': float(lower_bound),
+        'gap': gap,
+        'iterations': done,
+        'status': status,
+    }
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class AntennaPlacementModel:
     """Modèle pour le placement d'antennes télécom et affectation des utilisateurs"""
 
@@ -36,24 +39,20 @@ class AntennaPlacementModel:
         self.connection_costs = self._calculate_connection_costs(connection_costs)
 
     def _calculate_connection_costs(self, provided_costs):
-        """Calculer les coûts de connexion basés sur la distance"""
+        """
+        Calculer les coûts de connexion basés sur la distance, en tableau
+        NumPy (U, S) calculé d'un bloc: 100€ par unité de distance dans le
+        rayon de couverture, inf au-delà (connexion impossible)
+        """
         if provided_costs is not None:
             return provided_costs
 
-        costs = [[0.0] * self.num_sites for _ in range(self.num_users)]
-
-        for i, user in enumerate(self.users):
-            for j, site in enumerate(self.candidate_sites):
-                # Distance euclidienne
-                distance = ((user['x'] - site['x'])**2 + (user['y'] - site['y'])**2) ** 0.5
-
-                # Coût proportionnel à la distance
-                if distance <= self.coverage_radius:
-                    costs[i][j] = distance * 100  # 100€ par unité de distance
-                else:
-                    costs[i][j] = float('inf')  # Impossible de connecter
-
-        return costs
+        user_xy = np.array([(user['x'], user['y']) for user in self.users], dtype=float).reshape(-1, 2)
+        site_xy = np.array([(site['x'], site['y']) for site in self.candidate_sites],
+                           dtype=float).reshape(-1, 2)
+        distance = np.hypot(user_xy[:, 0, None] - site_xy[None, :, 0],
+                            user_xy[:, 1, None] - site_xy[None, :, 1])
+        return np.where(distance <= self.coverage_radius, distance * 100, np.inf)
 
     def can_connect(self, user_idx, site_idx):
         """Vérifier si un utilisateur peut se connecter à un site"""
@@ -1,14 +1,36 @@
-import gurobipy as gp
 import numpy as np
-from gurobipy import GRB
+import scipy.sparse as sp
 
+from shared.backends import HIGHS, NO_SOLUTION, OPTIMAL, LinearModel, default_backend
+from shared.gurobi_utils import create_model, optimize, resolve_params, set_starts
+from shared.model_cache import instance_key
+from shared.timings import BUILD, DATA, EXTRACT, HEURISTIC, OPTIMIZE, PhaseTimer
+
+from .lagrangian import ITERATIONS, accessible_pairs, assign, solve_lagrangian
 from .model import AntennaPlacementModel
+from .tiling import boundary_users, repair_boundary, solve_tiles
+
+try:
+    import gurobipy as gp
+    from gurobipy import GRB
+except ImportError:
+    gp = None
+    GRB = None
+
+
+# Paramètres par défaut du solveur (le profil de shared.gurobi_utils les remplace)
+PARAMS = {
+    'MIPGap': 0.05,
+    'TimeLimit': 60,
+}
 
 
 class AntennaPlacementSolver:
     """Solveur PLNE pour le placement d'antennes et affectation des utilisateurs"""
 
     def __init__(self, users, candidate_sites, **kwargs):
+        self.data_timer = PhaseTimer()
+        self.data_timer.start(DATA)
         self.model_data = AntennaPlacementModel(
             users=users,
             candidate_sites=candidate_sites,
@@ -18,153 +40,423 @@ class AntennaPlacementSolver:
             coverage_radius=kwargs.get('coverage_radius'),
             max_antennas=kwargs.get('max_antennas')
         )
+        self.data_timer.stop()
+
+    def solve(self, progress=None, trace_memory=False, backend=None, cache=None, warm_start=True):
+        """
+        Résoudre le problème de placement d'antennes
+
+        Args:
+            progress: SolverProgress optionnel
+            trace_memory: Ajouter le pic mémoire tracemalloc aux timings
+            backend: GUROBI ou HIGHS (shared.backends), par défaut Gurobi s'il est installé
+            cache: ModelCache optionnel (shared.model_cache, Gurobi seulement): le modèle
+                construit y est écrit, et relu au lieu d'être reconstruit sur la même instance
+            warm_start: Donner à Gurobi les sites de la solution de secours comme solution
+                de départ partielle, qu'il complète (HiGHS via SciPy n'en accepte pas)
+        """
+        backend = backend or default_backend()
+        timer = PhaseTimer(trace_memory)
+        timer.include(self.data_timer)
+        try:
+            solution = self._solve_arrays(backend, timer, progress, cache, warm_start)
+
+            timer.start(EXTRACT)
+            if solution is not None:
+                result = self._extract_solution(*solution)
+            else:
+                result = self._get_fallback_solution()
 
-    def solve(self):
-        """Résoudre le problème de placement d'antennes"""
+        except Exception as e:
+            print(f"Error in antenna solver: {e}")
+            import traceback
+            traceback.print_exc()
+            timer.start(EXTRACT)
+            result = self._get_fallback_solution()
+
+        result['backend'] = backend
+        result['timings'] = timer.report()
+        return result
+
+    def _solve_arrays(self, backend, timer, progress=None, cache=None, warm_start=True):
+        """PLNE sur le backend; renvoie (sites ouverts, site par utilisateur, niveau par site, objectif, optimal) ou None"""
+        if backend == HIGHS:
+            return self._solve_highs(timer, progress)
+        return self._solve_gurobi(timer, progress, cache, warm_start)
+
+    def solve_lagrangian(self, progress=None, trace_memory=False, iterations=ITERATIONS,
+                         time_limit=None):
+        """
+        Relaxation lagrangienne des affectations (voir lagrangian.py): solution
+        réparée et borne inférieure, sans solveur PLNE
+
+        Args:
+            progress: SolverProgress optionnel
+            trace_memory: Ajouter le pic mémoire tracemalloc aux timings
+            iterations: Itérations de sous-gradient au plus
+            time_limit: Temps maximum (s), par défaut le TimeLimit des paramètres
+
+        Returns:
+            Le dict de solve(), avec 'lower_bound', 'gap' et 'iterations' en plus
+        """
+        timer = PhaseTimer(trace_memory)
+        timer.include(self.data_timer)
+        d = self.model_data
+        if time_limit is None:
+            time_limit = resolve_params(PARAMS).get('TimeLimit')
+
+        timer.start(OPTIMIZE)
+        relaxed = solve_lagrangian(d.connection_costs, d.setup_costs, d.capacities,
+                                   max_antennas=d.max_antennas or None,
+                                   min_coverage=int(d.num_users * 0.8), iterations=iterations,
+                                   time_limit=time_limit, progress=progress)
+
+        timer.start(EXTRACT)
+        if relaxed['objective'] is not None:
+            result = self._extract_solution(*self._site_levels(relaxed['site_of']),
+                                            relaxed['objective'], relaxed['status'] == OPTIMAL)
+        else:
+            result = self._get_fallback_solution()
+        result['lower_bound'] = relaxed['lower_bound']
+        result['gap'] = relaxed['gap']
+        result['iterations'] = relaxed['iterations']
+        result['method'] = 'Lagrangian'
+        result['timings'] = timer.report()
+        return result
+
+    def solve_tiled(self, tile_size=None, workers=None, backend=None, progress=None,
+                    trace_memory=False, warm_start=True):
+        """
+        Résolution par tuiles géographiques (voir tiling.py): les tuiles sont
+        résolues en parallèle, puis les utilisateurs de frontière réaffectés
+        par un PLNE de réparation
+
+        Args:
+            tile_size: Côté des tuiles, par défaut TILE_RADII rayons de couverture
+            workers: Nombre de processus, par défaut un par cœur; 1 pour tout
+                résoudre dans ce processus
+            backend: GUROBI ou HIGHS pour les PLNE des tuiles et de réparation
+            progress: SolverProgress optionnel, pour le PLNE de réparation
+            trace_memory: Ajouter le pic mémoire tracemalloc aux timings
+            warm_start: Départs Gurobi des PLNE de tuile
+
+        Returns:
+            Le dict de solve(), avec 'tiles' et 'boundary_users' en plus; la
+            solution de secours si ni la réparation ni la relaxation sur toute
+            l'instance ne trouvent de solution
+        """
+        backend = backend or default_backend()
+        timer = PhaseTimer(trace_memory)
+        timer.include(self.data_timer)
+        d = self.model_data
         try:
-            m = gp.Model("Antenna_Placement")
-
-            # Données
-            U = self.model_data.num_users
-            S = self.model_data.num_sites
-            C = self.model_data.setup_costs
-            D = self.model_data.connection_costs
-            K = self.model_data.capacities
-            R = self.model_data.coverage_radius
-            max_antennas = self.model_data.max_antennas
-
-            # Variables de décision
-            # y[j] = 1 si une antenne est installée au site j
-            y = m.addVars(S, vtype=GRB.BINARY, name="install_antenna")
-
-            # x[i][j] = 1 si l'utilisateur i est affecté au site j
-            x = m.addVars(U, S, vtype=GRB.BINARY, name="assign_user")
-
-            # z[j][k] = 1 si la capacité k est choisie pour le site j
-            capacity_options = len(K)
-            z = m.addVars(S, capacity_options, vtype=GRB.BINARY, name="capacity_level")
-
-            # Contraintes
-
-            # 1. Chaque utilisateur doit être affecté à exactement un site
-            for i in range(U):
-                # Seulement aux sites accessibles (dans le rayon)
-                accessible_sites = [
-                    j for j in range(S)
-                    if self.model_data.can_connect(i, j)
-                ]
-                if accessible_sites:
-                    m.addConstr(
-                        gp.quicksum(x[i, j] for j in accessible_sites) == 1,
-                        name=f"assign_user_{i}"
-                    )
-
-            # 2. Un utilisateur ne peut être affecté qu'à un site avec antenne
-            for i in range(U):
-                for j in range(S):
-                    m.addConstr(x[i, j] <= y[j], name=f"require_antenna_{i}_{j}")
-
-            # 3. Contrainte de capacité
-            for j in range(S):
-                total_users = gp.quicksum(x[i, j] for i in range(U))
-                capacity = gp.quicksum(z[j, k] * K[k] for k in range(capacity_options))
-                m.addConstr(total_users <= capacity, name=f"capacity_{j}")
+            timer.start(OPTIMIZE)
+            site_of, tile_of, tiles = solve_tiles(d, tile_size, workers, backend, warm_start)
+            D = np.asarray(d.connection_costs, dtype=float)
+            boundary = boundary_users(site_of, tile_of, np.isfinite(D).any(axis=1), d.num_sites)
+            if len(boundary):
+                params = resolve_params(PARAMS)
+                repaired = repair_boundary(site_of, boundary, D, d.setup_costs, d.capacities,
+                                           d.max_antennas, backend, params.get('TimeLimit'),
+                                           params.get('MIPGap'), progress)
+                if repaired is None:
+                    # Sites fixés par les tuiles incompatibles: relaxation sur toute l'instance
+                    relaxed = solve_lagrangian(D, d.setup_costs, d.capacities,
+                                               max_antennas=d.max_antennas or None,
+                                               min_coverage=int(d.num_users * 0.8),
+                                               time_limit=params.get('TimeLimit'))
+                    if relaxed['status'] == NO_SOLUTION:
+                        raise RuntimeError("No feasible tiled solution after boundary repair")
+                    repaired = relaxed['site_of']
+                site_of = repaired
+
+            timer.start(EXTRACT)
+            if not (site_of >= 0).any():
+                raise RuntimeError("No feasible tiled solution")
+            assigned = np.flatnonzero(site_of >= 0)
+            opened, site_of, level = self._site_levels(site_of)
+            objective = (float(np.asarray(d.setup_costs, dtype=float)[opened].sum())
+                         + float(D[assigned, site_of[assigned]].sum()))
+            result = self._extract_solution(opened, site_of, level, objective, False)
+            result['tiles'] = tiles
+            result['boundary_users'] = len(boundary)
 
-            # 4. Un seul niveau de capacité par site
+        except Exception as e:
+            print(f"Error in tiled antenna solver: {e}")
+            import traceback
+            traceback.print_exc()
+            timer.start(EXTRACT)
+            result = self._get_fallback_solution()
+
+        result['backend'] = backend
+        result['method'] = 'Tiled'
+        result['timings'] = timer.report()
+        return result
+
+    def _site_levels(self, site_of):
+        """Sites ouverts et niveau de capacité (le plus petit suffisant) d'une affectation"""
+        K = np.asarray(self.model_data.capacities)
+        load = np.bincount(site_of[site_of >= 0], minlength=self.model_data.num_sites)
+        opened = load > 0
+        level = np.argmin(np.where(K[None, :] >= load[:, None], K[None, :], np.inf), axis=1)
+        return opened, site_of, np.where(opened, level, -1)
+
+    @staticmethod
+    def _compact(y, x, z):
+        """Sites ouverts, site de chaque utilisateur (-1 sans) et niveau de chaque site (-1 fermé)"""
+        opened = y > 0.5
+        site_of = np.where(x.max(axis=1, initial=0.0) > 0.5, x.argmax(axis=1), -1)
+        return opened, site_of, np.where(opened, z.argmax(axis=1), -1)
+
+    def _solve_gurobi(self, timer, progress, cache=None, warm_start=True):
+        """Modèle Gurobi; renvoie (sites ouverts, site par utilisateur, niveau par site, objectif, optimal) ou None"""
+        timer.start(BUILD)
+        loaded = None
+        if cache is not None:
+            d = self.model_data
+            key = instance_key("Antenna_Placement", d.setup_costs, d.connection_costs,
+                               d.capacities, d.max_antennas)
+            loaded = cache.load(key, defaults=PARAMS)
+        if loaded is not None:
+            m, v, _ = loaded
+            y, x, z = v['y'], v['x'], v['z']
+        else:
+            m, y, x, z = self._build_gurobi()
+            if cache is not None:
+                cache.store(key, m, {'y': y, 'x': x, 'z': z})
+
+        timer.record_model(m)
+        if warm_start:
+            # Départ partiel: les sites de secours installés, le reste laissé à Gurobi
+            timer.start(HEURISTIC)
+            start = np.full(self.model_data.num_sites, np.nan)
+            start[self._greedy_solution()[0]] = 1.0
+            set_starts(m, y, [start])
+
+        # Optimiser
+        timer.start(OPTIMIZE)
+        optimize(m, progress)
+
+        if m.status == GRB.OPTIMAL or m.status == GRB.TIME_LIMIT:
+            # Toutes les valeurs en un appel: y, x puis z dans l'ordre de _build_gurobi
+            S, U, K = self.model_data.num_sites, self.model_data.num_users, len(self.model_data.capacities)
+            values = np.asarray(m.getAttr('X', m.getVars()))
+            return (*self._compact(values[:S], values[S:S + U * S].reshape(U, S),
+                                   values[S + U * S:].reshape(S, K)),
+                    m.objVal, m.status == GRB.OPTIMAL)
+        return None
+
+    def _build_gurobi(self):
+        """Modèle Gurobi et ses variables y (S,), x (U, S), z (S, K) en MVar"""
+        m = create_model("Antenna_Placement", defaults=PARAMS)
+
+        # Données
+        U = self.model_data.num_users
+        S = self.model_data.num_sites
+        C = self.model_data.setup_costs
+        D = self.model_data.connection_costs
+        K = self.model_data.capacities
+        max_antennas = self.model_data.max_antennas
+
+        # Variables de décision
+        # y[j] = 1 si une antenne est installée au site j
+        y = m.addVars(S, vtype=GRB.BINARY, name="install_antenna")
+
+        # x[i][j] = 1 si l'utilisateur i est affecté au site j
+        x = m.addVars(U, S, vtype=GRB.BINARY, name="assign_user")
+
+        # Affectations hors rayon (coût infini) impossibles
+        for i in range(U):
             for j in range(S):
-                m.addConstr(
-                    gp.quicksum(z[j, k] for k in range(capacity_options)) == y[j],
-                    name=f"single_capacity_{j}"
-                )
+                if not self.model_data.can_connect(i, j):
+                    x[i, j].UB = 0
+
+        # z[j][k] = 1 si la capacité k est choisie pour le site j
+        capacity_options = len(K)
+        z = m.addVars(S, capacity_options, vtype=GRB.BINARY, name="capacity_level")
 
-            # 5. Nombre maximum d'antennes (si spécifié)
-            if max_antennas:
+        # Contraintes
+
+        # 1. Chaque utilisateur doit être affecté à exactement un site
+        for i in range(U):
+            # Seulement aux sites accessibles (dans le rayon)
+            accessible_sites = [
+                j for j in range(S)
+                if self.model_data.can_connect(i, j)
+            ]
+            if accessible_sites:
                 m.addConstr(
-                    gp.quicksum(y[j] for j in range(S)) <= max_antennas,
-                    name="max_antennas"
+                    gp.quicksum(x[i, j] for j in accessible_sites) == 1,
+                    name=f"assign_user_{i}"
                 )
 
-            # 6. Au moins 80% des utilisateurs doivent être couverts
-            min_coverage = int(U * 0.8)
-            covered_users = gp.quicksum(
-                x[i, j]
-                for i in range(U)
-                for j in range(S)
-                if self.model_data.can_connect(i, j)
-            )
-            m.addConstr(covered_users >= min_coverage, name="min_coverage")
-
-            # Objectif: Minimiser coût total = coûts installation + coûts connexion
-            setup_cost = gp.quicksum(C[j] * y[j] for j in range(S))
-            connection_cost = gp.quicksum(
-                D[i][j] * x[i, j]
-                for i in range(U)
-                for j in range(S)
-            )
+        # 2. Un utilisateur ne peut être affecté qu'à un site avec antenne
+        for i in range(U):
+            for j in range(S):
+                m.addConstr(x[i, j] <= y[j], name=f"require_antenna_{i}_{j}")
 
-            m.setObjective(setup_cost + connection_cost, GRB.MINIMIZE)
+        # 3. Contrainte de capacité
+        for j in range(S):
+            total_users = gp.quicksum(x[i, j] for i in range(U))
+            capacity = gp.quicksum(z[j, k] * K[k] for k in range(capacity_options))
+            m.addConstr(total_users <= capacity, name=f"capacity_{j}")
 
-            # Paramètres
-            m.setParam('MIPGap', 0.05)
-            m.setParam('TimeLimit', 60)
+        # 4. Un seul niveau de capacité par site
+        for j in range(S):
+            m.addConstr(
+                gp.quicksum(z[j, k] for k in range(capacity_options)) == y[j],
+                name=f"single_capacity_{j}"
+            )
 
-            # Optimiser
-            m.optimize()
+        # 5. Nombre maximum d'antennes (si spécifié)
+        if max_antennas:
+            m.addConstr(
+                gp.quicksum(y[j] for j in range(S)) <= max_antennas,
+                name="max_antennas"
+            )
 
-            if m.status == GRB.OPTIMAL or m.status == GRB.TIME_LIMIT:
-                return self._extract_solution(m, y, x, z)
-            else:
-                return self._get_fallback_solution()
+        # 6. Au moins 80% des utilisateurs doivent être couverts
+        min_coverage = int(U * 0.8)
+        covered_users = gp.quicksum(
+            x[i, j]
+            for i in range(U)
+            for j in range(S)
+            if self.model_data.can_connect(i, j)
+        )
+        m.addConstr(covered_users >= min_coverage, name="min_coverage")
+
+        # Objectif: Minimiser coût total = coûts installation + coûts connexion
+        setup_cost = gp.quicksum(C[j] * y[j] for j in range(S))
+        connection_cost = gp.quicksum(
+            D[i][j] * x[i, j]
+            for i in range(U)
+            for j in range(S)
+            if self.model_data.can_connect(i, j)
+        )
 
-        except Exception as e:
-            print(f"Error in antenna solver: {e}")
-            import traceback
-            traceback.print_exc()
-            return self._get_fallback_solution()
+        m.setObjective(setup_cost + connection_cost, GRB.MINIMIZE)
 
-    def _extract_solution(self, model, y, x, z):
-        """Extraire la solution"""
+        return (m, gp.MVar.fromlist([y[j] for j in range(S)]),
+                gp.MVar.fromlist([x[i, j] for i in range(U) for j in range(S)]).reshape(U, S),
+                gp.MVar.fromlist([z[j, k] for j in range(S)
+                                  for k in range(capacity_options)]).reshape(S, capacity_options))
+
+    def _solve_highs(self, timer, progress):
+        """
+        Même modèle sous forme matricielle, résolu par HiGHS (scipy.optimize.milp).
+        Les affectations hors rayon (coût infini) sont des variables fixées à 0,
+        et les liens x <= y ne portent que sur les paires accessibles.
+        """
+        timer.start(BUILD)
+        U = self.model_data.num_users
+        S = self.model_data.num_sites
+        K = np.asarray(self.model_data.capacities, dtype=float)
+        D = np.asarray(self.model_data.connection_costs, dtype=float).reshape(U, S)
+        accessible = np.isfinite(D)
+        max_antennas = self.model_data.max_antennas
+
+        model = LinearModel("Antenna_Placement")
+        y = model.add_binary(S, obj=np.asarray(self.model_data.setup_costs, dtype=float))
+        x = model.add_vars(U * S, lb=0.0, ub=accessible.ravel().astype(float), integer=True,
+                           obj=np.where(accessible, D, 0.0).ravel()).reshape(U, S)
+        z = model.add_binary(S * len(K)).reshape(S, len(K))
+
+        # 1. Affectation unique des utilisateurs qui ont un site accessible
+        users, sites = np.nonzero(accessible)
+        assignable = np.flatnonzero(accessible.any(axis=1))
+        row_of = np.full(U, -1)
+        row_of[assignable] = np.arange(len(assignable))
+        model.add_constrs(sp.csr_matrix((np.ones(len(users)), (row_of[users], x[users, sites])),
+                                        shape=(len(assignable), model.num_vars)), lb=1.0, ub=1.0)
+
+        # 2. x_ij <= y_j sur les paires accessibles
+        pairs = np.arange(len(users))
+        model.add_constrs(sp.csr_matrix(
+            (np.concatenate([np.ones(len(users)), -np.ones(len(users))]),
+             (np.concatenate([pairs, pairs]), np.concatenate([x[users, sites], y[sites]]))),
+            shape=(len(users), model.num_vars)), ub=0.0)
+
+        # 3. Capacité: sum_i x_ij - sum_k K_k z_jk <= 0
+        model.add_constrs(sp.csr_matrix(
+            (np.concatenate([np.ones(len(users)), -np.tile(K, S)]),
+             (np.concatenate([sites, np.repeat(np.arange(S), len(K))]),
+              np.concatenate([x[users, sites], z.ravel()]))),
+            shape=(S, model.num_vars)), ub=0.0)
+
+        # 4. Un seul niveau de capacité par site installé: sum_k z_jk - y_j = 0
+        model.add_constrs(sp.csr_matrix(
+            (np.concatenate([np.ones(z.size), -np.ones(S)]),
+             (np.concatenate([np.repeat(np.arange(S), len(K)), np.arange(S)]),
+              np.concatenate([z.ravel(), y]))),
+            shape=(S, model.num_vars)), lb=0.0, ub=0.0)
+
+        # 5. Nombre maximum d'antennes
+        if max_antennas:
+            model.add_constrs(sp.csr_matrix((np.ones(S), (np.zeros(S, dtype=np.int64), y)),
+                                            shape=(1, model.num_vars)), ub=max_antennas)
+
+        # 6. Au moins 80% des utilisateurs couverts
+        model.add_constrs(sp.csr_matrix((np.ones(len(users)),
+                                         (np.zeros(len(users), dtype=np.int64), x[users, sites])),
+                                        shape=(1, model.num_vars)), lb=int(U * 0.8))
+
+        timer.record_model(model)
+        timer.start(OPTIMIZE)
+        params = resolve_params(PARAMS)
+        solution = model.solve(HIGHS, time_limit=params.get('TimeLimit'), mip_gap=params.get('MIPGap'),
+                               progress=progress)
+        if not solution.has_solution:
+            return None
+        return (*self._compact(solution.x[y], solution.x[x], solution.x[z]),
+                solution.objective, solution.status == OPTIMAL)
+
+    def _extract_solution(self, opened, site_of, level, objective, optimal):
+        """
+        Extraire la solution
+
+        Les utilisateurs affectés à un site sont donnés par leurs indices
+        ('assigned_users'); assigned_user_details() construit leurs dicts à la demande.
+
+        Args:
+            opened: Sites ouverts (S,) bool
+            site_of: Site de chaque utilisateur (U,), -1 si non affecté
+            level: Indice du niveau de capacité de chaque site (S,), -1 si fermé
+            objective: Valeur de l'objectif
+            optimal: Solution prouvée optimale
+        """
         U = self.model_data.num_users
         S = self.model_data.num_sites
         K = self.model_data.capacities
+        setup_costs = self.model_data.setup_costs
+
+        # Utilisateurs groupés par site
+        assigned = np.flatnonzero(site_of >= 0)
+        members = assigned[np.argsort(site_of[assigned], kind='stable')]
+        bounds = np.searchsorted(site_of[members], np.arange(S + 1))
+        demand = np.array([user.get('demand', 1) for user in self.model_data.users])
+        total_demand = np.bincount(site_of[assigned], weights=demand[assigned],
+                                   minlength=S).astype(demand.dtype)
 
         # Sites sélectionnés
         selected_sites = []
-        for j in range(S):
-            if y[j].x > 0.5:
-                site_info = self.model_data.candidate_sites[j].copy()
-                site_info['built'] = True
-                site_info['setup_cost'] = self.model_data.setup_costs[j]
-
-                # Capacité choisie
-                for k_idx, capacity in enumerate(K):
-                    if z[j, k_idx].x > 0.5:
-                        site_info['capacity'] = capacity
-                        break
-
-                # Utilisateurs affectés
-                assigned_users = []
-                total_demand = 0
-                for i in range(U):
-                    if x[i, j].x > 0.5:
-                        user_info = self.model_data.users[i].copy()
-                        user_info['connection_cost'] = self.model_data.connection_costs[i][j]
-                        assigned_users.append(user_info)
-                        total_demand += user_info.get('demand', 1)
-
-                site_info['assigned_users'] = assigned_users
-                site_info['num_users'] = len(assigned_users)
-                site_info['total_demand'] = total_demand
-                site_info['utilization'] = len(assigned_users) / site_info['capacity'] if site_info['capacity'] > 0 else 0
-
-                selected_sites.append(site_info)
+        for j in np.flatnonzero(opened).tolist():
+            site_info = self.model_data.candidate_sites[j].copy()
+            site_info['built'] = True
+            site_info['site_index'] = j
+            site_info['setup_cost'] = setup_costs[j]
+            site_info['capacity'] = K[level[j]]
+            site_info['assigned_users'] = members[bounds[j]:bounds[j + 1]].tolist()
+            site_info['num_users'] = len(site_info['assigned_users'])
+            site_info['total_demand'] = total_demand[j].item()
+            site_info['utilization'] = site_info['num_users'] / site_info['capacity'] if site_info['capacity'] > 0 else 0
+            selected_sites.append(site_info)
 
         # Métriques
         total_users = U
-        covered_users = sum(len(site['assigned_users']) for site in selected_sites)
+        covered_users = len(assigned)
         coverage_rate = covered_users / total_users if total_users > 0 else 0
 
-        total_cost = model.objVal
+        total_cost = objective
         setup_cost = sum(site['setup_cost'] for site in selected_sites)
         connection_cost = total_cost - setup_cost
 
@@ -179,47 +471,86 @@ class AntennaPlacementSolver:
             "setup_cost": setup_cost,
             "connection_cost": connection_cost,
             "avg_utilization": np.mean([site['utilization'] for site in selected_sites]) if selected_sites else 0,
-            "status": "Optimal" if model.status == GRB.OPTIMAL else "Feasible"
+            "status": "Optimal" if optimal else "Feasible"
         }
 
-    def _get_fallback_solution(self):
-        """Solution de secours"""
-        # Sélectionner les 3 sites les plus centraux
-        selected_sites = []
-
-        # Calculer le centre de masse des utilisateurs
-        avg_x = np.mean([u['x'] for u in self.model_data.users])
-        avg_y = np.mean([u['y'] for u in self.model_data.users])
-
-        # Trier les sites par distance au centre
-        sites_with_dist = []
-        for j, site in enumerate(self.model_data.candidate_sites):
-            distance = ((site['x'] - avg_x)**2 + (site['y'] - avg_y)**2) ** 0.5
-            sites_with_dist.append((j, site, distance))
+    def assigned_user_details(self, site):
+        """
+        Dicts des utilisateurs affectés à un site du résultat (copies, avec
+        leur 'connection_cost'), construits à la demande
+
+        Args:
+            site: Élément de result['selected_sites']
+        """
+        j = site['site_index']
+        return [dict(self.model_data.users[i], connection_cost=self.model_data.connection_costs[i][j])
+                for i in site.get('assigned_users', [])]
+
+    def _greedy_sites(self, users, sites, costs):
+        """
+        Sites ouverts un à un, par nombre d'utilisateurs nouvellement couverts
+        (au plus la capacité maximale) par unité de coût d'installation, dans
+        la limite de max_antennas. Chaque site ouvert couvre ses utilisateurs
+        non couverts les plus proches; le compte des autres sites est
+        décrémenté pour ces utilisateurs seulement.
+
+        Args:
+            users, sites, costs: Paires accessibles, triées par utilisateur
+
+        Returns:
+            Sites ouverts (S,) bool
+        """
+        U, S = self.model_data.num_users, self.model_data.num_sites
+        capacity = int(max(self.model_data.capacities))
+        setup_costs = np.maximum(np.asarray(self.model_data.setup_costs, dtype=float), 1e-9)
+        limit = self.model_data.max_antennas or S
+
+        # Paires groupées par site, et début des paires de chaque utilisateur
+        by_site = np.argsort(sites, kind='stable')
+        site_start = np.searchsorted(sites[by_site], np.arange(S + 1))
+        user_start = np.searchsorted(users, np.arange(U + 1))
+
+        reach = np.bincount(sites, minlength=S)
+        covered = np.zeros(U, dtype=bool)
+        opened = np.zeros(S, dtype=bool)
+        while opened.sum() < limit:
+            gain = np.where(opened, 0, np.minimum(reach, capacity)) / setup_costs
+            j = int(np.argmax(gain))
+            if gain[j] <= 0:
+                break
+            opened[j] = True
+            pairs = by_site[site_start[j]:site_start[j + 1]]
+            nearby = users[pairs[np.argsort(costs[pairs], kind='stable')]]
+            new = nearby[~covered[nearby]][:capacity]
+            covered[new] = True
+            # Paires des utilisateurs nouvellement couverts
+            count = user_start[new + 1] - user_start[new]
+            offset = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+            reach -= np.bincount(sites[np.repeat(user_start[new], count) + offset], minlength=S)
+        return opened
+
+    def _greedy_solution(self):
+        """
+        Solution gloutonne: sites de _greedy_sites(), puis chaque utilisateur
+        affecté au site ouvert le plus proche qui a encore de la place
+
+        Returns:
+            (sites ouverts, site de chaque utilisateur, niveau de chaque site, coût)
+        """
+        D = np.asarray(self.model_data.connection_costs, dtype=float)
+        users, sites, costs = accessible_pairs(D)
+        opened = self._greedy_sites(users, sites, costs)
+        site_of = assign(opened, users, sites, costs, int(max(self.model_data.capacities)),
+                         self.model_data.num_users)
+        opened, site_of, level = self._site_levels(site_of)
+        assigned = np.flatnonzero(site_of >= 0)
+        cost = (float(np.asarray(self.model_data.setup_costs, dtype=float)[opened].sum())
+                + float(D[assigned, site_of[assigned]].sum()))
+        return opened, site_of, level, cost
 
-        # Prendre les 3 sites les plus proches
-        sites_with_dist.sort(key=lambda x: x[2])
-
-        for j, site, distance in sites_with_dist[:3]:
-            site_info = site.copy()
-            site_info['built'] = True
-            site_info['setup_cost'] = self.model_data.setup_costs[j]
-            site_info['capacity'] = 100
-            site_info['num_users'] = len(self.model_data.users) // 3
-            site_info['utilization'] = 0.6
-            selected_sites.append(site_info)
-
-        return {
-            "objective": sum(site['setup_cost'] for site in selected_sites) * 1.5,
-            "selected_sites": selected_sites,
-            "total_users": self.model_data.num_users,
-            "covered_users": int(self.model_data.num_users * 0.7),
-            "coverage_rate": 0.7,
-            "num_antennas": len(selected_sites),
-            "total_capacity": 300,
-            "setup_cost": sum(site['setup_cost'] for site in selected_sites),
-            "connection_cost": sum(site['setup_cost'] for site in selected_sites) * 0.5,
-            "avg_utilization": 0.6,
-            "status": "Fallback",
-            "note": "Using fallback solution"
-        }
+    def _get_fallback_solution(self):
+        """Solution de secours: la solution gloutonne, avec ses métriques réelles"""
+        result = self._extract_solution(*self._greedy_solution(), False)
+        result['status'] = "Fallback"
+        result['note'] = "Using fallback solution"
+        return result
@@ -0,0 +1,248 @@
+"""
+Découpage géographique du placement d'antennes en tuiles.
+
+Deux utilisateurs éloignés de plus de deux rayons de couverture ne se
+disputent jamais un site. Le plan est découpé en une grille de tuiles
+carrées (côté TILE_RADII rayons de couverture par défaut): chaque
+utilisateur appartient au cœur d'une seule tuile, et une tuile reçoit les
+sites à moins d'un rayon de son cœur, donc tous les sites accessibles à ses
+utilisateurs. Les tuiles voisines se recouvrent sur ces bandes de sites.
+
+1. Le budget global max_antennas est réparti entre les tuiles: de quoi
+   servir leurs utilisateurs à capacité maximale, puis le reste au prorata
+   de leurs utilisateurs (plus fort reste).
+2. Les tuiles sont résolues indépendamment, dans un pool de processus, par
+   le PLNE du solveur (la relaxation lagrangienne quand il échoue).
+3. Un site ouvert par plusieurs tuiles peut dépasser sa capacité, et son
+   coût d'installation ne doit être payé qu'une fois: les utilisateurs
+   affectés à ces sites partagés (utilisateurs de frontière), avec ceux
+   qu'une tuile n'a pas pu affecter dans son budget, sont réaffectés par un
+   petit PLNE de réparation, les autres affectations restant fixées.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy.sparse as sp
+
+from shared.backends import NO_SOLUTION, LinearModel
+from shared.gurobi_utils import get_profile, set_profile, thread_budget
+from shared.timings import PhaseTimer
+
+from .lagrangian import solve_lagrangian
+
+# Côté des tuiles par défaut, en rayons de couverture
+TILE_RADII = 4.0
+
+
+def make_tiles(user_xy, site_xy, radius, size):
+    """
+    Tuiles de la grille de côté `size` contenant au moins un utilisateur
+
+    Returns:
+        (tuile de chaque utilisateur (U,), liste de (utilisateurs, sites) en
+        indices globaux par tuile, les sites étant ceux du cœur élargi du rayon)
+    """
+    origin = user_xy.min(axis=0)
+    cell = np.floor((user_xy - origin) / size).astype(np.int64)
+    cells, tile_of = np.unique(cell, axis=0, return_inverse=True)
+    tile_of = tile_of.ravel()
+    by_tile = np.argsort(tile_of, kind='stable')
+    bounds = np.searchsorted(tile_of[by_tile], np.arange(len(cells) + 1))
+    low = origin + cells * size - radius
+    high = low + size + 2 * radius
+    tiles = []
+    for t in range(len(cells)):
+        inside = np.all((site_xy >= low[t]) & (site_xy <= high[t]), axis=1)
+        tiles.append((by_tile[bounds[t]:bounds[t + 1]], np.flatnonzero(inside)))
+    return tile_of, tiles
+
+
+def allocate_budget(total, weights, minimum):
+    """
+    Répartition de `total` antennes entre les tuiles: chacune reçoit son
+    minimum, puis le reste au prorata des poids par la méthode du plus fort
+    reste (None partout sans limite)
+    """
+    if total is None:
+        return [None] * len(weights)
+    weights = np.asarray(weights, dtype=float)
+    minimum = np.asarray(minimum, dtype=np.int64)
+    spare = total - minimum.sum()
+    if spare < 0:
+        raise ValueError("max_antennas below the antennas the tiles need")
+    quota = spare * weights / weights.sum() if weights.sum() > 0 else np.zeros(len(weights))
+    share = np.floor(quota).astype(np.int64)
+    remainder = np.argsort(share - quota, kind='stable')[:spare - share.sum()]
+    share[remainder] += 1
+    return (minimum + share).tolist()
+
+
+def _init_worker(profile):
+    set_profile(**profile)
+
+
+def _solve_tile(task):
+    """
+    Résoudre une tuile (dans un processus du pool), par la relaxation
+    lagrangienne si le PLNE échoue. Sans solution de la relaxation non plus,
+    les utilisateurs de la tuile restent non affectés: le PLNE de réparation
+    les reprend comme utilisateurs de frontière.
+
+    Returns:
+        Indice local du site de chaque utilisateur de la tuile, -1 si non affecté
+    """
+    from .solver import AntennaPlacementSolver
+
+    users, sites, setup_costs, D, capacities, radius, budget, backend, warm_start = task
+    solver = AntennaPlacementSolver(users, sites, setup_costs=setup_costs, connection_costs=D,
+                                    capacities=capacities, coverage_radius=radius,
+                                    max_antennas=budget)
+    try:
+        solution = solver._solve_arrays(backend, PhaseTimer(), warm_start=warm_start)
+    except Exception as e:
+        print(f"Error in antenna tile solver: {e}")
+        solution = None
+    if solution is not None:
+        return solution[1]
+    relaxed = solve_lagrangian(D, setup_costs, capacities, max_antennas=budget,
+                               min_coverage=int(len(users) * 0.8))
+    if relaxed['status'] == NO_SOLUTION:
+        print(f"No solution for antenna tile of {len(users)} users, left to the repair")
+        return np.full(len(users), -1)
+    return relaxed['site_of']
+
+
+def solve_tiles(data, size=None, workers=None, backend=None, warm_start=True):
+    """
+    Résoudre les tuiles d'une instance, en parallèle
+
+    Args:
+        data: AntennaPlacementModel
+        size: Côté des tuiles, par défaut TILE_RADII rayons de couverture
+        workers: Nombre de processus, par défaut un par cœur (au plus un par
+            tuile); 1 résout les tuiles dans le processus appelant
+        backend: Backend des PLNE de tuile
+        warm_start: Départs Gurobi des PLNE de tuile
+
+    Returns:
+        (site de chaque utilisateur (U,), tuile de chaque utilisateur (U,),
+        nombre de tuiles)
+    """
+    user_xy = np.array([(u['x'], u['y']) for u in data.users], dtype=float)
+    site_xy = np.array([(s['x'], s['y']) for s in data.candidate_sites], dtype=float)
+    D = np.asarray(data.connection_costs, dtype=float)
+    setup_costs = np.asarray(data.setup_costs, dtype=float)
+    size = size or TILE_RADII * data.coverage_radius
+    tile_of, tiles = make_tiles(user_xy, site_xy, data.coverage_radius, size)
+    # Les utilisateurs sans site accessible restent hors des tuiles: chaque
+    # PLNE de tuile affecte alors tous les siens, et sa contrainte de
+    # couverture de 80% ne peut pas le rendre infaisable
+    assignable = np.isfinite(D).any(axis=1)
+    tiles = [(users[assignable[users]], sites) for users, sites in tiles]
+    tiles = [(users, sites) for users, sites in tiles if len(users)]
+    # Au moins assez d'antennes de capacité maximale pour les utilisateurs de la tuile
+    counts = np.array([len(users) for users, _ in tiles])
+    budgets = allocate_budget(data.max_antennas or None, counts,
+                              -(-counts // max(data.capacities)))
+
+    tasks = [([data.users[i] for i in users], [data.candidate_sites[j] for j in sites],
+              setup_costs[sites].tolist(), D[np.ix_(users, sites)], list(data.capacities),
+              data.coverage_radius, budget, backend, warm_start)
+             for (users, sites), budget in zip(tiles, budgets)]
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        local = [_solve_tile(task) for task in tasks]
+    else:
+        # Chaque processus reçoit le profil Gurobi avec sa part du budget de threads
+        profile = dict(get_profile(), Threads=max(1, thread_budget() // workers))
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_worker, initargs=(profile,)) as pool:
+            local = list(pool.map(_solve_tile, tasks))
+
+    site_of = np.full(data.num_users, -1)
+    for (users, sites), tile_sites in zip(tiles, local):
+        tile_sites = np.asarray(tile_sites)
+        site_of[users] = np.where(tile_sites >= 0, sites[np.maximum(tile_sites, 0)], -1)
+    return site_of, tile_of, len(tiles)
+
+
+def boundary_users(site_of, tile_of, assignable, num_sites):
+    """
+    Utilisateurs affectés à un site que des utilisateurs de plusieurs tuiles
+    utilisent, et utilisateurs accessibles restés non affectés
+    """
+    assigned = site_of >= 0
+    pairs = np.unique(np.column_stack([site_of[assigned], tile_of[assigned]]), axis=0)
+    shared = np.bincount(pairs[:, 0], minlength=num_sites) > 1
+    return np.flatnonzero((assigned & shared[np.maximum(site_of, 0)]) | (assignable & ~assigned))
+
+
+def repair_boundary(site_of, boundary, D, setup_costs, capacities, max_antennas=None,
+                    backend=None, time_limit=None, mip_gap=None, progress=None):
+    """
+    PLNE de réparation des utilisateurs de frontière: ils sont réaffectés à
+    leurs sites accessibles, sur la capacité que les autres utilisateurs
+    (fixés) laissent libre; les sites utilisés par ces derniers restent
+    ouverts, les autres s'ouvrent à leur coût d'installation. La couverture
+    minimale ne change pas, tous les utilisateurs de frontière restant affectés.
+
+    Returns:
+        site_of réaffecté (copie), ou None sans solution
+    """
+    U, S = D.shape
+    K = np.asarray(capacities, dtype=float)
+    setup_costs = np.asarray(setup_costs, dtype=float)
+    fixed = site_of >= 0
+    fixed[boundary] = False
+    fixed_load = np.bincount(site_of[fixed], minlength=S)
+
+    users, sites = np.nonzero(np.isfinite(D[boundary]))
+    reachable, column = np.unique(sites, return_inverse=True)
+    R, P = len(reachable), len(users)
+
+    model = LinearModel("Antenna_Boundary_Repair")
+    y = model.add_vars(R, lb=(fixed_load[reachable] > 0).astype(float), ub=1.0, integer=True,
+                       obj=setup_costs[reachable])
+    x = model.add_binary(P, obj=D[boundary[users], reachable[column]])
+    z = model.add_binary(R * len(K)).reshape(R, len(K))
+
+    # 1. Affectation unique des utilisateurs de frontière
+    model.add_constrs(sp.csr_matrix((np.ones(P), (users, x)), shape=(len(boundary), model.num_vars)),
+                      lb=1.0, ub=1.0)
+
+    # 2. x_ij <= y_j
+    pairs = np.arange(P)
+    model.add_constrs(sp.csr_matrix(
+        (np.concatenate([np.ones(P), -np.ones(P)]),
+         (np.concatenate([pairs, pairs]), np.concatenate([x, y[column]]))),
+        shape=(P, model.num_vars)), ub=0.0)
+
+    # 3. Capacité restante: sum_i x_ij - sum_k K_k z_jk <= -charge fixée
+    model.add_constrs(sp.csr_matrix(
+        (np.concatenate([np.ones(P), -np.tile(K, R)]),
+         (np.concatenate([column, np.repeat(np.arange(R), len(K))]),
+          np.concatenate([x, z.ravel()]))),
+        shape=(R, model.num_vars)), ub=-fixed_load[reachable].astype(float))
+
+    # 4. Un seul niveau de capacité par site installé
+    model.add_constrs(sp.csr_matrix(
+        (np.concatenate([np.ones(z.size), -np.ones(R)]),
+         (np.concatenate([np.repeat(np.arange(R), len(K)), np.arange(R)]),
+          np.concatenate([z.ravel(), y]))),
+        shape=(R, model.num_vars)), lb=0.0, ub=0.0)
+
+    # 5. Budget d'antennes restant hors des sites de la réparation
+    if max_antennas:
+        outside = (fixed_load > 0).sum() - (fixed_load[reachable] > 0).sum()
+        model.add_constrs(sp.csr_matrix((np.ones(R), (np.zeros(R, dtype=np.int64), y)),
+                                        shape=(1, model.num_vars)), ub=max_antennas - outside)
+
+    solution = model.solve(backend, time_limit=time_limit, mip_gap=mip_gap, progress=progress)
+    if not solution.has_solution:
+        return None
+    chosen = solution.x[x] > 0.5
+    repaired = site_of.copy()
+    repaired[boundary[users[chosen]]] = reachable[column[chosen]]
+    return repaired
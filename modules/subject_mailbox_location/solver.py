@@ -1,7 +1,8 @@
 import gurobipy as gp
 from gurobipy import GRB
 import numpy as np
-from shared.gurobi_utils import create_model
+from shared.gurobi_utils import create_model, optimize
+from shared.timings import BUILD, DATA, EXTRACT, OPTIMIZE, PhaseTimer
 from .model import MailboxLocationModel
 
 class MailboxLocationSolver:
@@ -9,6 +10,8 @@ class MailboxLocationSolver:
                  costs=None, budgets=None, capacities=None, 
                  mailbox_bounds=None, max_coverage_level=1):
         
+        self.data_timer = PhaseTimer()
+        self.data_timer.start(DATA)
         self.model_data = MailboxLocationModel(
             demand_points, num_mailboxes, radius, costs, budgets, capacities
         )
@@ -16,8 +19,12 @@ class MailboxLocationSolver:
             'x_min': -10, 'x_max': 10, 'y_min': -10, 'y_max': 10
         }
         self.max_coverage_level = max_coverage_level
+        self.data_timer.stop()
 
-    def solve(self):
+    def solve(self, progress=None, trace_memory=False):
+        timer = PhaseTimer(trace_memory)
+        timer.include(self.data_timer)
+        timer.start(BUILD)
         m = create_model("advanced_mailbox_location")
         dp = self.model_data.demand_points
         K = self.model_data.num_mailboxes
@@ -78,9 +85,12 @@ class MailboxLocationSolver:
             GRB.MAXIMIZE
         )
         
-        m.optimize()
+        timer.record_model(m)
+        timer.start(OPTIMIZE)
+        optimize(m, progress)
         
         # Extract solution
+        timer.start(EXTRACT)
         mailbox_locations = []
         for k in range(K):
             if built[k].x > 0.5:
@@ -102,5 +112,6 @@ class MailboxLocationSolver:
             "objective": m.objVal,
             "mailbox_locations": mailbox_locations,
             "coverage_info": coverage_info,
-            "total_built": sum(1 for loc in mailbox_locations if loc['built'])
+            "total_built": sum(1 for loc in mailbox_locations if loc['built']),
+            "timings": timer.report()
         }
\ No newline at end of file
@@ -1,3 +1,7 @@
+import numpy as np
+import scipy.sparse as sp
+
+
 class MISModel:
     """Modèle pour l'Ensemble Indépendant Maximum (scheduling de tâches)"""
 
@@ -12,11 +16,18 @@ class MISModel:
         self.conflicts = conflicts
         self.num_tasks = len(tasks)
 
-        self.adjacency_matrix = [[0] * self.num_tasks for _ in range(self.num_tasks)]
-        for i, j in conflicts:
-            if i < self.num_tasks and j < self.num_tasks:
-                self.adjacency_matrix[i][j] = 1
-                self.adjacency_matrix[j][i] = 1
+        # Conflits (i, j), i < j < n, dédoublonnés, en tableau (m, 2)
+        n = self.num_tasks
+        pairs = np.sort(np.asarray(conflicts, dtype=np.int64).reshape(-1, 2), axis=1)
+        pairs = pairs[(pairs[:, 0] != pairs[:, 1]) & (pairs[:, 0] >= 0) & (pairs[:, 1] < n)]
+        self.conflict_pairs = np.unique(pairs, axis=0)
+
+        # Listes de voisins (CSR symétrique, indices triés)
+        self.neighbours = sp.csr_matrix(
+            (np.ones(2 * len(self.conflict_pairs), dtype=np.int8),
+             (self.conflict_pairs.ravel(), self.conflict_pairs[:, ::-1].ravel())),
+            shape=(n, n))
+        self.neighbours.sort_indices()
 
         if weights:
             self.weights = weights
@@ -25,12 +36,18 @@ class MISModel:
 
     def are_conflicting(self, task_i, task_j):
         """Vérifier si deux tâches sont en conflit"""
-        return self.adjacency_matrix[task_i][task_j] == 1
+        row = self.get_neighbours(task_i)
+        k = np.searchsorted(row, task_j)
+        return bool(k < len(row) and row[k] == task_j)
+
+    def get_neighbours(self, task_id):
+        """Tâches en conflit avec une tâche donnée, en tableau trié (vue sur le CSR)"""
+        return self.neighbours.indices[self.neighbours.indptr[task_id]:self.neighbours.indptr[task_id + 1]]
 
     def get_task_conflicts(self, task_id):
         """Obtenir la liste des tâches en conflit avec une tâche donnée"""
-        return [j for j in range(self.num_tasks) if self.adjacency_matrix[task_id][j] == 1]
+        return self.get_neighbours(task_id).tolist()
 
     def get_task_degree(self, task_id):
         """Degré du sommet (nombre de conflits)"""
-        return sum(self.adjacency_matrix[task_id])
+        return int(self.neighbours.indptr[task_id + 1] - self.neighbours.indptr[task_id])
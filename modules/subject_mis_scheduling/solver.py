@@ -1,130 +1,216 @@
-import gurobipy as gp
-from gurobipy import GRB
+import numpy as np
+import scipy.sparse as sp
+
+from shared.backends import HIGHS, MAXIMIZE, OPTIMAL, LinearModel, default_backend
+from shared.gurobi_utils import create_model, optimize, resolve_params, set_starts
+from shared.timings import BUILD, DATA, EXTRACT, HEURISTIC, OPTIMIZE, PhaseTimer
 
 from .model import MISModel
 
+try:
+    import gurobipy as gp
+    from gurobipy import GRB
+except ImportError:
+    gp = None
+    GRB = None
+
+
+# Paramètres par défaut du solveur (le profil de shared.gurobi_utils les remplace)
+PARAMS = {
+    'MIPGap': 0.01,    # 1% optimality gap
+    'TimeLimit': 30,   # 30 secondes max
+}
+
 
 class MISSolver:
     """Solveur PLNE pour l'Ensemble Indépendant Maximum"""
 
     def __init__(self, tasks, conflicts, **kwargs):
+        self.data_timer = PhaseTimer()
+        self.data_timer.start(DATA)
         self.model_data = MISModel(
             tasks=tasks,
             conflicts=conflicts,
             weights=kwargs.get('weights')
         )
-
-    def solve(self):
-        """Résoudre le problème d'Ensemble Indépendant Maximum"""
+        self.data_timer.stop()
+
+    def solve(self, progress=None, trace_memory=False, backend=None, warm_start=True):
+        """
+        Résoudre le problème d'Ensemble Indépendant Maximum
+
+        Args:
+            progress: SolverProgress optionnel
+            trace_memory: Ajouter le pic mémoire tracemalloc aux timings
+            backend: GUROBI ou HIGHS (shared.backends), par défaut Gurobi s'il est installé
+            warm_start: Donner à Gurobi les solutions gloutonnes (_heuristic_starts) comme
+                solutions de départ (HiGHS via SciPy n'en accepte pas)
+        """
+        backend = backend or default_backend()
+        timer = PhaseTimer(trace_memory)
+        timer.include(self.data_timer)
         try:
-            m = gp.Model("Maximum_Independent_Set")
+            if backend == HIGHS:
+                solution = self._solve_highs(timer, progress)
+            else:
+                solution = self._solve_gurobi(timer, progress, warm_start)
 
-            # Données
-            n = self.model_data.num_tasks
-            weights = self.model_data.weights
+            timer.start(EXTRACT)
+            if solution is not None:
+                result = self._extract_solution(*solution)
+            else:
+                result = self._get_fallback_solution()
 
-            # Variables de décision
-            x = m.addVars(n, vtype=GRB.BINARY, name="select_task")
+        except Exception as e:
+            print(f"Error in MIS solver: {e}")
+            import traceback
+            traceback.print_exc()
+            timer.start(EXTRACT)
+            result = self._get_fallback_solution()
 
-            # Contraintes : pour chaque conflit, au plus une tâche peut être sélectionnée
-            for i in range(n):
-                for j in range(i + 1, n):
-                    if self.model_data.adjacency_matrix[i][j] == 1:
-                        m.addConstr(x[i] + x[j] <= 1, name=f"conflict_{i}_{j}")
+        result['backend'] = backend
+        result['timings'] = timer.report()
+        return result
 
-            # Objectif : maximiser la somme des poids des tâches sélectionnées
-            m.setObjective(
-                gp.quicksum(weights[i] * x[i] for i in range(n)),
-                GRB.MAXIMIZE
-            )
+    def _solve_gurobi(self, timer, progress, warm_start=True):
+        """Modèle Gurobi; renvoie (valeurs de x, objectif, optimal) ou None"""
+        timer.start(BUILD)
+        m = create_model("Maximum_Independent_Set", defaults=PARAMS)
 
-            # Paramètres
-            m.setParam('MIPGap', 0.01)  # 1% optimality gap
-            m.setParam('TimeLimit', 30)  # 30 secondes max
+        # Données
+        n = self.model_data.num_tasks
+        weights = self.model_data.weights
 
-            # Optimiser
-            m.optimize()
+        # Variables de décision
+        x = m.addVars(n, vtype=GRB.BINARY, name="select_task")
 
-            if m.status == GRB.OPTIMAL or m.status == GRB.TIME_LIMIT:
-                return self._extract_solution(m, x)
-            else:
-                return self._get_fallback_solution()
+        # Contraintes : pour chaque conflit, au plus une tâche peut être sélectionnée
+        for i, j in self._conflict_pairs().tolist():
+            m.addConstr(x[i] + x[j] <= 1, name=f"conflict_{i}_{j}")
 
-        except Exception as e:
-            print(f"Error in MIS solver: {e}")
-            import traceback
-            traceback.print_exc()
-            return self._get_fallback_solution()
+        # Objectif : maximiser la somme des poids des tâches sélectionnées
+        m.setObjective(
+            gp.quicksum(weights[i] * x[i] for i in range(n)),
+            GRB.MAXIMIZE
+        )
+
+        timer.record_model(m)
+        if warm_start:
+            timer.start(HEURISTIC)
+            set_starts(m, [x[i] for i in range(n)], self._heuristic_starts())
+
+        # Optimiser
+        timer.start(OPTIMIZE)
+        optimize(m, progress)
 
-    def _extract_solution(self, model, x):
-        """Extraire la solution"""
+        if m.status == GRB.OPTIMAL or m.status == GRB.TIME_LIMIT:
+            values = np.array(m.getAttr('X', [x[i] for i in range(n)]))
+            return values, m.objVal, m.status == GRB.OPTIMAL
+        return None
+
+    def _solve_highs(self, timer, progress):
+        """Même modèle sous forme matricielle, résolu par HiGHS (scipy.optimize.milp)"""
+        timer.start(BUILD)
+        n = self.model_data.num_tasks
+        model = LinearModel("Maximum_Independent_Set", sense=MAXIMIZE)
+        x = model.add_binary(n, obj=np.asarray(self.model_data.weights, dtype=float))
+
+        # Une ligne x_i + x_j <= 1 par conflit
+        pairs = self._conflict_pairs()
+        rows = np.repeat(np.arange(len(pairs)), 2)
+        model.add_constrs(sp.csr_matrix((np.ones(2 * len(pairs)), (rows, x[pairs.ravel()])),
+                                        shape=(len(pairs), model.num_vars)), ub=1.0)
+
+        timer.record_model(model)
+        timer.start(OPTIMIZE)
+        params = resolve_params(PARAMS)
+        solution = model.solve(HIGHS, time_limit=params.get('TimeLimit'), mip_gap=params.get('MIPGap'),
+                               progress=progress)
+        if not solution.has_solution:
+            return None
+        return solution.x[x], solution.objective, solution.status == OPTIMAL
+
+    def _extract_solution(self, values, objective, optimal):
+        """Extraire la solution à partir des valeurs de x"""
         n = self.model_data.num_tasks
 
         # Tâches sélectionnées
+        chosen = values > 0.5
         selected_tasks = []
-        for i in range(n):
-            if x[i].x > 0.5:  # Tâche sélectionnée
-                task_info = self.model_data.tasks[i].copy()
-                task_info['selected'] = True
-                task_info['weight'] = self.model_data.weights[i]
+        for i in np.flatnonzero(chosen).tolist():  # Tâches sélectionnées
+            task_info = self.model_data.tasks[i].copy()
+            task_info['selected'] = True
+            task_info['weight'] = self.model_data.weights[i]
 
-                # Trouver les conflits de cette tâche
-                conflicts = self.model_data.get_task_conflicts(i)
-                task_info['conflicting_tasks'] = conflicts
-                task_info['num_conflicts'] = len(conflicts)
+            # Conflits de cette tâche, depuis ses voisins
+            conflicts = self.model_data.get_task_conflicts(i)
+            task_info['conflicting_tasks'] = conflicts
+            task_info['num_conflicts'] = len(conflicts)
 
-                selected_tasks.append(task_info)
+            selected_tasks.append(task_info)
 
         # Métriques
         total_weight = sum(task['weight'] for task in selected_tasks)
         total_tasks = len(selected_tasks)
 
         # Vérifier la validité (aucun conflit dans l'ensemble sélectionné)
-        valid = True
-        for i, task1 in enumerate(selected_tasks):
-            for task2 in selected_tasks[i + 1:]:
-                if self.model_data.are_conflicting(task1['id'], task2['id']):
-                    valid = False
-                    break
-            if not valid:
-                break
+        pairs = self._conflict_pairs()
+        valid = not (chosen[pairs[:, 0]] & chosen[pairs[:, 1]]).any()
 
         return {
-            "objective": model.objVal,
+            "objective": objective,
             "selected_tasks": selected_tasks,
             "total_tasks": total_tasks,
             "total_weight": total_weight,
             "is_valid": valid,
             "total_possible_tasks": n,
             "selection_ratio": total_tasks / n if n > 0 else 0,
-            "status": "Optimal" if model.status == GRB.OPTIMAL else "Feasible"
+            "status": "Optimal" if optimal else "Feasible"
         }
 
+    def _conflict_pairs(self):
+        """Conflits (i, j), i < j < n, dédoublonnés, en tableau (m, 2)"""
+        return self.model_data.conflict_pairs
+
+    def _greedy_selection(self, order):
+        """Tâches prises dans l'ordre donné, chacune si elle n'est en conflit avec aucune tâche déjà prise"""
+        n = self.model_data.num_tasks
+        neighbours = self.model_data.neighbours
+        blocked = np.zeros(n, dtype=bool)
+        selected = []
+        for i in order:
+            if not blocked[i]:
+                selected.append(i)
+                blocked[neighbours.indices[neighbours.indptr[i]:neighbours.indptr[i + 1]]] = True
+        return selected
+
+    def _degrees(self):
+        return np.diff(self.model_data.neighbours.indptr)
+
+    def _heuristic_starts(self):
+        """
+        Solutions de départ de Gurobi (vecteurs 0/1 de x): glouton par degré
+        croissant et glouton par poids / (degré + 1) décroissant
+        """
+        n = self.model_data.num_tasks
+        degrees = self._degrees()
+        weights = np.asarray(self.model_data.weights, dtype=float)
+        starts = []
+        for order in (np.argsort(degrees, kind='stable'),
+                      np.argsort(-weights / (degrees + 1), kind='stable')):
+            start = np.zeros(n)
+            start[self._greedy_selection(order.tolist())] = 1.0
+            starts.append(start)
+        return starts
+
     def _get_fallback_solution(self):
         """Solution de secours : algorithme glouton"""
         n = self.model_data.num_tasks
         weights = self.model_data.weights
 
-        # Algorithme glouton : sélectionner les tâches avec le plus petit degré d'abord
-        selected = []
-        remaining = list(range(n))
-
-        # Trier par degré (nombre de conflits) croissant
-        task_degrees = [(i, self.model_data.get_task_degree(i)) for i in range(n)]
-        task_degrees.sort(key=lambda x: x[1])  # Plus petit degré d'abord
-
-        selected_indices = []
-
-        for task_id, _ in task_degrees:
-            # Vérifier si la tâche peut être ajoutée (pas de conflit avec les déjà sélectionnées)
-            can_add = True
-            for selected_id in selected_indices:
-                if self.model_data.adjacency_matrix[task_id][selected_id] == 1:
-                    can_add = False
-                    break
-
-            if can_add:
-                selected_indices.append(task_id)
+        # Algorithme glouton : sélectionner les tâches avec le plus petit degré d'abord,
+        # si elles n'entrent en conflit avec aucune tâche déjà sélectionnée
+        selected_indices = self._greedy_selection(np.argsort(self._degrees(), kind='stable').tolist())
 
         # Construire la solution
         selected_tasks = []
@@ -1,6 +1,9 @@
 import gurobipy as gp
 from gurobipy import GRB
 
+from shared.gurobi_utils import create_model, optimize
+from shared.timings import BUILD, DATA, EXTRACT, OPTIMIZE, PhaseTimer
+
 from .model import TelecomNetworkModel
 
 
@@ -8,6 +11,8 @@ class SimpleTelecomSolver:
     """Version simplifiée du solveur pour éviter les problèmes d'infeasibility"""
 
     def __init__(self, nodes, potential_links, demands, **kwargs):
+        self.data_timer = PhaseTimer()
+        self.data_timer.start(DATA)
         self.model_data = TelecomNetworkModel(
             nodes=nodes,
             potential_links=potential_links,
@@ -17,10 +22,20 @@ class SimpleTelecomSolver:
             capacities=kwargs.get('capacities'),
             budget=kwargs.get('budget')
         )
+        self.data_timer.stop()
+
+    def solve(self, progress=None, trace_memory=False):
+        """
+        Version simplifiée avec un modèle plus robuste
 
-    def solve(self):
-        """Version simplifiée avec un modèle plus robuste"""
-        m = gp.Model("Simple_Telecom_Network")
+        Args:
+            progress: SolverProgress optionnel
+            trace_memory: Ajouter le pic mémoire tracemalloc aux timings
+        """
+        timer = PhaseTimer(trace_memory)
+        timer.include(self.data_timer)
+        timer.start(BUILD)
+        m = create_model("Simple_Telecom_Network")
 
         N = self.model_data.num_nodes
         L = self.model_data.num_links
@@ -73,8 +88,11 @@ class SimpleTelecomSolver:
         )
 
         # Optimiser
-        m.optimize()
+        timer.record_model(m)
+        timer.start(OPTIMIZE)
+        optimize(m, progress)
 
+        timer.start(EXTRACT)
         if m.status == GRB.OPTIMAL:
             # Extraire solution
             selected_links = []
@@ -88,7 +106,7 @@ class SimpleTelecomSolver:
                     link_info['cost'] = self.model_data.fixed_costs[l]
                     selected_links.append(link_info)
 
-            return {
+            result = {
                 "objective": m.objVal,
                 "selected_links": selected_links,
                 "num_links_built": len(selected_links),
@@ -112,7 +130,7 @@ class SimpleTelecomSolver:
 
             total_cost = sum(self.model_data.fixed_costs[l] for l in range(min(3, L)))
 
-            return {
+            result = {
                 "objective": total_cost,
                 "selected_links": selected_links,
                 "num_links_built": len(selected_links),
@@ -123,3 +141,6 @@ class SimpleTelecomSolver:
                 "status": "Feasible (fallback)",
                 "note": "Using fallback solution"
             }
+
+        result['timings'] = timer.report()
+        return result
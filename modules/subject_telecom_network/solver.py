@@ -1,13 +1,40 @@
-import gurobipy as gp
-from gurobipy import GRB
+import numpy as np
+import scipy.sparse as sp
+
+from shared.backends import HIGHS, LinearModel, default_backend
+from shared.gurobi_utils import create_model, optimize, resolve_params, set_starts
+from shared.timings import BUILD, DATA, EXTRACT, HEURISTIC, OPTIMIZE, PhaseTimer
 
 from .model import TelecomNetworkModel
 
+try:
+    import gurobipy as gp
+    from gurobipy import GRB
+except ImportError:
+    gp = None
+    GRB = None
+
+
+# Paramètres par défaut, pour garantir la faisabilité (le profil de
+# shared.gurobi_utils les remplace)
+PARAMS = {
+    'MIPGap': 0.1,            # Gap de 10% acceptable
+    'TimeLimit': 30,          # 30 secondes
+    'FeasibilityTol': 1e-6,
+    'LogToConsole': 0,
+    'SolutionLimit': 1,       # Priorité: trouver une solution faisable d'abord
+}
+
+# Liaisons clés de l'exemple tunisien, ajoutées à une étoile trop petite
+KEY_LINKS = [('Sfax', 'Gabès'), ('Gabès', 'Tozeur'), ('Gafsa', 'Tozeur')]
+
 
 class TelecomNetworkSolver:
     """Solveur PLNE réaliste mais faisable pour la conception de réseau"""
 
     def __init__(self, nodes, potential_links, demands, **kwargs):
+        self.data_timer = PhaseTimer()
+        self.data_timer.start(DATA)
         self.model_data = TelecomNetworkModel(
             nodes=nodes,
             potential_links=potential_links,
@@ -17,13 +44,25 @@ class TelecomNetworkSolver:
             capacities=kwargs.get('capacities'),
             budget=kwargs.get('budget')
         )
-
-    def solve(self):
-        """Résoudre avec un modèle faisable"""
+        self.data_timer.stop()
+
+    def solve(self, progress=None, trace_memory=False, backend=None, warm_start=True):
+        """
+        Résoudre avec un modèle faisable
+
+        Args:
+            progress: SolverProgress optionnel
+            trace_memory: Ajouter le pic mémoire tracemalloc aux timings
+            backend: GUROBI ou HIGHS (shared.backends), par défaut Gurobi s'il est installé
+            warm_start: Donner à Gurobi les liaisons de la solution étoile comme solution
+                de départ partielle, qu'il complète (HiGHS via SciPy n'en accepte pas)
+        """
+        backend = backend or default_backend()
+        timer = PhaseTimer(trace_memory)
+        timer.include(self.data_timer)
         try:
-            m = gp.Model("Feasible_Telecom_Network")
-
             # Données
+            timer.start(DATA)
             N = self.model_data.num_nodes
             L = self.model_data.num_links
 
@@ -34,107 +73,197 @@ class TelecomNetworkSolver:
                     for link in self.model_data.potential_links
                 ]
 
-            # VARIABLES SIMPLIFIÉES:
-            # 1. Variables de construction (binaires)
-            y = m.addVars(L, vtype=GRB.BINARY, name="build_link")
-
-            # 2. Variables de flux total par liaison (dans les deux directions)
-            flow = m.addVars(L, lb=0, ub=1000, name="total_flow")
-
-            # 3. Variables de satisfaction de demande (relaxées)
-            satisfied_demand = m.addVars(N, N, lb=0, name="satisfied_demand")
-
-            # CONTRAINTES FAISABLES:
-
-            # 1. Capacité: flow ≤ capacité × y
-            for l in range(L):
-                m.addConstr(flow[l] <= 1000 * y[l], name=f"capacity_{l}")
-
-            # 2. Satisfaction de demande (RELAXÉE - pas besoin de 100%)
-            for i in range(N):
-                for j in range(N):
-                    if i != j:
-                        # La demande satisfaite ne peut pas dépasser la demande totale
-                        m.addConstr(satisfied_demand[i,j] <= self.model_data.demands[i][j],
-                                   name=f"max_demand_{i}_{j}")
-
-            # 3. Pour chaque nœud, la somme des flux sortants ≥ 30% de la demande totale sortante
-            for i in range(N):
-                # Flux sortant total
-                outflow = gp.quicksum(
-                    flow[l] for l in range(L)
-                    if self.model_data.potential_links[l]['from'] == i
-                )
-
-                # Demande sortante totale
-                total_out_demand = sum(self.model_data.demands[i][j] for j in range(N) if j != i)
-
-                # Au moins 30% de la demande doit pouvoir sortir
-                m.addConstr(outflow >= total_out_demand * 0.3, name=f"min_outflow_{i}")
-
-                # Même chose pour le flux entrant
-                inflow = gp.quicksum(
-                    flow[l] for l in range(L)
-                    if self.model_data.potential_links[l]['to'] == i
-                )
-
-                total_in_demand = sum(self.model_data.demands[j][i] for j in range(N) if j != i)
-                m.addConstr(inflow >= total_in_demand * 0.3, name=f"min_inflow_{i}")
-
-            # 4. Contrainte de connectivité minimale (relaxée)
-            for i in range(N):
-                total_connections = gp.quicksum(
-                    y[l] for l in range(L)
-                    if (self.model_data.potential_links[l]['from'] == i or
-                        self.model_data.potential_links[l]['to'] == i)
-                )
-                # Au moins 1 connexion (au lieu de 2)
-                m.addConstr(total_connections >= 1, name=f"min_connect_{i}")
-
-            # 5. Budget (si spécifié)
-            if self.model_data.budget:
-                total_cost = gp.quicksum(
-                    self.model_data.fixed_costs[l] * y[l]
-                    for l in range(L)
-                )
-                m.addConstr(total_cost <= self.model_data.budget, name="budget")
-
-            # OBJECTIF: Minimiser coût + pénalité pour faible satisfaction
-            total_cost = gp.quicksum(self.model_data.fixed_costs[l] * y[l] for l in range(L))
-
-            # Pénalité pour demande non satisfaite
-            unsatisfied_penalty = gp.quicksum(
-                (self.model_data.demands[i][j] - satisfied_demand[i,j]) * 5
-                for i in range(N) for j in range(N) if i != j
+            if backend == HIGHS:
+                solution = self._solve_highs(timer, progress)
+            else:
+                solution = self._solve_gurobi(timer, progress, warm_start)
+
+            timer.start(EXTRACT)
+            if solution is not None:
+                result = self._extract_feasible_solution(*solution)
+            else:
+                # Forcer une solution faisable très simple
+                result = self._get_guaranteed_feasible_solution()
+
+        except Exception as e:
+            print(f"Error in solver: {e}")
+            timer.start(EXTRACT)
+            result = self._get_guaranteed_feasible_solution()
+
+        result['backend'] = backend
+        result['timings'] = timer.report()
+        return result
+
+    def _solve_gurobi(self, timer, progress, warm_start=True):
+        """Modèle Gurobi; renvoie (valeurs de y, valeurs des flux) ou None"""
+        N = self.model_data.num_nodes
+        L = self.model_data.num_links
+
+        timer.start(BUILD)
+        params = dict(PARAMS)
+        if warm_start:
+            # Le départ donne déjà une solution: Gurobi poursuit jusqu'au gap
+            # au lieu de s'arrêter à la première solution
+            del params['SolutionLimit']
+        m = create_model("Feasible_Telecom_Network", defaults=params)
+
+        # VARIABLES SIMPLIFIÉES:
+        # 1. Variables de construction (binaires)
+        y = m.addVars(L, vtype=GRB.BINARY, name="build_link")
+
+        # 2. Variables de flux total par liaison (dans les deux directions)
+        flow = m.addVars(L, lb=0, ub=1000, name="total_flow")
+
+        # 3. Variables de satisfaction de demande (relaxées)
+        satisfied_demand = m.addVars(N, N, lb=0, name="satisfied_demand")
+
+        # CONTRAINTES FAISABLES:
+
+        # 1. Capacité: flow ≤ capacité × y
+        for l in range(L):
+            m.addConstr(flow[l] <= 1000 * y[l], name=f"capacity_{l}")
+
+        # 2. Satisfaction de demande (RELAXÉE - pas besoin de 100%)
+        for i in range(N):
+            for j in range(N):
+                if i != j:
+                    # La demande satisfaite ne peut pas dépasser la demande totale
+                    m.addConstr(satisfied_demand[i,j] <= self.model_data.demands[i][j],
+                               name=f"max_demand_{i}_{j}")
+
+        # 3. Pour chaque nœud, la somme des flux sortants ≥ 30% de la demande totale sortante
+        for i in range(N):
+            # Flux sortant total
+            outflow = gp.quicksum(
+                flow[l] for l in range(L)
+                if self.model_data.potential_links[l]['from'] == i
             )
 
-            m.setObjective(total_cost + unsatisfied_penalty, GRB.MINIMIZE)
+            # Demande sortante totale
+            total_out_demand = sum(self.model_data.demands[i][j] for j in range(N) if j != i)
 
-            # Paramètres pour garantir la faisabilité
-            m.setParam('MIPGap', 0.1)  # Gap de 10% acceptable
-            m.setParam('TimeLimit', 30)  # 30 secondes
-            m.setParam('FeasibilityTol', 1e-6)
-            m.setParam('LogToConsole', 0)
+            # Au moins 30% de la demande doit pouvoir sortir
+            m.addConstr(outflow >= total_out_demand * 0.3, name=f"min_outflow_{i}")
 
-            # Priorité: trouver une solution faisable d'abord
-            m.setParam('SolutionLimit', 1)
+            # Même chose pour le flux entrant
+            inflow = gp.quicksum(
+                flow[l] for l in range(L)
+                if self.model_data.potential_links[l]['to'] == i
+            )
 
-            # Optimiser
-            m.optimize()
+            total_in_demand = sum(self.model_data.demands[j][i] for j in range(N) if j != i)
+            m.addConstr(inflow >= total_in_demand * 0.3, name=f"min_inflow_{i}")
 
-            if m.status in [GRB.OPTIMAL, GRB.TIME_LIMIT, GRB.SOLUTION_LIMIT]:
-                return self._extract_feasible_solution(m, y, flow)
-            else:
-                print(f"Optimization failed with status: {m.status}")
-                # Forcer une solution faisable très simple
-                return self._get_guaranteed_feasible_solution()
+        # 4. Contrainte de connectivité minimale (relaxée)
+        for i in range(N):
+            total_connections = gp.quicksum(
+                y[l] for l in range(L)
+                if (self.model_data.potential_links[l]['from'] == i or
+                    self.model_data.potential_links[l]['to'] == i)
+            )
+            # Au moins 1 connexion (au lieu de 2)
+            m.addConstr(total_connections >= 1, name=f"min_connect_{i}")
+
+        # 5. Budget (si spécifié)
+        if self.model_data.budget:
+            total_cost = gp.quicksum(
+                self.model_data.fixed_costs[l] * y[l]
+                for l in range(L)
+            )
+            m.addConstr(total_cost <= self.model_data.budget, name="budget")
 
-        except Exception as e:
-            print(f"Error in solver: {e}")
-            return self._get_guaranteed_feasible_solution()
+        # OBJECTIF: Minimiser coût + pénalité pour faible satisfaction
+        total_cost = gp.quicksum(self.model_data.fixed_costs[l] * y[l] for l in range(L))
+
+        # Pénalité pour demande non satisfaite
+        unsatisfied_penalty = gp.quicksum(
+            (self.model_data.demands[i][j] - satisfied_demand[i,j]) * 5
+            for i in range(N) for j in range(N) if i != j
+        )
 
-    def _extract_feasible_solution(self, model, y, flow):
-        """Extraire une solution faisable"""
+        m.setObjective(total_cost + unsatisfied_penalty, GRB.MINIMIZE)
+
+        timer.record_model(m)
+        if warm_start:
+            # Départ partiel: les liaisons de l'étoile construites, le reste laissé à Gurobi
+            timer.start(HEURISTIC)
+            start = np.full(L, np.nan)
+            star, extra = self._star_links()
+            start[star + extra] = 1.0
+            set_starts(m, [y[l] for l in range(L)], [start])
+
+        # Optimiser
+        timer.start(OPTIMIZE)
+        optimize(m, progress)
+
+        if m.status in [GRB.OPTIMAL, GRB.TIME_LIMIT, GRB.SOLUTION_LIMIT]:
+            return (np.array(m.getAttr('X', [y[l] for l in range(L)])),
+                    np.array(m.getAttr('X', [flow[l] for l in range(L)])))
+        print(f"Optimization failed with status: {m.status}")
+        return None
+
+    def _solve_highs(self, timer, progress):
+        """
+        Même modèle sous forme matricielle, résolu par HiGHS (scipy.optimize.milp).
+        Les bornes max_demand deviennent des bornes de variables; HiGHS n'a pas
+        d'équivalent à SolutionLimit et s'arrête au gap de 10%.
+        """
+        timer.start(BUILD)
+        N = self.model_data.num_nodes
+        L = self.model_data.num_links
+        demands = np.asarray(self.model_data.demands, dtype=float).reshape(N, N)
+        off_diagonal = ~np.eye(N, dtype=bool)
+        frm = np.array([link['from'] for link in self.model_data.potential_links], dtype=np.int64)
+        to = np.array([link['to'] for link in self.model_data.potential_links], dtype=np.int64)
+        fixed_costs = np.asarray(self.model_data.fixed_costs, dtype=float)
+
+        model = LinearModel("Feasible_Telecom_Network")
+        y = model.add_binary(L, obj=fixed_costs)
+        flow = model.add_vars(L, lb=0.0, ub=1000.0)
+        # Demande satisfaite, bornée par la demande; pénalité 5 par unité non satisfaite
+        satisfied = model.add_vars(N * N, lb=0.0, ub=np.where(off_diagonal, demands, 0.0).ravel(),
+                                   obj=np.where(off_diagonal, -5.0, 0.0).ravel())
+        model.constant = 5.0 * demands[off_diagonal].sum()
+
+        # 1. Capacité: flow - 1000 y <= 0
+        links = np.arange(L)
+        model.add_constrs(sp.csr_matrix(
+            (np.concatenate([np.ones(L), np.full(L, -1000.0)]),
+             (np.concatenate([links, links]), np.concatenate([flow, y]))),
+            shape=(L, model.num_vars)), ub=0.0)
+
+        # 3. Flux sortant / entrant >= 30% de la demande sortante / entrante
+        out_demand = np.where(off_diagonal, demands, 0.0).sum(axis=1)
+        in_demand = np.where(off_diagonal, demands, 0.0).sum(axis=0)
+        model.add_constrs(sp.csr_matrix((np.ones(L), (frm, flow)), shape=(N, model.num_vars)),
+                          lb=0.3 * out_demand)
+        model.add_constrs(sp.csr_matrix((np.ones(L), (to, flow)), shape=(N, model.num_vars)),
+                          lb=0.3 * in_demand)
+
+        # 4. Au moins une liaison construite par nœud (une boucle compte une fois)
+        ends = np.concatenate([frm, to[to != frm]])
+        cols = np.concatenate([y, y[to != frm]])
+        model.add_constrs(sp.csr_matrix((np.ones(len(ends)), (ends, cols)),
+                                        shape=(N, model.num_vars)), lb=1.0)
+
+        # 5. Budget (si spécifié)
+        if self.model_data.budget:
+            model.add_constrs(sp.csr_matrix((fixed_costs, (np.zeros(L, dtype=np.int64), y)),
+                                            shape=(1, model.num_vars)),
+                              ub=self.model_data.budget)
+
+        timer.record_model(model)
+        timer.start(OPTIMIZE)
+        params = resolve_params(PARAMS)
+        solution = model.solve(HIGHS, time_limit=params.get('TimeLimit'), mip_gap=params.get('MIPGap'),
+                               progress=progress)
+        if not solution.has_solution:
+            print(f"Optimization failed with status: {solution.status}")
+            return None
+        return solution.x[y], solution.x[flow]
+
+    def _extract_feasible_solution(self, y, flow):
+        """Extraire une solution faisable à partir des valeurs de y et des flux"""
         L = self.model_data.num_links
         N = self.model_data.num_nodes
 
@@ -143,9 +272,9 @@ class TelecomNetworkSolver:
 
         # Liaisons construites
         for l in range(L):
-            if y[l].x > 0.5:  # Liaison construite
+            if y[l] > 0.5:  # Liaison construite
                 link = self.model_data.potential_links[l]
-                link_flow = flow[l].x if hasattr(flow[l], 'x') else 0
+                link_flow = float(flow[l])
 
                 link_info = {
                     'from': link['from'],
@@ -197,60 +326,55 @@ class TelecomNetworkSolver:
             "connected_node_count": len(connected_nodes)
         }
 
+    def _star_links(self):
+        """
+        Liaisons de la solution étoile: celles partant du nœud 0 (Tunis dans
+        l'exemple), plus les liaisons clés de l'exemple tunisien s'il y en a
+        moins de 3 et que leurs villes sont dans l'instance; renvoie (étoile,
+        clés) en indices
+        """
+        N = self.model_data.num_nodes
+        links = self.model_data.potential_links
+        star = [l for l, link in enumerate(links) if link['from'] == 0 and link['to'] < N]
+        extra = []
+        if len(star) < 3:
+            names = [node.get('name') for node in self.model_data.nodes]
+            for from_name, to_name in KEY_LINKS:
+                for l, link in enumerate(links):
+                    if (link['from'] < N and link['to'] < N
+                            and (names[link['from']], names[link['to']]) == (from_name, to_name)):
+                        extra.append(l)
+                        break
+        return star, extra
+
     def _get_guaranteed_feasible_solution(self):
         """Solution garantie faisable: étoile autour de Tunis"""
         N = self.model_data.num_nodes
-        L = self.model_data.num_links
 
         selected_links = []
         total_cost = 0
 
-        # Solution garantie: Tunis connecté à tout le monde
-        # C'est faisable mais cher
-        for l in range(L):
+        # Solution garantie: Tunis connecté à tout le monde, plus quelques
+        # liaisons clés si pas assez de liaisons. C'est faisable mais cher
+        star, extra = self._star_links()
+        for l in star + extra:
             link = self.model_data.potential_links[l]
-            # Si c'est une liaison depuis Tunis (0) vers n'importe quelle autre ville
-            if link['from'] == 0 and link['to'] < N:
-                link_info = {
-                    'from': link['from'],
-                    'to': link['to'],
-                    'from_name': self.model_data.nodes[link['from']]['name'],
-                    'to_name': self.model_data.nodes[link['to']]['name'],
-                    'distance': link.get('distance', 1),
-                    'built': True,
-                    'capacity': 1000,
-                    'flow': 500,  # Flux estimé
-                    'utilization': 0.5,
-                    'cost': self.model_data.fixed_costs[l],
-                    'fixed_cost': self.model_data.fixed_costs[l]
-                }
-                selected_links.append(link_info)
-                total_cost += self.model_data.fixed_costs[l]
-
-        # Si pas assez de liaisons, ajouter quelques liaisons supplémentaires
-        if len(selected_links) < 3:
-            # Ajouter quelques liaisons clés
-            key_links = [(1, 5), (5, 7), (6, 7)]  # Sfax-Gabès, Gabès-Tozeur, Gafsa-Tozeur
-            for from_node, to_node in key_links:
-                for l in range(L):
-                    link = self.model_data.potential_links[l]
-                    if (link['from'] == from_node and link['to'] == to_node):
-                        link_info = {
-                            'from': link['from'],
-                            'to': link['to'],
-                            'from_name': self.model_data.nodes[link['from']]['name'],
-                            'to_name': self.model_data.nodes[link['to']]['name'],
-                            'distance': link.get('distance', 1),
-                            'built': True,
-                            'capacity': 1000,
-                            'flow': 300,
-                            'utilization': 0.3,
-                            'cost': self.model_data.fixed_costs[l],
-                            'fixed_cost': self.model_data.fixed_costs[l]
-                        }
-                        selected_links.append(link_info)
-                        total_cost += self.model_data.fixed_costs[l]
-                        break
+            flow = 500 if l in star else 300  # Flux estimé
+            link_info = {
+                'from': link['from'],
+                'to': link['to'],
+                'from_name': self.model_data.nodes[link['from']]['name'],
+                'to_name': self.model_data.nodes[link['to']]['name'],
+                'distance': link.get('distance', 1),
+                'built': True,
+                'capacity': 1000,
+                'flow': flow,
+                'utilization': flow / 1000,
+                'cost': self.model_data.fixed_costs[l],
+                'fixed_cost': self.model_data.fixed_costs[l]
+            }
+            selected_links.append(link_info)
+            total_cost += self.model_data.fixed_costs[l]
 
         # Calculer les métriques
         total_demand = 0
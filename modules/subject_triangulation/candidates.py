@@ -0,0 +1,123 @@
+"""
+Candidate triangles for the covering model.
+
+Candidates come from the Delaunay triangulation of the points, O(n log n)
+through scipy.spatial.Delaunay. With order k > 1 they also include every
+triangle whose three vertices lie within k edges of each other in the
+Delaunay graph, which gives overlapping alternatives while keeping the
+candidate count linear in n for a fixed k.
+
+Triangles are (m, 3) int arrays of point indices, sorted within each row;
+areas, perimeters and costs are computed on the whole array at once.
+"""
+import numpy as np
+import scipy.sparse as sp
+from scipy.spatial import Delaunay, QhullError
+
+# Default cost: BASE_COST + AREA_WEIGHT * area + PERIMETER_WEIGHT * perimeter
+BASE_COST = 1.0
+AREA_WEIGHT = 1.0
+PERIMETER_WEIGHT = 0.1
+
+# Triangles with a smaller area (relative to the bounding box) are degenerate
+MIN_RELATIVE_AREA = 1e-12
+
+
+def _coordinates(points):
+    """(n, 2) float array of Point objects, (x, y) pairs or an array"""
+    if len(points) and hasattr(points[0], 'x'):
+        return np.array([(p.x, p.y) for p in points], dtype=float)
+    return np.asarray(points, dtype=float).reshape(-1, 2)
+
+
+def triangle_areas(xy, triangles):
+    """Areas of an (m, 3) triangle array, xy an (n, 2) array or (x, y) pairs"""
+    xy = np.asarray(xy, dtype=float)
+    p, q, r = (xy[triangles[:, c]] for c in range(3))
+    return 0.5 * np.abs((q[:, 0] - p[:, 0]) * (r[:, 1] - p[:, 1])
+                        - (r[:, 0] - p[:, 0]) * (q[:, 1] - p[:, 1]))
+
+
+def triangle_perimeters(xy, triangles):
+    """Perimeters of an (m, 3) triangle array, xy an (n, 2) array or (x, y) pairs"""
+    xy = np.asarray(xy, dtype=float)
+    p, q, r = (xy[triangles[:, c]] for c in range(3))
+    return (np.hypot(*(q - p).T) + np.hypot(*(r - q).T) + np.hypot(*(p - r).T))
+
+
+def triangle_costs(xy, triangles, base=BASE_COST, area_weight=AREA_WEIGHT,
+                   perimeter_weight=PERIMETER_WEIGHT):
+    """base + area_weight * area + perimeter_weight * perimeter, per triangle"""
+    return (base + area_weight * triangle_areas(xy, triangles)
+            + perimeter_weight * triangle_perimeters(xy, triangles))
+
+
+def delaunay_triangles(points):
+    """
+    Delaunay triangles of the points as an (m, 3) array, empty when there
+    are fewer than 3 points or they are all collinear
+    """
+    xy = _coordinates(points)
+    if len(xy) < 3:
+        return np.empty((0, 3), dtype=np.int64)
+    try:
+        simplices = Delaunay(xy).simplices
+    except QhullError:
+        return np.empty((0, 3), dtype=np.int64)
+    return np.sort(simplices, axis=1).astype(np.int64)
+
+
+def _neighbour_graph(n, triangles, order):
+    """Sparse 0/1 graph joining points within `order` Delaunay edges"""
+    rows = triangles[:, [0, 0, 1]].ravel()
+    cols = triangles[:, [1, 2, 2]].ravel()
+    graph = sp.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n, n))
+    graph = ((graph + graph.T) > 0).astype(np.int32)
+    reach = graph
+    for _ in range(order - 1):
+        reach = ((reach + reach @ graph) > 0).astype(np.int32)
+    reach = reach - sp.diags(reach.diagonal())
+    reach.eliminate_zeros()
+    return reach
+
+
+def candidate_triangles(points, order=1):
+    """
+    Candidate triangles of the points.
+
+    Args:
+        points: Point objects, (x, y) pairs or an (n, 2) array
+        order: 1 for the Delaunay triangles only, k > 1 to add every
+            non-degenerate triangle of points pairwise within k Delaunay edges
+
+    Returns:
+        (m, 3) int array of point indices, rows sorted, Delaunay ones first
+    """
+    xy = _coordinates(points)
+    triangles = delaunay_triangles(xy)
+    if order <= 1 or not len(triangles):
+        return triangles
+
+    # Triangles of the k-th power of the Delaunay graph: for every edge (i, j)
+    # with i < j, the common neighbours l > j
+    upper = sp.triu(_neighbour_graph(len(xy), triangles, order), k=1, format='csr')
+    indptr, indices = upper.indptr, upper.indices
+    found = []
+    for i in range(len(xy)):
+        row = indices[indptr[i]:indptr[i + 1]]
+        for j in row:
+            common = np.intersect1d(row[row > j], indices[indptr[j]:indptr[j + 1]],
+                                    assume_unique=True)
+            if len(common):
+                found.append(np.column_stack([np.full(len(common), i), np.full(len(common), j),
+                                              common]))
+    if not found:
+        return triangles
+    extra = np.concatenate(found)
+
+    # Drop degenerate triangles and the Delaunay ones already listed
+    span = np.ptp(xy, axis=0).prod() if len(xy) else 0.0
+    extra = extra[triangle_areas(xy, extra) > MIN_RELATIVE_AREA * max(span, 1.0)]
+    known = set(map(tuple, triangles.tolist()))
+    keep = np.array([tuple(t) not in known for t in extra.tolist()], dtype=bool)
+    return np.concatenate([triangles, extra[keep].astype(np.int64)])
@@ -2,25 +2,72 @@
 MINIMAL MODEL for triangle decomposition
 """
 
-from dataclasses import dataclass
-from typing import List, Tuple
+from collections.abc import Sequence
+from typing import Tuple
+
+import numpy as np
+
+from .candidates import candidate_triangles, triangle_costs
+
+# Initial array capacity, doubled whenever it runs out
+_MIN_CAPACITY = 16
 
 
-@dataclass
 class Point:
-    """Simple 2D point"""
-    id: int
-    x: float
-    y: float
+    """Simple 2D point, a view of one row of a TrussStructure's coordinates"""
+    __slots__ = ('_structure', 'id')
+
+    def __init__(self, structure: 'TrussStructure', id: int):
+        self._structure = structure
+        self.id = id
+
+    @property
+    def x(self) -> float:
+        return float(self._structure._xy[self.id, 0])
+
+    @x.setter
+    def x(self, value: float):
+        self._structure._xy[self.id, 0] = value
+
+    @property
+    def y(self) -> float:
+        return float(self._structure._xy[self.id, 1])
+
+    @y.setter
+    def y(self, value: float):
+        self._structure._xy[self.id, 1] = value
 
     def to_dict(self):
         return {'id': self.id, 'x': self.x, 'y': self.y}
 
-@dataclass
+    def __eq__(self, other):
+        if not isinstance(other, Point):
+            return NotImplemented
+        return (self.id, self.x, self.y) == (other.id, other.x, other.y)
+
+    def __repr__(self):
+        return f"Point(id={self.id}, x={self.x}, y={self.y})"
+
+
 class Triangle:
-    """Simple triangle"""
-    vertices: Tuple[int, int, int]
-    cost: float = 1.0
+    """Simple triangle, a view of one row of a TrussStructure's triangle arrays"""
+    __slots__ = ('_structure', 'index')
+
+    def __init__(self, structure: 'TrussStructure', index: int):
+        self._structure = structure
+        self.index = index
+
+    @property
+    def vertices(self) -> Tuple[int, int, int]:
+        return tuple(self._structure._vertices[self.index].tolist())
+
+    @property
+    def cost(self) -> float:
+        return float(self._structure._cost[self.index])
+
+    @cost.setter
+    def cost(self, value: float):
+        self._structure._cost[self.index] = value
 
     def to_dict(self):
         return {
@@ -28,27 +75,169 @@ class Triangle:
             'cost': self.cost
         }
 
+    def __eq__(self, other):
+        if not isinstance(other, Triangle):
+            return NotImplemented
+        return (self.vertices, self.cost) == (other.vertices, other.cost)
+
+    def __repr__(self):
+        return f"Triangle(vertices={self.vertices}, cost={self.cost})"
+
+
+class _Rows(Sequence):
+    """Read-only sequence of Point or Triangle views over a structure's arrays"""
+    __slots__ = ('_structure', '_view', '_count')
+
+    def __init__(self, structure, view, count):
+        self._structure = structure
+        self._view = view
+        self._count = count
+
+    def __len__(self):
+        return getattr(self._structure, self._count)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._view(self._structure, j) for j in range(*i.indices(len(self)))]
+        n = len(self)
+        if not -n <= i < n:
+            raise IndexError("index out of range")
+        return self._view(self._structure, i % n)
+
+
+def _grow(array, needed):
+    """array with room for at least `needed` rows, capacity doubled as needed"""
+    if needed <= len(array):
+        return array
+    capacity = max(_MIN_CAPACITY, len(array))
+    while capacity < needed:
+        capacity *= 2
+    grown = np.empty((capacity,) + array.shape[1:], dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
 class TrussStructure:
-    """Minimal structure container"""
+    """
+    Minimal structure container
+
+    Points and triangles are stored in contiguous arrays: (n, 2) float
+    coordinates, (m, 3) int32 vertices and (m,) float costs, grown by
+    doubling so that adding one at a time stays amortized O(1). `points`
+    and `triangles` are sequences of Point and Triangle views of their rows,
+    created on access; solvers work on point_array() and triangle_arrays()
+    directly.
+    """
 
     def __init__(self):
-        self.points: List[Point] = []
-        self.triangles: List[Triangle] = []
-        self.selected_triangles: List[Triangle] = []
+        self._xy = np.empty((0, 2), dtype=float)
+        self._vertices = np.empty((0, 3), dtype=np.int32)
+        self._cost = np.empty(0, dtype=float)
+        self.num_points = 0
+        self.num_triangles = 0
+
+        self.points = _Rows(self, Point, 'num_points')
+        self.triangles = _Rows(self, Triangle, 'num_triangles')
+        self.selected_triangles = []
 
         # Simple parameters
         self.min_triangles = 1
         self.max_triangles = 10
         self.budget = 1000.0
 
-    def add_point(self, x: float, y: float):
+        # Select interior-disjoint triangles tiling the convex hull instead
+        # of (possibly overlapping) triangles covering every point
+        self.exact_partition = False
+
+    def add_point(self, x: float, y: float) -> Point:
         """Add a point"""
-        point = Point(id=len(self.points), x=x, y=y)
-        self.points.append(point)
-        return point
+        return self.points[self.add_points([(x, y)])[0]]
+
+    def add_points(self, xy) -> np.ndarray:
+        """
+        Add points in bulk
+
+        Args:
+            xy: (n, 2) coordinates, array or (x, y) pairs
 
-    def add_triangle(self, vertices: Tuple[int, int, int], cost: float = 1.0):
+        Returns:
+            Indices of the added points
+        """
+        xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+        start, end = self.num_points, self.num_points + len(xy)
+        self._xy = _grow(self._xy, end)
+        self._xy[start:end] = xy
+        self.num_points = end
+        return np.arange(start, end)
+
+    def add_triangle(self, vertices: Tuple[int, int, int], cost: float = 1.0) -> Triangle:
         """Add a triangle"""
-        triangle = Triangle(vertices=vertices, cost=cost)
-        self.triangles.append(triangle)
-        return triangle
+        return self.triangles[self.add_triangles([vertices], [cost])[0]]
+
+    def add_triangles(self, vertices, costs=1.0) -> np.ndarray:
+        """
+        Add triangles in bulk
+
+        Args:
+            vertices: (m, 3) point indices
+            costs: (m,) triangle costs, or one cost for all
+
+        Returns:
+            Indices of the added triangles
+        """
+        vertices = np.asarray(vertices, dtype=np.int32).reshape(-1, 3)
+        costs = np.asarray(costs, dtype=float)
+        if costs.ndim == 0:
+            costs = np.full(len(vertices), float(costs))
+        costs = costs.reshape(-1)
+        if len(costs) != len(vertices):
+            raise ValueError("One cost per triangle needed")
+        start, end = self.num_triangles, self.num_triangles + len(vertices)
+        self._vertices = _grow(self._vertices, end)
+        self._cost = _grow(self._cost, end)
+        self._vertices[start:end] = vertices
+        self._cost[start:end] = costs
+        self.num_triangles = end
+        return np.arange(start, end)
+
+    def set_triangle_arrays(self, vertices, costs):
+        """
+        Replace the triangles
+
+        Args:
+            vertices: (m, 3) point indices
+            costs: (m,) triangle costs
+        """
+        self.num_triangles = 0
+        self.add_triangles(vertices, costs)
+
+    def point_array(self) -> np.ndarray:
+        """(n, 2) coordinates of the points (a view, not a copy)"""
+        return self._xy[:self.num_points]
+
+    def triangle_arrays(self):
+        """(m, 3) int32 vertices and (m,) costs of the triangles (views, not copies)"""
+        return self._vertices[:self.num_triangles], self._cost[:self.num_triangles]
+
+    def triangle(self, i: int) -> Triangle:
+        """Triangle i"""
+        return self.triangles[i]
+
+    def add_delaunay_triangles(self, order: int = 1, **cost_weights) -> int:
+        """
+        Add candidate triangles from the Delaunay triangulation of the points
+
+        Args:
+            order: 1 for the Delaunay triangles, k > 1 to add the triangles of
+                points within k Delaunay edges (see candidates.candidate_triangles)
+            cost_weights: base, area_weight, perimeter_weight of triangle_costs
+
+        Returns:
+            Number of triangles added
+        """
+        xy = self.point_array()
+        triangles = candidate_triangles(xy, order)
+        if not len(triangles):
+            return 0
+        self.add_triangles(triangles, triangle_costs(xy, triangles, **cost_weights))
+        return len(triangles)
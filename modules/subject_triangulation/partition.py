@@ -0,0 +1,346 @@
+"""
+Overlap conflicts between candidate triangles, for the exact-partition mode.
+
+An exact partition selects triangles with disjoint interiors whose areas
+add up to the area of the convex hull of the points, i.e. that tile the
+hull. The MILP needs, for every two candidates that overlap, that at most
+one is selected. Finding the overlapping pairs goes in two steps:
+
+1. a bounding-box R-tree (Sort-Tile-Recursive bulk loading) joined with
+   itself, level by level on arrays of node pairs, keeps the pairs whose
+   boxes overlap with positive area,
+2. an exact orientation test on these pairs: the interiors of two
+   triangles are disjoint if and only if the line of one of their six
+   edges separates them, which also catches containment and collinear
+   overlaps that an edge-crossing test alone misses.
+
+The pairs are then grouped into cliques: the candidates containing the
+centroid of a candidate all overlap each other, so a single
+sum(x) <= 1 row replaces every pairwise row between them. Pairs left out of
+every clique stay pairwise.
+
+Triangles are (m, 3) int arrays of point indices, points an (n, 2) array.
+"""
+import numpy as np
+import scipy.sparse as sp
+from scipy.spatial import ConvexHull, QhullError
+
+from .candidates import triangle_areas
+
+# Children per R-tree node
+NODE_SIZE = 16
+
+# Candidate pairs expanded and tested at a time
+CHUNK_PAIRS = 1 << 20
+
+# Relative shortfall of the selected area below the hull area still counted
+# as a tiling (rounding of the areas)
+AREA_TOLERANCE = 1e-9
+
+# Orientation values within this fraction of the squared coordinate span
+# count as zero (points on an edge line)
+ORIENTATION_TOLERANCE = 1e-12
+
+
+def bounding_boxes(xy, triangles):
+    """(m, 4) boxes (min x, min y, max x, max y) of the triangles"""
+    corners = np.asarray(xy, dtype=float)[triangles]
+    return np.hstack([corners.min(axis=1), corners.max(axis=1)])
+
+
+def _str_order(boxes, node_size):
+    """Sort-Tile-Recursive order: vertical slabs by center x, each by center y"""
+    n = len(boxes)
+    cx = boxes[:, 0] + boxes[:, 2]
+    cy = boxes[:, 1] + boxes[:, 3]
+    slabs = int(np.ceil(np.sqrt(np.ceil(n / node_size))))
+    per_slab = slabs * node_size
+    by_x = np.argsort(cx, kind='stable')
+    slab = np.empty(n, dtype=np.int64)
+    slab[by_x] = np.arange(n) // per_slab
+    return np.lexsort((cy, slab))
+
+
+def _boxes_overlap(a, b):
+    """Rows of a and b whose boxes overlap with positive area"""
+    return ((a[:, 0] < b[:, 2]) & (b[:, 0] < a[:, 2])
+            & (a[:, 1] < b[:, 3]) & (b[:, 1] < a[:, 3]))
+
+
+class RTree:
+    """
+    Static R-tree of boxes, packed bottom-up.
+
+    The boxes are sorted once in Sort-Tile-Recursive order (`order` maps
+    them back to the input) and levels[0] holds them in that order; every
+    next level groups NODE_SIZE consecutive boxes of the previous one, up to
+    a single root. Node i of level l > 0 spans boxes first[l][i]:first[l][i + 1]
+    of level l - 1.
+    """
+
+    def __init__(self, boxes, node_size=NODE_SIZE):
+        boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+        self.order = _str_order(boxes, node_size) if len(boxes) else np.empty(0, dtype=np.int64)
+        self.levels = [boxes[self.order]]
+        self.first = [None]
+        while len(self.levels[-1]) > 1:
+            below = self.levels[-1]
+            first = np.arange(0, len(below), node_size)
+            self.levels.append(np.hstack([np.minimum.reduceat(below[:, :2], first),
+                                          np.maximum.reduceat(below[:, 2:], first)]))
+            self.first.append(np.append(first, len(below)))
+
+    def overlapping_pairs(self, test=None):
+        """
+        Pairs (i, j), i < j, of input boxes overlapping with positive area, by
+        a self-join of the tree: pairs of nodes whose boxes overlap are
+        expanded into the pairs of their children, one level at a time, in
+        chunks of at most about CHUNK_PAIRS pairs
+
+        Args:
+            test: Optional function of a (k, 2) array of pairs returning the
+                mask of those to keep, applied chunk by chunk
+        """
+        if len(self.order) < 2:
+            return np.empty((0, 2), dtype=np.int64)
+        a = b = np.zeros(1, dtype=np.int64)
+        for level in range(len(self.levels) - 1, 1, -1):
+            found = list(_expand(self.first[level], a, b, self.levels[level - 1], False))
+            a = np.concatenate([i for i, _ in found] + [a[:0]])
+            b = np.concatenate([j for _, j in found] + [b[:0]])
+        found = [np.empty((0, 2), dtype=np.int64)]
+        for i, j in _expand(self.first[1], a, b, self.levels[0], True):
+            pairs = np.sort(np.column_stack([self.order[i], self.order[j]]), axis=1)
+            found.append(pairs if test is None else pairs[test(pairs)])
+        return np.concatenate(found)
+
+
+def _expand(first, a, b, boxes, distinct):
+    """Children pairs of the node pairs (a, b) whose boxes overlap, in chunks"""
+    per_pair = (first[a + 1] - first[a]) * (first[b + 1] - first[b])
+    total = np.cumsum(per_pair)
+    cuts = np.searchsorted(total, np.arange(CHUNK_PAIRS, total[-1] if len(total) else 0,
+                                            CHUNK_PAIRS))
+    bounds = np.unique(np.concatenate([[0], cuts, [len(a)]]))
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        i, j = _child_pairs(first, a[start:end], b[start:end], distinct)
+        keep = _boxes_overlap(boxes[i], boxes[j])
+        yield i[keep], j[keep]
+
+
+def _child_pairs(first, a, b, distinct):
+    """
+    Pairs of children of the node pairs (a, b). A node paired with itself
+    gives each unordered pair of its children once, and each child with
+    itself too unless `distinct` (the children are boxes, not nodes).
+    """
+    count_a = first[a + 1] - first[a]
+    count_b = first[b + 1] - first[b]
+    per_pair = count_a * count_b
+    pair = np.repeat(np.arange(len(a)), per_pair)
+    offset = np.arange(per_pair.sum()) - np.repeat(np.cumsum(per_pair) - per_pair, per_pair)
+    i = first[a][pair] + offset // count_b[pair]
+    j = first[b][pair] + offset % count_b[pair]
+    keep = (a[pair] != b[pair]) | (i < j) | ((i == j) & (not distinct))
+    return i[keep], j[keep]
+
+
+def _cross(u, v):
+    """z component of the cross product of 2-D vectors (last axis)"""
+    return u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]
+
+
+def _orientation(P, Q, tol):
+    """
+    (k, 3, 3) orientations of Q's vertices (last axis) relative to P's edges
+    (middle axis), positive inside P whatever its winding, zero within tol
+    """
+    start = P
+    direction = np.roll(P, -1, axis=1) - P
+    winding = np.sign(_cross(P[:, 1] - P[:, 0], P[:, 2] - P[:, 0]))
+    side = _cross(direction[:, :, None, :], Q[:, None, :, :] - start[:, :, None, :])
+    side = side * winding[:, None, None]
+    side[np.abs(side) <= tol] = 0.0
+    return side
+
+
+def _tolerance(xy):
+    span = np.ptp(xy, axis=0).max() if len(xy) else 0.0
+    return ORIENTATION_TOLERANCE * max(span, 1.0) ** 2
+
+
+def interiors_overlap(xy, triangles, pairs):
+    """
+    Exact test of the candidate pairs: True where the two triangles overlap
+    with positive area (sharing a vertex or an edge is no overlap)
+    """
+    xy = np.asarray(xy, dtype=float)
+    P, Q = xy[triangles[pairs[:, 0]]], xy[triangles[pairs[:, 1]]]
+    tol = _tolerance(xy)
+    # An edge line separates when the other triangle is entirely on its outer side
+    separated = ((_orientation(P, Q, tol) <= 0).all(axis=2).any(axis=1)
+                 | (_orientation(Q, P, tol) <= 0).all(axis=2).any(axis=1))
+    return ~separated
+
+
+def overlapping_pairs(xy, triangles):
+    """(k, 2) pairs i < j of triangles whose interiors overlap"""
+    triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+    return RTree(bounding_boxes(xy, triangles)).overlapping_pairs(
+        lambda pairs: interiors_overlap(xy, triangles, pairs))
+
+
+def _centroid_pairs(xy, triangles, pairs):
+    """
+    Both orientations (u, v) of the pairs where the interior of triangle v
+    contains the centroid of triangle u, tested in chunks of CHUNK_PAIRS
+    """
+    tol = _tolerance(xy)
+    found_u, found_v = [pairs[:0, 0]], [pairs[:0, 1]]
+    for start in range(0, len(pairs), CHUNK_PAIRS):
+        chunk = pairs[start:start + CHUNK_PAIRS]
+        u = np.concatenate([chunk[:, 0], chunk[:, 1]])
+        v = np.concatenate([chunk[:, 1], chunk[:, 0]])
+        centroid = xy[triangles[u]].mean(axis=1)[:, None, :]
+        inside = (_orientation(xy[triangles[v]], centroid, tol) > 0).all(axis=(1, 2))
+        found_u.append(u[inside])
+        found_v.append(v[inside])
+    return np.concatenate(found_u), np.concatenate(found_v)
+
+
+def _distinct_rows(matrix):
+    """
+    Indices of the first occurrence of each distinct row of a CSR matrix
+    with sorted indices: rows are grouped by length and a random 64-bit
+    hash of their columns, then compared column by column with the first
+    row of their group, so a hash collision only keeps an extra row
+    """
+    n_rows = matrix.shape[0]
+    if not n_rows:
+        return np.empty(0, dtype=np.int64)
+    indptr, indices = matrix.indptr, matrix.indices
+    lengths = np.diff(indptr)
+    weights = np.random.default_rng(0).integers(0, np.iinfo(np.int64).max,
+                                                size=matrix.shape[1], dtype=np.uint64)
+    hashes = np.add.reduceat(weights[indices], indptr[:-1]).view(np.int64)
+    _, first, group = np.unique(np.column_stack([hashes, lengths]), axis=0,
+                                return_index=True, return_inverse=True)
+    rep = first[group.ravel()]
+    row = np.repeat(np.arange(n_rows), lengths)
+    offset = np.arange(len(indices)) - indptr[row]
+    differs = np.bincount(row, weights=indices != indices[indptr[rep[row]] + offset],
+                          minlength=n_rows) > 0
+    return np.flatnonzero((rep == np.arange(n_rows)) | differs)
+
+
+def _in_cliques(cliques, pairs):
+    """
+    Mask of the pairs whose two triangles are in a same row of the CSR
+    matrix `cliques` (sorted indices), without forming the co-membership
+    product: the pairs of each row are generated a chunk of about
+    CHUNK_PAIRS at a time and looked up among the sorted pair keys
+    """
+    m = cliques.shape[1]
+    keys = pairs.min(axis=1) * m + pairs.max(axis=1)
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    covered = np.zeros(len(pairs), dtype=bool)
+    indptr, indices = cliques.indptr, cliques.indices
+    sizes = np.diff(indptr)
+    total = np.cumsum(sizes ** 2)
+    cuts = np.searchsorted(total, np.arange(CHUNK_PAIRS, total[-1] if len(total) else 0,
+                                            CHUNK_PAIRS))
+    bounds = np.unique(np.concatenate([[0], cuts, [len(sizes)]]))
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        per_row = sizes[start:end] ** 2
+        row = np.repeat(np.arange(start, end), per_row)
+        offset = np.arange(len(row)) - np.repeat(np.cumsum(per_row) - per_row, per_row)
+        first, second = np.divmod(offset, sizes[row])
+        keep = first < second
+        a = indices[indptr[row[keep]] + first[keep]]
+        b = indices[indptr[row[keep]] + second[keep]]
+        found = np.minimum(np.searchsorted(keys, a * m + b), len(keys) - 1)
+        hit = keys[found] == a * m + b
+        covered[order[found[hit]]] = True
+    return covered
+
+
+def conflict_matrix(xy, triangles, pairs=None, cliques=True):
+    """
+    Sparse 0/1 matrix with one row per conflict, sum over a row <= 1 keeping
+    the selected triangles interior-disjoint.
+
+    Args:
+        xy: (n, 2) point coordinates
+        triangles: (m, 3) point indices
+        pairs: overlapping_pairs() when already computed
+        cliques: Group the pairs into centroid cliques, else one row per pair
+    """
+    xy = np.asarray(xy, dtype=float)
+    triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+    m = len(triangles)
+    if pairs is None:
+        pairs = overlapping_pairs(xy, triangles)
+    rows = []
+    if cliques and len(pairs):
+        # Triangles whose interior contains the centroid of another
+        u, v = _centroid_pairs(xy, triangles, pairs)
+        owners = np.unique(u)
+        members = sp.csr_matrix((np.ones(len(u) + len(owners)),
+                                 (np.concatenate([u, owners]), np.concatenate([v, owners]))),
+                                shape=(m, m))
+        members = members[owners]
+        members.sum_duplicates()
+        members.data[:] = 1.0
+        clique_rows = members[_distinct_rows(members)]
+        rows.append(clique_rows)
+        # Pairs in no clique stay pairwise
+        pairs = pairs[~_in_cliques(clique_rows, pairs)]
+    if len(pairs):
+        k = len(pairs)
+        rows.append(sp.csr_matrix((np.ones(2 * k), (np.repeat(np.arange(k), 2), pairs.ravel())),
+                                  shape=(k, m)))
+    if not rows:
+        return sp.csr_matrix((0, m))
+    return sp.vstack(rows, format='csr')
+
+
+def hull_area(xy):
+    """Area of the convex hull of the points, 0 when they are collinear"""
+    xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+    if len(xy) < 3:
+        return 0.0
+    try:
+        return float(ConvexHull(xy).volume)
+    except QhullError:
+        return 0.0
+
+
+def greedy_partition(xy, triangles, costs, conflicts, max_sets=None, budget=None):
+    """
+    Interior-disjoint triangles by increasing cost per area, each taken
+    unless it conflicts with one already selected
+
+    Args:
+        conflicts: conflict_matrix() of the triangles
+
+    Returns:
+        Selected triangle indices
+    """
+    triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+    costs = np.asarray(costs, dtype=float)
+    areas = triangle_areas(xy, triangles)
+    by_triangle = conflicts.tocsc()
+    blocked = areas <= 0
+    selected = []
+    spent = 0.0
+    for t in np.argsort(costs / np.where(areas > 0, areas, 1.0), kind='stable').tolist():
+        if max_sets is not None and len(selected) >= max_sets:
+            break
+        if blocked[t] or (budget is not None and spent + costs[t] > budget):
+            continue
+        selected.append(t)
+        spent += costs[t]
+        for row in by_triangle.indices[by_triangle.indptr[t]:by_triangle.indptr[t + 1]]:
+            blocked[conflicts.indices[conflicts.indptr[row]:conflicts.indptr[row + 1]]] = True
+    return np.array(selected, dtype=np.int64)
@@ -0,0 +1,212 @@
+"""
+Weighted set-cover heuristics for triangle selection.
+
+Every triangle covers its three vertices at its cost. solve_set_cover runs
+
+1. lazy greedy: repeatedly take the triangle with the lowest cost per
+   newly covered point, from a heap whose keys are only refreshed when
+   popped (a key can only grow as points get covered),
+2. redundancy elimination: drop selected triangles, dearest first, whose
+   vertices are all covered by other selected triangles,
+3. local swaps: replace a selected triangle by a cheaper unselected one
+   containing all the points only it covers, then eliminate again,
+
+and reports a lower bound on the optimal cover cost from a feasible
+solution of the dual of the LP relaxation (dual ascent, or the LP optimum
+itself with exact=True), so the gap of the cover is known without a MILP
+solver.
+
+Triangles are given as an (m, 3) array of point indices and a cost vector;
+points that no triangle contains are ignored.
+"""
+import heapq
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import linprog
+
+
+def incidence(vertices, n_points=None):
+    """Sparse (points x triangles) 0/1 matrix, in CSR (rows list each point's triangles)"""
+    vertices = np.asarray(vertices, dtype=np.int64).reshape(-1, 3)
+    m = len(vertices)
+    n_points = n_points if n_points is not None else (int(vertices.max()) + 1 if m else 0)
+    A = sp.csr_matrix((np.ones(3 * m), (vertices.ravel(), np.repeat(np.arange(m), 3))),
+                      shape=(n_points, m))
+    A.data[:] = 1.0  # a repeated vertex still counts once
+    return A
+
+
+def greedy_cover(vertices, costs, max_sets=None, budget=None):
+    """
+    Lazy greedy cover.
+
+    Args:
+        vertices: (m, 3) point indices
+        costs: (m,) nonnegative costs
+        max_sets: Maximum number of triangles, None for no limit
+        budget: Maximum total cost, None for no limit
+
+    Returns:
+        Selected triangle indices, in selection order
+    """
+    vertices = np.asarray(vertices, dtype=np.int64).reshape(-1, 3)
+    costs = np.asarray(costs, dtype=float)
+    if not len(vertices):
+        return np.empty(0, dtype=np.int64)
+    covered = np.ones(int(vertices.max()) + 1, dtype=bool)
+    covered[vertices.ravel()] = False  # only the points of some triangle need covering
+    remaining = int((~covered).sum())
+
+    # (cost per new point, triangle, new points when the key was computed)
+    new = np.array([len(set(t)) for t in vertices.tolist()])
+    heap = [(c / k, t, k) for t, (c, k) in enumerate(zip(costs.tolist(), new.tolist()))]
+    heapq.heapify(heap)
+
+    selected = []
+    spent = 0.0
+    while heap and remaining:
+        if max_sets is not None and len(selected) >= max_sets:
+            break
+        ratio, t, k = heapq.heappop(heap)
+        fresh = np.unique(vertices[t][~covered[vertices[t]]])
+        if len(fresh) < k:
+            # Stale key: push back with the current count
+            if len(fresh):
+                heapq.heappush(heap, (costs[t] / len(fresh), t, len(fresh)))
+            continue
+        if budget is not None and spent + costs[t] > budget:
+            continue
+        selected.append(t)
+        spent += costs[t]
+        covered[fresh] = True
+        remaining -= len(fresh)
+    return np.array(selected, dtype=np.int64)
+
+
+def remove_redundant(vertices, costs, selected):
+    """Drop selected triangles, dearest first, whose points stay covered without them"""
+    vertices = np.asarray(vertices, dtype=np.int64).reshape(-1, 3)
+    selected = np.asarray(selected, dtype=np.int64)
+    if not len(selected):
+        return selected
+    count = np.bincount(vertices[selected].ravel(), minlength=int(vertices.max()) + 1)
+    keep = np.ones(len(selected), dtype=bool)
+    for idx in np.argsort(-np.asarray(costs, dtype=float)[selected], kind='stable'):
+        v = np.unique(vertices[selected[idx]])
+        if (count[v] > 1).all():
+            keep[idx] = False
+            count[v] -= 1
+    return selected[keep]
+
+
+def local_swaps(vertices, costs, selected, max_passes=10):
+    """
+    1-for-1 swaps: replace a selected triangle by the cheapest cheaper
+    triangle containing every point it covers alone, until no swap helps
+    """
+    vertices = np.asarray(vertices, dtype=np.int64).reshape(-1, 3)
+    costs = np.asarray(costs, dtype=float)
+    selected = remove_redundant(vertices, costs, selected)
+    if not len(selected):
+        return selected
+    by_point = incidence(vertices)
+    indptr, tri_of = by_point.indptr, by_point.indices
+    count = np.bincount(vertices[selected].ravel(), minlength=by_point.shape[0])
+    chosen = np.zeros(len(vertices), dtype=bool)
+    chosen[selected] = True
+
+    for _ in range(max_passes):
+        improved = False
+        for t in np.flatnonzero(chosen)[np.argsort(-costs[chosen], kind='stable')]:
+            if not chosen[t]:
+                continue
+            v = np.unique(vertices[t])
+            alone = v[count[v] == 1]
+            if not len(alone):
+                continue
+            # Triangles containing all the points t covers alone
+            options = tri_of[indptr[alone[0]]:indptr[alone[0] + 1]]
+            for p in alone[1:]:
+                options = np.intersect1d(options, tri_of[indptr[p]:indptr[p + 1]])
+            options = options[~chosen[options] & (costs[options] < costs[t])]
+            if not len(options):
+                continue
+            best = options[np.argmin(costs[options])]
+            chosen[t] = False
+            count[v] -= 1
+            chosen[best] = True
+            count[np.unique(vertices[best])] += 1
+            improved = True
+        if not improved:
+            break
+    return remove_redundant(vertices, costs, np.flatnonzero(chosen))
+
+
+def dual_lower_bound(vertices, costs, exact=False):
+    """
+    Lower bound on the cost of any cover of the points of the triangles.
+
+    Without exact, a feasible solution of the LP dual (max sum y_p subject
+    to sum of y_p over t's points <= c_t): every point starts at a third of
+    its cheapest triangle's cost, which no triangle can exceed, then dual
+    ascent raises the points one by one to the smallest remaining slack of
+    their triangles. With exact, the LP relaxation is solved by HiGHS
+    (scipy.optimize.linprog) for the best LP bound.
+    """
+    vertices = np.asarray(vertices, dtype=np.int64).reshape(-1, 3)
+    costs = np.asarray(costs, dtype=float)
+    if not len(vertices):
+        return 0.0
+    A = incidence(vertices)
+    A = A[np.flatnonzero(np.diff(A.indptr))]
+
+    if exact:
+        res = linprog(costs, A_ub=-A, b_ub=-np.ones(A.shape[0]),
+                      bounds=(0, None), method='highs')
+        if res.status == 0:
+            return float(res.fun)
+
+    y = np.minimum.reduceat(costs[A.indices], A.indptr[:-1]) / 3.0
+    slack = np.maximum(costs - A.T @ y, 0.0)
+    bound = float(y.sum())
+    for row in np.argsort(y, kind='stable'):
+        tris = A.indices[A.indptr[row]:A.indptr[row + 1]]
+        raise_by = slack[tris].min()
+        if raise_by > 0:
+            slack[tris] -= raise_by
+            bound += raise_by
+    return float(bound)
+
+
+def solve_set_cover(vertices, costs, max_sets=None, budget=None, swaps=True, exact_bound=False):
+    """
+    Greedy cover, redundancy elimination, local swaps and dual bound.
+
+    Returns:
+        dict with 'selected' (triangle indices), 'cost', 'covered' and
+        'uncovered' (number of points of some triangle that the cover
+        contains or misses, under max_sets/budget), 'lower_bound' and 'gap'
+        (relative, None if the cover is incomplete or free)
+    """
+    vertices = np.asarray(vertices, dtype=np.int64).reshape(-1, 3)
+    costs = np.asarray(costs, dtype=float)
+    selected = greedy_cover(vertices, costs, max_sets, budget)
+    if swaps:
+        selected = local_swaps(vertices, costs, selected)
+    else:
+        selected = remove_redundant(vertices, costs, selected)
+
+    points = np.unique(vertices)
+    covered = np.unique(vertices[selected]) if len(selected) else np.empty(0, dtype=np.int64)
+    cost = float(costs[selected].sum())
+    bound = dual_lower_bound(vertices, costs, exact_bound)
+    complete = len(covered) == len(points)
+    return {
+        'selected': selected,
+        'cost': cost,
+        'covered': len(covered),
+        'uncovered': len(points) - len(covered),
+        'lower_bound': bound,
+        'gap': (cost - bound) / cost if complete and cost > 0 else None,
+    }
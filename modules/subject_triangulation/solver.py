@@ -1,6 +1,15 @@
 from typing import Dict, List
 
+import numpy as np
+import scipy.sparse as sp
+
+from shared.backends import GUROBI, HIGHS, OPTIMAL, LinearModel, default_backend
+from shared.timings import BUILD, DATA, EXTRACT, HEURISTIC, OPTIMIZE, PhaseTimer
+
+from .candidates import triangle_areas
 from .model import Triangle, TrussStructure
+from .partition import AREA_TOLERANCE, conflict_matrix, greedy_partition, hull_area
+from .set_cover import incidence, solve_set_cover
 
 
 class SimpleTriangulationSolver:
@@ -9,147 +18,266 @@ class SimpleTriangulationSolver:
     def __init__(self, structure: TrussStructure):
         self.structure = structure
 
-    def solve_greedy(self) -> Dict:
-        """Simple greedy algorithm - always works"""
+    def solve_greedy(self, trace_memory=False, timer=None) -> Dict:
+        """
+        Weighted set-cover heuristic (see set_cover.solve_set_cover): lazy
+        greedy on cost per newly covered point, redundancy elimination and
+        local swaps, within max_triangles and budget, with an LP-dual lower
+        bound on the optimal cover cost. With structure.exact_partition,
+        interior-disjoint triangles by increasing cost per area instead.
+
+        Args:
+            trace_memory: Add the tracemalloc peak to the timings
+            timer: PhaseTimer to continue (Gurobi fallback), a new one if None
+        """
         print("Running greedy solver...")
+        if timer is None:
+            timer = PhaseTimer(trace_memory)
 
-        if not self.structure.triangles:
+        timer.start(DATA)
+        if not self.structure.num_triangles:
             print("No triangles, creating some...")
             self._create_default_triangles()
 
-        # Simple greedy: pick triangles until we cover all points or reach max
-        selected = []
-        covered_points = set()
-        total_cost = 0.0
-
-        # Sort triangles by cost (cheapest first)
-        sorted_triangles = sorted(self.structure.triangles, key=lambda t: t.cost)
+        if self.structure.exact_partition:
+            return self._solve_greedy_partition(timer)
 
-        for triangle in sorted_triangles:
-            if len(selected) >= self.structure.max_triangles:
-                break
+        vertices, costs = self.structure.triangle_arrays()
 
-            if total_cost + triangle.cost > self.structure.budget:
-                continue
-
-            # Add triangle
-            selected.append(triangle)
-            total_cost += triangle.cost
-
-            # Mark points as covered
-            i, j, k = triangle.vertices
-            covered_points.update([i, j, k])
+        timer.start(OPTIMIZE)
+        cover = solve_set_cover(vertices, costs, max_sets=self.structure.max_triangles,
+                                budget=self.structure.budget)
 
         # Calculate statistics
-        coverage = len(covered_points) / len(self.structure.points) if self.structure.points else 0
+        timer.start(EXTRACT)
+        selected = [self.structure.triangle(i) for i in cover['selected'].tolist()]
+        covered_points = cover['covered']
+        coverage = covered_points / self.structure.num_points if self.structure.num_points else 0
 
         return {
             'status': 'SUCCESS',
             'selected_triangles': selected,
             'num_triangles': len(selected),
-            'total_cost': total_cost,
-            'covered_points': len(covered_points),
-            'total_points': len(self.structure.points),
-            'coverage_rate': coverage
+            'total_cost': cover['cost'],
+            'covered_points': covered_points,
+            'total_points': self.structure.num_points,
+            'coverage_rate': coverage,
+            'lower_bound': cover['lower_bound'],
+            'gap': cover['gap'],
+            'method': 'Greedy set cover',
+            'timings': timer.report()
         }
 
-    def _create_default_triangles(self):
-        """Create simple triangles if none exist"""
-        points = self.structure.points
-        n = len(points)
+    def _solve_greedy_partition(self, timer) -> Dict:
+        """Greedy exact-partition mode: interior-disjoint triangles by cost per area"""
+        vertices, costs, areas, hull, conflicts = self._partition_data()
 
-        if n < 3:
-            print("Need at least 3 points for triangles")
-            return
-
-        # Create triangles from first few points
-        triangles_to_create = min(5, n * (n-1) * (n-2) // 6)
+        timer.start(OPTIMIZE)
+        selected_idx = self._greedy_selection(vertices, costs, conflicts)
 
-        count = 0
-        for i in range(n):
-            for j in range(i+1, n):
-                for k in range(j+1, n):
-                    if count >= triangles_to_create:
-                        return
+        timer.start(EXTRACT)
+        return self._result('SUCCESS', selected_idx.tolist(), float(costs[selected_idx].sum()),
+                            'Greedy partition', timer)
 
-                    # Simple cost based on triangle "size"
-                    cost = 1.0 + (abs(points[i].x - points[j].x) +
-                                 abs(points[j].y - points[k].y)) * 0.1
-
-                    self.structure.add_triangle((i, j, k), cost)
-                    count += 1
+    def _create_default_triangles(self):
+        """Create the Delaunay candidate triangles if none exist"""
+        if self.structure.num_points < 3:
+            print("Need at least 3 points for triangles")
+            return
 
-    def solve_with_gurobi(self) -> Dict:
-        """Optional Gurobi solver"""
+        count = self.structure.add_delaunay_triangles()
+        if not count:
+            print("Points are collinear, no triangle created")
+
+    def solve_with_gurobi(self, progress=None, trace_memory=False, warm_start=True) -> Dict:
+        """
+        Optional Gurobi solver
+
+        Args:
+            progress: Optional SolverProgress
+            trace_memory: Add the tracemalloc peak to the timings
+            warm_start: Start Gurobi from the greedy solution
+        """
+        return self.solve_milp(GUROBI, progress, trace_memory, warm_start)
+
+    def solve_milp(self, backend=None, progress=None, trace_memory=False, warm_start=True) -> Dict:
+        """
+        Cover MILP: every point in a selected triangle, at most max_triangles
+        triangles, total cost within budget. With structure.exact_partition,
+        the selected triangles must instead have disjoint interiors (one row
+        per overlap clique or pair) and cover the area of the convex hull.
+        Falls back to greedy when the solve fails or is not optimal.
+
+        Args:
+            backend: GUROBI or HIGHS (shared.backends), default_backend() if None
+            progress: Optional SolverProgress
+            trace_memory: Add the tracemalloc peak to the timings
+            warm_start: Give Gurobi the greedy solution (solve_greedy) as a MIP
+                start; HiGHS through SciPy takes none
+        """
+        backend = backend or default_backend()
+        timer = PhaseTimer(trace_memory)
         try:
-            import gurobipy as gp
-            from gurobipy import GRB
-
-            if not self.structure.triangles:
+            timer.start(DATA)
+            if not self.structure.num_triangles:
                 self._create_default_triangles()
 
-            n = len(self.structure.triangles)
-            if n == 0:
-                return {'status': 'ERROR', 'error': 'No triangles'}
+            if not self.structure.num_triangles:
+                return {'status': 'ERROR', 'error': 'No triangles', 'timings': timer.report()}
 
-            # Create model
-            model = gp.Model("Triangulation")
-            model.setParam('OutputFlag', 0)
+            if backend == HIGHS:
+                solution = self._solve_highs(timer, progress)
+            else:
+                solution = self._solve_gurobi(timer, progress, warm_start)
 
-            # Variables
-            x = model.addVars(n, vtype=GRB.BINARY, name="x")
+            timer.start(EXTRACT)
+            if solution is None:
+                return self.solve_greedy(timer=timer)  # Fallback to greedy
 
-            # Objective: minimize cost
-            costs = [t.cost for t in self.structure.triangles]
-            model.setObjective(gp.quicksum(costs[i] * x[i] for i in range(n)), GRB.MINIMIZE)
-
-            # Cover all points
-            point_map = {}
-            for i, triangle in enumerate(self.structure.triangles):
-                for v in triangle.vertices:
-                    if v not in point_map:
-                        point_map[v] = []
-                    point_map[v].append(i)
-
-            for point_idx, tri_indices in point_map.items():
-                model.addConstr(gp.quicksum(x[i] for i in tri_indices) >= 1,
-                              f"cover_{point_idx}")
-
-            # Triangle count limit
-            model.addConstr(gp.quicksum(x[i] for i in range(n)) <= self.structure.max_triangles,
-                          "max_triangles")
-
-            # Budget
-            model.addConstr(gp.quicksum(costs[i] * x[i] for i in range(n)) <= self.structure.budget,
-                          "budget")
-
-            # Solve
-            model.optimize()
-
-            if model.status == GRB.OPTIMAL:
-                selected_idx = [i for i in range(n) if x[i].X > 0.5]
-                selected = [self.structure.triangles[i] for i in selected_idx]
-
-                covered = set()
-                for tri in selected:
-                    covered.update(tri.vertices)
-
-                return {
-                    'status': 'OPTIMAL',
-                    'selected_triangles': selected,
-                    'num_triangles': len(selected),
-                    'total_cost': model.ObjVal,
-                    'covered_points': len(covered),
-                    'total_points': len(self.structure.points),
-                    'coverage_rate': len(covered) / len(self.structure.points),
-                    'method': 'Gurobi'
-                }
-            else:
-                return self.solve_greedy()  # Fallback to greedy
+            selected_idx, objective = solution
+            return self._result('OPTIMAL', selected_idx, objective,
+                                'HiGHS' if backend == HIGHS else 'Gurobi', timer)
 
         except ImportError:
             print("Gurobi not available, using greedy solver")
-            return self.solve_greedy()
+            return self.solve_greedy(timer=timer)
         except Exception as e:
-            print(f"Gurobi error: {e}")
-            return self.solve_greedy()
+            print(f"{backend} error: {e}")
+            return self.solve_greedy(timer=timer)
+
+    def _result(self, status, selected_idx, cost, method, timer) -> Dict:
+        """Result dict of the selected triangles, with the area covered in partition mode"""
+        selected = [self.structure.triangle(i) for i in selected_idx]
+        vertices, _ = self.structure.triangle_arrays()
+        covered = np.unique(vertices[selected_idx])
+        total = self.structure.num_points
+        result = {
+            'status': status,
+            'selected_triangles': selected,
+            'num_triangles': len(selected),
+            'total_cost': cost,
+            'covered_points': len(covered),
+            'total_points': total,
+            'coverage_rate': len(covered) / total if total else 0,
+            'method': method,
+        }
+        if self.structure.exact_partition:
+            xy = self.structure.point_array()
+            result['covered_area'] = float(triangle_areas(xy, vertices[selected_idx]).sum())
+            result['hull_area'] = hull_area(xy)
+            result['area_coverage'] = (result['covered_area'] / result['hull_area']
+                                       if result['hull_area'] else 0)
+        result['timings'] = timer.report()
+        return result
+
+    def _solve_gurobi(self, timer, progress, warm_start=True):
+        """Selected triangle indices and cost, None unless optimal"""
+        from gurobipy import GRB
+
+        from shared.gurobi_utils import create_model, optimize, set_starts
+
+        timer.start(BUILD)
+        if self.structure.exact_partition:
+            vertices, costs, areas, hull, conflicts = self._partition_data()
+        else:
+            vertices, costs, cover = self._cover_matrix()
+            conflicts = None
+        n = len(costs)
+
+        # Create model
+        model = create_model("Triangulation", defaults={'OutputFlag': 0})
+
+        # Variables
+        x = model.addMVar(n, vtype=GRB.BINARY, name="x")
+
+        # Objective: minimize cost
+        model.setObjective(costs @ x, GRB.MINIMIZE)
+
+        if self.structure.exact_partition:
+            # Tile the hull: interior-disjoint triangles covering its area
+            model.addConstr(areas @ x >= hull * (1 - AREA_TOLERANCE), name="area")
+            if conflicts.shape[0]:
+                model.addConstr(conflicts @ x <= 1, name="overlap")
+        else:
+            # Cover all points
+            model.addConstr(cover @ x >= 1, name="cover")
+
+        # Triangle count limit
+        model.addConstr(x.sum() <= self.structure.max_triangles, name="max_triangles")
+
+        # Budget
+        model.addConstr(costs @ x <= self.structure.budget, name="budget")
+
+        timer.record_model(model)
+        if warm_start:
+            timer.start(HEURISTIC)
+            start = np.zeros(n)
+            start[self._greedy_selection(vertices, costs, conflicts)] = 1.0
+            set_starts(model, x, [start])
+
+        # Solve
+        timer.start(OPTIMIZE)
+        optimize(model, progress)
+
+        if model.status != GRB.OPTIMAL:
+            return None
+        return np.flatnonzero(x.X > 0.5).tolist(), model.ObjVal
+
+    def _solve_highs(self, timer, progress):
+        """Same model in matrix form, solved by HiGHS through scipy.optimize.milp"""
+        timer.start(BUILD)
+        model = LinearModel("Triangulation")
+        if self.structure.exact_partition:
+            vertices, costs, areas, hull, conflicts = self._partition_data()
+            n = len(costs)
+            model.add_binary(n, obj=costs)
+            model.add_constrs(sp.csr_matrix(areas), lb=hull * (1 - AREA_TOLERANCE))
+            if conflicts.shape[0]:
+                model.add_constrs(conflicts, ub=1.0)
+        else:
+            vertices, costs, cover = self._cover_matrix()
+            n = len(costs)
+            model.add_binary(n, obj=costs)
+            model.add_constrs(cover, lb=1.0)
+
+        # Triangle count limit and budget
+        model.add_constrs(sp.csr_matrix(np.vstack([np.ones(n), costs])),
+                          ub=[self.structure.max_triangles, self.structure.budget])
+
+        timer.record_model(model)
+        timer.start(OPTIMIZE)
+        solution = model.solve(HIGHS, progress=progress)
+        if solution.status != OPTIMAL:
+            return None
+        return np.flatnonzero(solution.x > 0.5).tolist(), solution.objective
+
+    def _greedy_selection(self, vertices, costs, conflicts=None):
+        """
+        Triangle indices of the greedy solution: set cover, or partition when
+        the conflict rows are given
+        """
+        if conflicts is not None:
+            return greedy_partition(self.structure.point_array(), vertices, costs, conflicts,
+                                    max_sets=self.structure.max_triangles,
+                                    budget=self.structure.budget)
+        return solve_set_cover(vertices, costs, max_sets=self.structure.max_triangles,
+                               budget=self.structure.budget)['selected']
+
+    def _cover_matrix(self):
+        """
+        Triangle arrays and the (points x triangles) incidence matrix, one
+        row per point of some triangle, built in one shot
+        """
+        vertices, costs = self.structure.triangle_arrays()
+        cover = incidence(vertices)
+        return vertices, costs, cover[np.flatnonzero(np.diff(cover.indptr))]
+
+    def _partition_data(self):
+        """
+        Triangle arrays, areas, convex hull area and the overlap conflict rows
+        (see partition.conflict_matrix) of the exact-partition mode
+        """
+        xy = self.structure.point_array()
+        vertices, costs = self.structure.triangle_arrays()
+        return (vertices, costs, triangle_areas(xy, vertices), hull_area(xy),
+                conflict_matrix(xy, vertices))
@@ -0,0 +1,5 @@
+from .ground_structure import GroundStructure
+from .solver import build_physical_truss, solve_physical_truss
+from .symmetry import detect_symmetry
+from .connectivity import ConnectivityCuts, UnionFind
+from .continuation import TrussModel
@@ -0,0 +1,126 @@
+"""
+Connectivity of the required truss nodes through lazy cut constraints.
+
+Instead of a flow network, integer solutions are checked in a MIPSOL
+callback: the active members are merged with union-find, and every
+component holding some but not all required nodes yields the cut
+"at least one member leaving the component is active". The same test on
+the members carrying some LP value at a node gives user cuts that tighten
+the relaxation.
+"""
+import numpy as np
+
+try:
+    from gurobipy import GRB, LinExpr
+except ImportError:
+    GRB = None
+    LinExpr = None
+
+
+class UnionFind:
+    """Disjoint sets over 0..n-1 with path halving and union by size"""
+
+    def __init__(self, n):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
+        return True
+
+
+def violated_cuts(n_nodes, ends, active, required):
+    """
+    Cut sets separating the required nodes in the active-member graph.
+
+    Args:
+        n_nodes: Number of nodes
+        ends: (n_edges, 2) member end nodes
+        active: Boolean mask of active members
+        required: Indices of the nodes that must be connected
+
+    Returns:
+        List of member index arrays, one per component that holds some but
+        not all required nodes: the members with exactly one end inside it
+    """
+    uf = UnionFind(n_nodes)
+    for i, j in ends[active].tolist():
+        uf.union(i, j)
+    roots = {uf.find(v) for v in required}
+    if len(roots) <= 1:
+        return []
+
+    labels = np.fromiter((uf.find(v) for v in range(n_nodes)), dtype=np.int64, count=n_nodes)
+    cuts = []
+    for root in roots:
+        inside = labels == root
+        crossing = inside[ends[:, 0]] != inside[ends[:, 1]]
+        cuts.append(np.flatnonzero(crossing))
+    return cuts
+
+
+# Members with a node relaxation value above this are merged when separating user cuts
+SUPPORT_THRESHOLD = 1e-3
+
+
+class ConnectivityCuts:
+    """
+    Callback adding violated connectivity cuts: lazy constraints on integer
+    solutions (MIPSOL), user cuts on node relaxations (MIPNODE)
+    """
+
+    def __init__(self, n_nodes, edges, required, z, expand):
+        """
+        Args:
+            n_nodes: Number of nodes
+            edges: Candidate members (i, j)
+            required: Nodes that must be connected (supports and loaded nodes)
+            z: Topology variables (list of gurobipy Var)
+            expand: Sparse matrix giving member z from variable z
+        """
+        self.n_nodes = n_nodes
+        self.ends = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        self.required = list(required)
+        self.z = z
+        self.expand = expand.tocsr()
+        self.cuts_added = 0
+        self.user_cuts_added = 0
+
+    def __call__(self, model, where):
+        if where == GRB.Callback.MIPSOL:
+            values = np.array(model.cbGetSolution(self.z))
+            for expr in self._cuts(values, 0.5):
+                model.cbLazy(expr >= 1)
+                self.cuts_added += 1
+        elif (where == GRB.Callback.MIPNODE
+              and model.cbGet(GRB.Callback.MIPNODE_STATUS) == GRB.OPTIMAL):
+            values = np.array(model.cbGetNodeRel(self.z))
+            for expr in self._cuts(values, SUPPORT_THRESHOLD):
+                model.cbCut(expr >= 1)
+                self.user_cuts_added += 1
+
+    def _cuts(self, values, threshold):
+        """Left-hand sides of the cuts violated by the given z values"""
+        member_values = self.expand @ values
+        exprs = []
+        for cut in violated_cuts(self.n_nodes, self.ends, member_values > threshold,
+                                 self.required):
+            if member_values[cut].sum() >= 1 - 1e-6:
+                continue
+            coeffs = np.asarray(self.expand[cut].sum(axis=0)).ravel()
+            idx = np.flatnonzero(coeffs)
+            exprs.append(LinExpr(coeffs[idx].tolist(), [self.z[k] for k in idx]))
+        return exprs
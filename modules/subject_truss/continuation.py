@@ -0,0 +1,140 @@
+"""
+Warm-started re-solves of the physical truss MILP.
+
+Thanks to the scaled formulation (areas in units of A_max, forces in units
+of sigma*A_max) the allowable stress, A_max, the load magnitude, the length
+penalty and the sparsity ratio only appear in right-hand sides, objective
+coefficients and the A_low coefficients. A TrussModel therefore keeps one
+Gurobi model alive, applies parameter changes in place and starts every
+solve from the previous design.
+"""
+import numpy as np
+
+from shared.timings import BUILD, DATA, EXTRACT, OPTIMIZE, PhaseTimer
+
+from .solver import FLOW, build_physical_truss, milp_result, normalize_load_cases, optimize
+from .symmetry import detect_symmetry
+
+# Parameters that TrussModel.update changes in place
+UPDATABLE = ('sigma_allow', 'A_max', 'load_factor', 'length_penalty', 'min_bar_ratio',
+             'time_limit', 'mip_gap')
+
+
+class TrussModel:
+    """Physical truss MILP kept alive between solves"""
+
+    def __init__(self, nodes, edges, supports, load_node, load_vector,
+                 rho=7850.0, sigma_allow=250e6,
+                 A_min=1e-6, A_max=5e-4,
+                 min_bar_ratio=0.02, length_penalty=0.0,
+                 time_limit=60, mip_gap=1e-3, verbose=False,
+                 load_cases=None, symmetry=False, connectivity=FLOW):
+        """
+        Same parameters as solve_physical_truss (MILP mode). The loads given
+        here are the reference loads that load_factor multiplies.
+        """
+        # Model set-up and parameter updates are reported by the next solve
+        self._pending = PhaseTimer()
+        self._pending.start(DATA)
+        self.reduction = None
+        if symmetry:
+            self.reduction = detect_symmetry(nodes, edges, supports,
+                                             normalize_load_cases(load_node, load_vector, load_cases))
+        self.n_edges = len(edges)
+        self.rho = rho
+        self.A_min = A_min
+        self.params = {'sigma_allow': sigma_allow, 'A_max': A_max, 'load_factor': 1.0,
+                       'length_penalty': length_penalty, 'min_bar_ratio': min_bar_ratio,
+                       'time_limit': time_limit, 'mip_gap': mip_gap}
+        self._pending.start(BUILD)
+        self.model, self.vars = build_physical_truss(
+            nodes, edges, supports, load_node, load_vector,
+            rho=rho, sigma_allow=sigma_allow, A_min=A_min, A_max=A_max,
+            min_bar_ratio=min_bar_ratio, length_penalty=length_penalty,
+            time_limit=time_limit, mip_gap=mip_gap, verbose=verbose,
+            load_cases=load_cases, symmetry=self.reduction, connectivity=connectivity)
+        self.solves = 0
+        # Last design per model variable, in physical units
+        self._last = None
+        self._pending.stop()
+
+    def update(self, **params):
+        """
+        Change parameters in place (see UPDATABLE); the model is not rebuilt.
+
+        load_factor multiplies the reference loads given at construction.
+        """
+        unknown = set(params) - set(UPDATABLE)
+        if unknown:
+            raise ValueError(f"Parameters need a new model: {', '.join(sorted(unknown))}")
+        self._pending.start(BUILD)
+        self.params.update(params)
+        p = self.params
+        m, v = self.model, self.vars
+
+        v['area_scale'] = p['A_max']
+        v['force_scale'] = p['sigma_allow'] * p['A_max']
+        for c, constr in enumerate(v['eq']):
+            constr.RHS = p['load_factor'] * v['loads'][c] / v['force_scale']
+        v['A'].Obj = self.rho * p['A_max'] * v['L']
+        v['z'].Obj = max(p['length_penalty'], 0.0) * v['L']
+        if 'A_max' in params:
+            ratio = -self.A_min / p['A_max']
+            for constr, z in zip(v['A_low'].tolist(), v['z'].tolist()):
+                m.chgCoeff(constr, z, ratio)
+        v['min_bars'].RHS = max(1, int(p['min_bar_ratio'] * self.n_edges))
+        m.setParam('TimeLimit', float(p['time_limit']))
+        m.setParam('MIPGap', float(p['mip_gap']))
+        self._pending.stop()
+
+    def solve(self, warm_start=True, progress=None, trace_memory=False):
+        """
+        Optimize, starting from the previous design when there is one.
+
+        progress: optional shared.telemetry.SolverProgress
+        trace_memory: add the tracemalloc peak to the timings
+
+        Returns:
+            Result dict of solve_physical_truss, plus 'warm_start'. The
+            timings hold the set-up or updates done since the last solve.
+        """
+        timer = PhaseTimer(trace_memory)
+        timer.include(self._pending)
+        self._pending = PhaseTimer()
+        timer.start(BUILD)
+        m, v = self.model, self.vars
+        started = warm_start and self._last is not None
+        if started:
+            z, areas, forces = self._last
+            v['z'].Start = z
+            lo = self.A_min / v['area_scale']
+            v['A'].Start = np.where(z > 0.5, np.clip(areas / v['area_scale'], lo, 1.0), 0.0)
+            v['F'].Start = np.clip(forces * self.params['load_factor'] / v['force_scale'],
+                                   -1.0, 1.0)
+        timer.record_model(m)
+        timer.start(OPTIMIZE)
+        optimize(m, progress, v['callback'])
+        self.solves += 1
+
+        timer.start(EXTRACT)
+        result = milp_result(m, v, self.params['A_max'], self.reduction)
+        if m.SolCount > 0:
+            # Forces are stored per unit load factor so that a load change rescales them
+            factor = self.params['load_factor'] or 1.0
+            self._last = (np.round(v['z'].X), v['area_scale'] * v['A'].X,
+                          v['force_scale'] * v['F'].X / factor)
+        result['warm_start'] = started
+        result['timings'] = timer.report()
+        return result
+
+    def sweep(self, parameter, values, warm_start=True, progress=None):
+        """
+        Continuation: solve for each value of one parameter in turn, every
+        solve starting from the previous design.
+
+        Yields:
+            (value, result) pairs
+        """
+        for value in values:
+            self.update(**{parameter: value})
+            yield value, self.solve(warm_start=warm_start, progress=progress)
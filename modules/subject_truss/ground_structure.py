@@ -0,0 +1,133 @@
+"""
+Ground structures (candidate member sets) for truss topology optimization.
+
+Candidate members are enumerated with a KD-tree instead of scanning every node
+pair, so the neighbour window costs O(n·k) rather than O(n²).
+"""
+import numpy as np
+from scipy.spatial import cKDTree
+
+# Connectivity levels understood by GroundStructure
+WINDOW = 'window'
+NEAREST = 'nearest'
+FULL = 'full'
+
+
+def _as_xy(nodes):
+    return np.asarray(nodes, dtype=float).reshape(-1, 2)
+
+
+def _sorted_pairs(pairs):
+    """Unique (i, j) pairs with i < j in lexicographic order, as a list of tuples"""
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    pairs = np.sort(pairs, axis=1)
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    pairs = np.unique(pairs, axis=0)
+    return [tuple(p) for p in pairs.tolist()]
+
+
+def window_edges(nodes, window=2.0):
+    """Members between nodes with |dx| <= window and |dy| <= window"""
+    xy = _as_xy(nodes)
+    if len(xy) < 2:
+        return []
+    # Chebyshev ball (p=inf) is exactly the square window
+    pairs = cKDTree(xy).query_pairs(r=window, p=np.inf, output_type='ndarray')
+    return _sorted_pairs(pairs)
+
+
+def nearest_edges(nodes, k=8):
+    """Members from every node to its k nearest neighbours"""
+    xy = _as_xy(nodes)
+    n = len(xy)
+    if n < 2:
+        return []
+    k = min(k, n - 1)
+    _, nbrs = cKDTree(xy).query(xy, k=k + 1)
+    nbrs = nbrs.reshape(n, -1)[:, 1:]
+    pairs = np.column_stack([np.repeat(np.arange(n), k), nbrs.ravel()])
+    return _sorted_pairs(pairs)
+
+
+def full_edges(nodes, remove_overlaps=True, decimals=9):
+    """
+    Full ground structure: every node pair.
+
+    With remove_overlaps, a member is dropped when another node lies on it, so
+    collinear chains are kept only as their shortest members. Per node, other
+    nodes are grouped by direction and only the nearest one of each direction
+    is kept, which is O(n² log n) instead of testing every node on every member.
+    """
+    xy = _as_xy(nodes)
+    n = len(xy)
+    if n < 2:
+        return []
+    if not remove_overlaps:
+        i, j = np.triu_indices(n, k=1)
+        return _sorted_pairs(np.column_stack([i, j]))
+
+    pairs = []
+    for i in range(n):
+        d = xy - xy[i]
+        L = np.hypot(d[:, 0], d[:, 1])
+        others = np.flatnonzero(L > 0)
+        if not len(others):
+            continue
+        ux = np.round(d[others, 0] / L[others], decimals)
+        uy = np.round(d[others, 1] / L[others], decimals)
+        # Sort by direction, then by length: the first of each direction is the nearest
+        order = np.lexsort((L[others], uy, ux))
+        ux, uy, cand = ux[order], uy[order], others[order]
+        first = np.ones(len(cand), dtype=bool)
+        first[1:] = (ux[1:] != ux[:-1]) | (uy[1:] != uy[:-1])
+        nearest = cand[first]
+        nearest = nearest[nearest > i]
+        pairs.append(np.column_stack([np.full(len(nearest), i), nearest]))
+
+    if not pairs:
+        return []
+    return _sorted_pairs(np.vstack(pairs))
+
+
+class GroundStructure:
+    """Candidate member list for a node set, cached until the nodes change"""
+
+    def __init__(self, connectivity=WINDOW, window=2.0, k=8, remove_overlaps=True):
+        """
+        Args:
+            connectivity: WINDOW, NEAREST or FULL
+            window: Half-width of the square neighbour window (WINDOW)
+            k: Number of neighbours per node (NEAREST)
+            remove_overlaps: Drop members passing through another node (FULL)
+        """
+        self.connectivity = connectivity
+        self.window = window
+        self.k = k
+        self.remove_overlaps = remove_overlaps
+        self._key = None
+        self._edges = []
+
+    def set_connectivity(self, connectivity, **params):
+        """Change the connectivity level (and its parameters); invalidates the cache"""
+        if connectivity not in (WINDOW, NEAREST, FULL):
+            raise ValueError(f"Unknown connectivity level: {connectivity}")
+        self.connectivity = connectivity
+        for name, value in params.items():
+            setattr(self, name, value)
+        self._key = None
+
+    def edges(self, nodes):
+        """Candidate members (i, j), i < j, rebuilt only when the nodes change"""
+        key = (self.connectivity, self.window, self.k, self.remove_overlaps,
+               tuple(map(tuple, nodes)))
+        if key != self._key:
+            self._edges = self._build(nodes)
+            self._key = key
+        return self._edges
+
+    def _build(self, nodes):
+        if self.connectivity == NEAREST:
+            return nearest_edges(nodes, self.k)
+        if self.connectivity == FULL:
+            return full_edges(nodes, self.remove_overlaps)
+        return window_edges(nodes, self.window)
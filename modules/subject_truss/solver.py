@@ -0,0 +1,646 @@
+"""
+Physical truss topology optimization (MILP)
+Equilibrium + stress + area/topology linking + connectivity of supports and load
+
+The model is assembled through Gurobi's matrix API from sparse node-member
+incidence matrices, so the build cost is linear in the number of members.
+
+For dense ground structures the continuous-area (plastic design) LP can be
+solved by member adding instead: solve on a sparse member set, price the
+omitted members with the dual virtual strains and add the violated ones.
+"""
+import math
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+from shared.model_cache import instance_key
+from shared.timings import BUILD, DATA, EXTRACT, OPTIMIZE, PhaseTimer
+
+from .connectivity import ConnectivityCuts
+from .ground_structure import nearest_edges
+from .symmetry import detect_symmetry
+
+# Try to import Gurobi
+try:
+    import gurobipy as gp
+    from gurobipy import GRB
+
+    from shared.gurobi_utils import create_model, optimize
+    GUROBI_AVAILABLE = True
+    GurobiImportError = None
+except ImportError as e:
+    gp = None
+    GRB = None
+    create_model = optimize = None
+    GUROBI_AVAILABLE = False
+    GurobiImportError = e
+
+# Solution modes of solve_physical_truss
+MILP = 'milp'
+MEMBER_ADDING = 'member_adding'
+
+# Connectivity formulations of the MILP: flow network or lazy cuts
+FLOW = 'flow'
+LAZY_CUTS = 'lazy_cuts'
+
+# Member adding: members whose virtual strain exceeds 1 + tolerance are added,
+# at most this fraction of the current member set (and at least MIN_ADDED) per pass
+STRAIN_TOLERANCE = 1e-4
+ADD_FRACTION = 0.1
+MIN_ADDED = 100
+
+
+# ---------- Geometry utils ----------
+def length_and_dir(nodes, edge):
+    i, j = edge
+    xi, yi = nodes[i]
+    xj, yj = nodes[j]
+    dx = xj - xi
+    dy = yj - yi
+    L = math.hypot(dx, dy)
+    if L == 0:
+        return 0.0, 0.0, 0.0
+    return L, dx / L, dy / L
+
+
+def member_geometry(nodes, edges):
+    """Vectorized length_and_dir: arrays L, dirx, diry (zero for degenerate members)"""
+    xy = np.asarray(nodes, dtype=float).reshape(-1, 2)
+    ends = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    d = xy[ends[:, 1]] - xy[ends[:, 0]]
+    L = np.hypot(d[:, 0], d[:, 1])
+    safe = np.where(L > 0, L, 1.0)
+    dirx = np.where(L > 0, d[:, 0] / safe, 0.0)
+    diry = np.where(L > 0, d[:, 1] / safe, 0.0)
+    return L, dirx, diry
+
+
+def incidence_matrix(n_nodes, edges, tail=-1.0, head=1.0):
+    """Sparse (n_nodes x n_edges) matrix with `tail` at row i and `head` at row j of member (i, j)"""
+    ends = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    n_edges = len(ends)
+    cols = np.arange(n_edges)
+    rows = np.concatenate([ends[:, 0], ends[:, 1]])
+    vals = np.concatenate([np.full(n_edges, tail), np.full(n_edges, head)])
+    return sp.csr_matrix((vals, (rows, np.concatenate([cols, cols]))),
+                         shape=(n_nodes, n_edges))
+
+
+def equilibrium_matrix(nodes, edges, supports, geometry=None):
+    """
+    Sparse equilibrium matrix B (2·free x n_edges) and the free node indices.
+
+    Row 2r holds the x balance and row 2r+1 the y balance of free node free[r]:
+    a member force F[k] pulls node i along +dir and node j along -dir.
+    """
+    L, dirx, diry = geometry if geometry is not None else member_geometry(nodes, edges)
+    n_nodes = len(nodes)
+    # +dir at the tail node i, -dir at the head node j
+    signs = incidence_matrix(n_nodes, edges, tail=1.0, head=-1.0)
+    free = np.flatnonzero(~np.asarray(supports, dtype=bool))
+    Sf = signs[free]
+    Bx = Sf.multiply(dirx[np.newaxis, :])
+    By = Sf.multiply(diry[np.newaxis, :])
+    # Interleave x/y rows per free node
+    B = sp.vstack([Bx, By]).tocsr()
+    order = np.empty(2 * len(free), dtype=np.int64)
+    order[0::2] = np.arange(len(free))
+    order[1::2] = np.arange(len(free)) + len(free)
+    return B[order], free
+
+
+def normalize_load_cases(load_node, load_vector, load_cases=None):
+    """
+    Load cases as a list of {node: (Fx, Fy)} dicts.
+
+    load_cases entries may be dicts or (node, (Fx, Fy)) pairs; without
+    load_cases the single case (load_node, load_vector) is used.
+    """
+    if load_cases is None:
+        return [{load_node: tuple(load_vector)}] if load_node is not None else [{}]
+    cases = []
+    for case in load_cases:
+        if isinstance(case, dict):
+            cases.append({int(n): tuple(vec) for n, vec in case.items()})
+        else:
+            node, vec = case
+            cases.append({int(node): tuple(vec)})
+    if not cases:
+        raise ValueError("At least one load case is required.")
+    return cases
+
+
+def load_matrix(cases, free):
+    """(n_cases x 2·free) right-hand sides of the equilibrium rows; loads on supports are dropped"""
+    loads = np.zeros((len(cases), 2 * len(free)))
+    for c, case in enumerate(cases):
+        for node, (Fx, Fy) in case.items():
+            r = int(np.searchsorted(free, node))
+            if r < len(free) and free[r] == node:
+                loads[c, 2 * r] += Fx
+                loads[c, 2 * r + 1] += Fy
+    return loads
+
+
+def connected_nodes(supports, cases):
+    """Required nodes for connectivity: supports + loaded nodes of every case"""
+    required_nodes = [i for i, s in enumerate(supports) if s]
+    for case in cases:
+        required_nodes.extend(v for v in case if v not in required_nodes)
+    return required_nodes
+
+
+def build_physical_truss(nodes, edges, supports, load_node, load_vector,
+                         rho=7850.0, sigma_allow=250e6,
+                         A_min=1e-6, A_max=5e-4,
+                         min_bar_ratio=0.02, length_penalty=0.0,
+                         time_limit=60, mip_gap=1e-3, verbose=False,
+                         load_cases=None, symmetry=None, connectivity=FLOW):
+    """
+    Assemble the physical truss MILP without solving it.
+
+    With several load cases the topology z and areas A are shared, while
+    every case gets its own member forces and equilibrium block, all built
+    from the same geometry and equilibrium matrix.
+
+    With a TrussSymmetry, mirrored members share one variable per orbit and
+    the constraint matrices are multiplied by symmetry.expand. The connectivity
+    flow is reduced too when a required node is fixed by every reflection
+    (it becomes the root, so the demand is symmetric).
+
+    With connectivity=LAZY_CUTS the flow network is left out; connectivity is
+    enforced by the ConnectivityCuts callback, to be passed to optimize().
+
+    Returns:
+    --------
+    (model, variables) where variables maps 'A', 'z', 'f_fwd', 'f_bwd' to
+    Gurobi MVars (flows are None with lazy cuts), 'F' to an (n_cases x n)
+    MVar, 'expand' to the sparse matrix giving member values from variable
+    values (identity without symmetry), 'callback' to the optimize()
+    callback or None, 'area_scale'/'force_scale' to the units of A and F,
+    plus the constraints and data that parameter updates touch
+    """
+    if connectivity not in (FLOW, LAZY_CUTS):
+        raise ValueError(f"Unknown connectivity formulation: {connectivity}")
+    if gp is None:
+        raise RuntimeError(f"Gurobi not available: {GurobiImportError}")
+
+    n_nodes = len(nodes)
+    n_edges = len(edges)
+
+    # Precompute geometry and incidence
+    geometry = member_geometry(nodes, edges)
+    L = geometry[0]
+    incidence = incidence_matrix(n_nodes, edges)
+
+    cases = normalize_load_cases(load_node, load_vector, load_cases)
+
+    required_nodes = connected_nodes(supports, cases)
+    if len(required_nodes) < 2:
+        raise RuntimeError("At least two required nodes (supports + load) needed for connectivity.")
+
+    # Member variables, or one variable per orbit of mirrored members
+    root = required_nodes[0]
+    identity = sp.identity(n_edges, format='csr')
+    if symmetry is None:
+        expand, n_vars = identity, n_edges
+        flow_same, flow_flip, flow_link = identity, None, identity
+    else:
+        expand, n_vars = symmetry.expand, symmetry.n_orbits
+        fixed_required = [v for v in required_nodes if symmetry.fixed_nodes[v]]
+        if fixed_required:
+            root = fixed_required[0]
+            flow_same, flow_flip = symmetry.same, symmetry.flip
+            flow_link = sp.identity(n_vars, format='csr')
+        else:
+            flow_same, flow_flip, flow_link = identity, None, expand
+    n_flows = flow_same.shape[1]
+
+    # Build Gurobi model
+    m = create_model("physical_truss", TimeLimit=float(time_limit), MIPGap=float(mip_gap),
+                     **({} if verbose else {'OutputFlag': 0}))
+
+    # Variables, scaled to O(1): areas in units of A_max and forces in units of
+    # sigma*A_max. In SI units the ~1e-6 areas sit at the feasibility tolerance,
+    # which lets "inactive" members keep a tolerance-sized area and carry load.
+    area_scale = A_max
+    force_scale = sigma_allow * A_max
+    A = m.addMVar(n_vars, lb=0.0, ub=1.0, name="A")  # cross sectional areas / A_max
+    F = m.addMVar((len(cases), n_vars), lb=-GRB.INFINITY, ub=GRB.INFINITY, name="F")  # axial forces per case / (sigma*A_max)
+    z = m.addMVar(n_vars, vtype=GRB.BINARY, name="z")  # topology on/off
+
+    # Flow variables for connectivity: f_fwd on i -> j, f_bwd on j -> i
+    R = len(required_nodes)
+    f_fwd = f_bwd = callback = None
+    if connectivity == FLOW:
+        f_fwd = m.addMVar(n_flows, lb=0.0, ub=R, name="f_fwd")
+        f_bwd = m.addMVar(n_flows, lb=0.0, ub=R, name="f_bwd")
+        # flow only if edge active
+        m.addConstr(f_fwd <= R * (flow_link @ z), name="flow_fwd_on")
+        m.addConstr(f_bwd <= R * (flow_link @ z), name="flow_bwd_on")
+
+    # Objective: minimize weight + length_penalty * sum(L * z)
+    L_vars = expand.T @ L
+    objective = (rho * area_scale * L_vars) @ A
+    if length_penalty > 0:
+        objective = objective + (length_penalty * L_vars) @ z
+    m.setObjective(objective, GRB.MINIMIZE)
+
+    # Equilibrium constraints on free nodes, one block per case: B F_c = loads_c
+    B, free = equilibrium_matrix(nodes, edges, supports, geometry)
+    B = (B @ expand).tocsr()
+    loads = load_matrix(cases, free)
+    eq = []
+    for c in range(len(cases)):
+        eq.append(m.addConstr(B @ F[c] == loads[c] / force_scale, name=f"eq_{c}"))
+        # Stress constraints: shared areas must carry every case
+        m.addConstr(F[c] <= A, name=f"stress_pos_{c}")
+        m.addConstr(-F[c] <= A, name=f"stress_neg_{c}")
+    # Link A <-> z
+    m.addConstr(A <= z, name="A_up")
+    A_low = m.addConstr(A >= (A_min / A_max) * z, name="A_low")
+
+    # Ensure each required node has at least one incident active member
+    degree = abs(incidence)
+    req_with_edges = [v for v in required_nodes if degree[v].nnz > 0]
+    if req_with_edges:
+        m.addConstr((degree[req_with_edges] @ expand) @ z >= 1, name="req_conn")
+
+    if connectivity == FLOW:
+        # Flow conservation for connectivity: net inflow = demand per node.
+        # A flipped member carries the representative's forward flow j -> i.
+        flow_incidence = incidence @ flow_same
+        if flow_flip is not None:
+            flow_incidence = flow_incidence - incidence @ flow_flip
+        demand = np.zeros(n_nodes)
+        demand[required_nodes] = 1.0
+        demand[root] = -(R - 1)
+        m.addConstr(flow_incidence @ f_fwd - flow_incidence @ f_bwd == demand, name="flow")
+    else:
+        # Connectivity cuts separated in the callback (PreCrush keeps user
+        # cuts valid on the presolved model)
+        m.setParam('LazyConstraints', 1)
+        m.setParam('PreCrush', 1)
+        callback = ConnectivityCuts(n_nodes, edges, required_nodes, z.tolist(), expand)
+
+    # Minimum sparsity constraint
+    min_bars = max(1, int(min_bar_ratio * n_edges))
+    min_bars_constr = m.addConstr(np.asarray(expand.sum(axis=0)).ravel() @ z >= min_bars,
+                                  name="min_bars")
+
+    return m, {'A': A, 'F': F, 'z': z, 'f_fwd': f_fwd, 'f_bwd': f_bwd,
+               'expand': expand, 'callback': callback,
+               'area_scale': area_scale, 'force_scale': force_scale,
+               # Handles for in-place parameter updates (see TrussModel)
+               'eq': eq, 'A_low': A_low, 'min_bars': min_bars_constr,
+               'loads': loads, 'L': L_vars}
+
+
+def governing_forces(case_forces):
+    """Per member, the force of the load case with the largest magnitude"""
+    case_forces = np.atleast_2d(case_forces)
+    worst = np.abs(case_forces).argmax(axis=0)
+    return case_forces[worst, np.arange(case_forces.shape[1])]
+
+
+def solve_physical_truss(nodes, edges, supports, load_node, load_vector,
+                         rho=7850.0, sigma_allow=250e6,
+                         A_min=1e-6, A_max=5e-4,
+                         min_bar_ratio=0.02, length_penalty=0.0,
+                         time_limit=60, mip_gap=1e-3, verbose=False,
+                         mode=MILP, polish=False, load_cases=None, symmetry=False,
+                         connectivity=FLOW, progress=None, trace_memory=False, cache=None):
+    """
+    Physical truss optimization solver
+
+    Parameters:
+    -----------
+    nodes: list of (x,y)
+    edges: list of (i,j) candidate edges (undirected, i<j)
+    supports: list of bool (True if node is fixed support)
+    load_node: index of node with external load
+    load_vector: (Fx,Fy) applied at load_node (N)
+    load_cases: optional list of load cases, each a {node: (Fx,Fy)} dict or a
+        (node, (Fx,Fy)) pair; replaces load_node/load_vector
+    mode: MILP (topology MILP) or MEMBER_ADDING (continuous-area LP by member adding)
+    polish: MEMBER_ADDING only, round the LP and re-solve the MILP on its members
+    symmetry: MILP only, detect reflection symmetry and search mirror-symmetric
+        designs with one variable per orbit of mirrored members
+    connectivity: MILP only, FLOW (flow network) or LAZY_CUTS (cuts separated
+        with union-find in a MIPSOL callback)
+    progress: optional shared.telemetry.SolverProgress receiving the solver
+        progress events of every optimize()
+    trace_memory: add the tracemalloc peak to the timings
+    cache: MILP only, optional shared.model_cache.ModelCache; the built model
+        is written to it and read back instead of rebuilt for the same
+        instance (time_limit, mip_gap and verbose are not part of the key)
+
+    Returns:
+    --------
+    dict with areas, forces (governing case per member), case_forces, z,
+    objective, A_max, symmetry (detected mirror axes), timings (see
+    shared.timings)...
+    """
+    if mode == MEMBER_ADDING:
+        return solve_member_adding(nodes, edges, supports, load_node, load_vector,
+                                   rho=rho, sigma_allow=sigma_allow,
+                                   A_min=A_min, A_max=A_max,
+                                   min_bar_ratio=min_bar_ratio, length_penalty=length_penalty,
+                                   time_limit=time_limit, mip_gap=mip_gap, verbose=verbose,
+                                   polish=polish, load_cases=load_cases, progress=progress,
+                                   trace_memory=trace_memory)
+    if mode != MILP:
+        raise ValueError(f"Unknown solution mode: {mode}")
+
+    timer = PhaseTimer(trace_memory)
+    timer.start(DATA)
+    reduction = None
+    if symmetry:
+        reduction = detect_symmetry(nodes, edges, supports,
+                                    normalize_load_cases(load_node, load_vector, load_cases))
+
+    timer.start(BUILD)
+    loaded = None
+    if cache is not None:
+        cases = normalize_load_cases(load_node, load_vector, load_cases)
+        key = instance_key("physical_truss", nodes, edges, supports, cases, rho, sigma_allow,
+                           A_min, A_max, min_bar_ratio, length_penalty, bool(symmetry), connectivity)
+        loaded = cache.load(key, TimeLimit=float(time_limit), MIPGap=float(mip_gap),
+                            **({} if verbose else {'OutputFlag': 0}))
+    if loaded is not None:
+        m, groups, _ = loaded
+        v = cached_variables(groups, nodes, edges, supports, cases, sigma_allow, A_max,
+                             reduction, connectivity)
+    else:
+        m, v = build_physical_truss(nodes, edges, supports, load_node, load_vector,
+                                    rho=rho, sigma_allow=sigma_allow,
+                                    A_min=A_min, A_max=A_max,
+                                    min_bar_ratio=min_bar_ratio, length_penalty=length_penalty,
+                                    time_limit=time_limit, mip_gap=mip_gap, verbose=verbose,
+                                    load_cases=load_cases, symmetry=reduction,
+                                    connectivity=connectivity)
+        if cache is not None:
+            cache.store(key, m, {name: v[name] for name in ('A', 'F', 'z', 'f_fwd', 'f_bwd')
+                                 if v[name] is not None})
+    timer.record_model(m)
+
+    # Solve
+    timer.start(OPTIMIZE)
+    optimize(m, progress, v['callback'])
+    timer.start(EXTRACT)
+    result = milp_result(m, v, A_max, reduction)
+    result['timings'] = timer.report()
+    return result
+
+
+def cached_variables(groups, nodes, edges, supports, cases, sigma_allow, A_max,
+                     reduction=None, connectivity=FLOW):
+    """
+    Variables dict of build_physical_truss for a model read from a
+    ModelCache, from its MVar groups (without the update handles)
+    """
+    if reduction is not None:
+        expand = reduction.expand
+    else:
+        expand = sp.identity(len(edges), format='csr')
+    callback = None
+    if connectivity == LAZY_CUTS:
+        callback = ConnectivityCuts(len(nodes), edges, connected_nodes(supports, cases),
+                                    groups['z'].tolist(), expand)
+    return {'A': groups['A'], 'F': groups['F'], 'z': groups['z'],
+            'f_fwd': groups.get('f_fwd'), 'f_bwd': groups.get('f_bwd'),
+            'expand': expand, 'callback': callback,
+            'area_scale': A_max, 'force_scale': sigma_allow * A_max}
+
+
+def milp_result(m, v, A_max, reduction=None):
+    """Result dict of a solved physical truss MILP, with orbit values expanded to members"""
+    status = m.Status
+    if status not in (GRB.OPTIMAL, GRB.SUBOPTIMAL, GRB.TIME_LIMIT):
+        raise RuntimeError(f"Solver status {status}")
+
+    # Expand orbit values back to members
+    expand = v['expand']
+    areas = (v['area_scale'] * (expand @ v['A'].X)).tolist()
+    case_forces = v['force_scale'] * (expand @ v['F'].X.T).T
+    zs = (expand @ v['z'].X).tolist()
+    objective = m.ObjVal if m.SolCount > 0 else None
+
+    return {
+        'areas': areas,
+        'forces': governing_forces(case_forces).tolist(),
+        'case_forces': case_forces.tolist(),
+        'z': zs,
+        'objective': objective,
+        'status': status,
+        'A_max': A_max,
+        'model': m,
+        'symmetry': reduction.axes if reduction is not None else [],
+        'lazy_cuts': v['callback'].cuts_added if v['callback'] is not None else 0
+    }
+
+
+# ---------- Member adding (plastic design LP) ----------
+def initial_members(nodes, edges, k=8):
+    """Sparse starting set: candidate members joining a node to one of its k nearest neighbours"""
+    near = set(nearest_edges(nodes, k))
+    return np.array([idx for idx, e in enumerate(edges) if tuple(e) in near], dtype=np.int64)
+
+
+def virtual_strains(B, duals, L, rho, sigma_allow):
+    """
+    Dual virtual strains of all members: |B_k^T u| * sigma / (rho * L_k).
+
+    A member whose strain exceeds 1 would lower the LP objective if added.
+    """
+    cost = rho * L / sigma_allow
+    strain = np.abs(B.T @ duals)
+    return np.divide(strain, cost, out=np.zeros_like(strain), where=cost > 0)
+
+
+def solve_member_adding(nodes, edges, supports, load_node, load_vector,
+                        rho=7850.0, sigma_allow=250e6,
+                        A_min=1e-6, A_max=5e-4,
+                        min_bar_ratio=0.02, length_penalty=0.0,
+                        time_limit=60, mip_gap=1e-3, verbose=False,
+                        polish=False, max_iterations=100, load_cases=None,
+                        progress=None, trace_memory=False):
+    """
+    Continuous-area truss LP solved by member adding (column generation).
+
+    Member k carries tension t+ and compression t- (N), 0 <= t± <= sigma*A_max,
+    with A_k = (t+ + t-) / sigma. The LP minimizes sum(rho*L_k*A_k) subject to
+    B (t+ - t-) = loads. Starting from nearest-neighbour members, each pass
+    adds the omitted members with virtual strain > 1 until none is left, which
+    proves the reduced LP optimal for the whole ground structure. Penalized
+    artificial forces keep every reduced LP feasible so duals always exist.
+
+    With polish=True the LP is rounded (z = 1 on members with A > 0, areas
+    raised to A_min) and used as a start for the MILP restricted to those
+    members, which adds the connectivity, sparsity and length-penalty terms.
+
+    Returns:
+    --------
+    dict like solve_physical_truss, plus 'iterations', 'active_members',
+    'lp_objective' and 'converged': False when max_iterations or the time
+    limit stopped the loop before a pricing pass found no violated member.
+    The LP is then only optimal for the members priced in, and
+    'lp_objective' is an upper bound on the ground-structure optimum.
+    """
+    if gp is None:
+        raise RuntimeError(f"Gurobi not available: {GurobiImportError}")
+    cases = normalize_load_cases(load_node, load_vector, load_cases)
+    if len(cases) > 1:
+        raise ValueError("Member adding supports a single load case; use the MILP mode.")
+
+    start_time = time.perf_counter()
+    timer = PhaseTimer(trace_memory)
+    timer.start(DATA)
+    n_edges = len(edges)
+    geometry = member_geometry(nodes, edges)
+    L = geometry[0]
+    B, free = equilibrium_matrix(nodes, edges, supports, geometry)
+    B = B.tocsc()
+    loads = load_matrix(cases, free)[0]
+
+    cost = rho * L / sigma_allow  # weight per newton of member force
+    t_max = sigma_allow * A_max
+
+    timer.start(BUILD)
+    m = create_model("truss_member_adding", **({} if verbose else {'OutputFlag': 0}))
+
+    # Artificial forces, dearer than any load path through the structure
+    xy = np.asarray(nodes, dtype=float).reshape(-1, 2)
+    span = max(np.ptp(xy[:, 0]) + np.ptp(xy[:, 1]), 1.0)
+    penalty = 1e3 * rho * span / sigma_allow
+    s_pos = m.addMVar(B.shape[0], lb=0.0, name="s_pos")
+    s_neg = m.addMVar(B.shape[0], lb=0.0, name="s_neg")
+
+    active = initial_members(nodes, edges)
+    if not len(active):
+        active = np.arange(min(n_edges, MIN_ADDED))
+    B_active = B[:, active]
+    t_pos = m.addMVar(len(active), lb=0.0, ub=t_max, name="t_pos")
+    t_neg = m.addMVar(len(active), lb=0.0, ub=t_max, name="t_neg")
+    eq = m.addConstr(B_active @ t_pos - B_active @ t_neg + s_pos - s_neg == loads, name="eq")
+    m.setObjective(cost[active] @ t_pos + cost[active] @ t_neg
+                   + penalty * s_pos.sum() + penalty * s_neg.sum(), GRB.MINIMIZE)
+    eq_constrs = eq.tolist()
+    t_pos, t_neg = t_pos.tolist(), t_neg.tolist()
+
+    in_model = np.zeros(n_edges, dtype=bool)
+    in_model[active] = True
+    iterations = 0
+    converged = False
+    while True:
+        iterations += 1
+        m.setParam('TimeLimit', max(0.0, time_limit - (time.perf_counter() - start_time)))
+        timer.start(OPTIMIZE)
+        optimize(m, progress)
+        if m.Status != GRB.OPTIMAL:
+            break
+        if iterations >= max_iterations:
+            break
+
+        # Pricing and new columns count as model building
+        timer.start(BUILD)
+        strain = virtual_strains(B, np.array(m.getAttr('Pi', eq_constrs)), L, rho, sigma_allow)
+        strain[in_model] = 0.0
+        violated = np.flatnonzero(strain > 1.0 + STRAIN_TOLERANCE)
+        if not len(violated):
+            converged = True
+            break
+
+        # Most violated members first
+        limit = max(MIN_ADDED, int(ADD_FRACTION * len(active)))
+        if len(violated) > limit:
+            violated = violated[np.argsort(-strain[violated])[:limit]]
+        for k in violated:
+            col = B.getcol(k)
+            rows = [eq_constrs[r] for r in col.indices]
+            t_pos.append(m.addVar(lb=0.0, ub=t_max, obj=cost[k],
+                                  column=gp.Column(col.data.tolist(), rows)))
+            t_neg.append(m.addVar(lb=0.0, ub=t_max, obj=cost[k],
+                                  column=gp.Column((-col.data).tolist(), rows)))
+        active = np.concatenate([active, violated])
+        in_model[violated] = True
+
+    timer.start(EXTRACT)
+    timer.record_model(m)
+    status = m.Status
+    if status not in (GRB.OPTIMAL, GRB.SUBOPTIMAL, GRB.TIME_LIMIT) or m.SolCount == 0:
+        raise RuntimeError(f"Solver status {status}")
+    if max(s_pos.X.max(initial=0.0), s_neg.X.max(initial=0.0)) > 1e-6 * max(1.0, np.abs(loads).max()):
+        raise RuntimeError("Load cannot be carried by the candidate members (artificial forces remain).")
+
+    tension = np.array(m.getAttr('X', t_pos))
+    compression = np.array(m.getAttr('X', t_neg))
+    areas = np.zeros(n_edges)
+    forces = np.zeros(n_edges)
+    areas[active] = (tension + compression) / sigma_allow
+    forces[active] = tension - compression
+    zs = (areas > 1e-12).astype(float)
+    lp_objective = float(rho * L @ areas)
+
+    result = {
+        'areas': areas.tolist(),
+        'forces': forces.tolist(),
+        'case_forces': [forces.tolist()],
+        'z': zs.tolist(),
+        'objective': lp_objective,
+        'status': status,
+        'A_max': A_max,
+        'model': m,
+        'iterations': iterations,
+        'active_members': len(active),
+        'lp_objective': lp_objective,
+        'converged': converged,
+    }
+    if polish:
+        remaining = max(1.0, time_limit - (time.perf_counter() - start_time))
+        result.update(_polish(nodes, edges, supports, load_node, load_vector, areas, forces,
+                              rho=rho, sigma_allow=sigma_allow, A_min=A_min, A_max=A_max,
+                              min_bar_ratio=min_bar_ratio, length_penalty=length_penalty,
+                              time_limit=remaining, mip_gap=mip_gap, verbose=verbose,
+                              load_cases=cases, progress=progress, timer=timer))
+    result['timings'] = timer.report()
+    return result
+
+
+def _polish(nodes, edges, supports, load_node, load_vector, areas, forces,
+            time_limit, timer, progress=None, **params):
+    """Re-solve the MILP on the members used by the LP, started from the rounded LP"""
+    timer.start(BUILD)
+    used = np.flatnonzero(areas > 1e-12)
+    sub_edges = [edges[k] for k in used]
+    m, v = build_physical_truss(nodes, sub_edges, supports, load_node, load_vector,
+                                time_limit=time_limit, **params)
+    v['z'].Start = np.ones(len(used))
+    v['A'].Start = np.clip(areas[used], params['A_min'], params['A_max']) / v['area_scale']
+    v['F'].Start = forces[used][np.newaxis, :] / v['force_scale']
+    timer.start(OPTIMIZE)
+    optimize(m, progress, v['callback'])
+    timer.start(EXTRACT)
+
+    status = m.Status
+    if status not in (GRB.OPTIMAL, GRB.SUBOPTIMAL, GRB.TIME_LIMIT) or m.SolCount == 0:
+        raise RuntimeError(f"Solver status {status}")
+
+    n_edges = len(edges)
+    full_areas = np.zeros(n_edges)
+    full_forces = np.zeros(n_edges)
+    full_z = np.zeros(n_edges)
+    full_areas[used] = v['area_scale'] * v['A'].X
+    full_forces[used] = v['force_scale'] * v['F'].X[0]
+    full_z[used] = v['z'].X
+    return {
+        'areas': full_areas.tolist(),
+        'forces': full_forces.tolist(),
+        'case_forces': [full_forces.tolist()],
+        'z': full_z.tolist(),
+        'objective': m.ObjVal,
+        'status': status,
+        'model': m,
+    }
@@ -0,0 +1,187 @@
+"""
+Reflection symmetry of truss problems.
+
+A reflection is a symmetry of the problem when it maps the node set onto
+itself, supports onto supports, every load case onto itself (loads mirrored)
+and the candidate members onto candidate members. Members are then grouped
+into orbits under the generated group, so a model can use one variable per
+orbit instead of one per member (mirrored members share areas, forces and
+topology).
+"""
+import numpy as np
+import scipy.sparse as sp
+
+# Mirror axes through the centre of the node bounding box; the diagonals
+# are only tried when the bounding box is square
+VERTICAL = 'vertical'
+HORIZONTAL = 'horizontal'
+DIAGONAL = 'diagonal'
+ANTI_DIAGONAL = 'anti_diagonal'
+
+# Linear part of each reflection, applied to load vectors
+_LINEAR = {
+    VERTICAL: np.array([[-1.0, 0.0], [0.0, 1.0]]),
+    HORIZONTAL: np.array([[1.0, 0.0], [0.0, -1.0]]),
+    DIAGONAL: np.array([[0.0, 1.0], [1.0, 0.0]]),
+    ANTI_DIAGONAL: np.array([[0.0, -1.0], [-1.0, 0.0]]),
+}
+
+
+class TrussSymmetry:
+    """Reflection group of a truss problem and the member orbits it induces"""
+
+    def __init__(self, axes, node_perms, edges):
+        """
+        Args:
+            axes: Names of the generating reflections
+            node_perms: Node permutations of every group element (identity first)
+            edges: Candidate members (i, j), i < j
+        """
+        self.axes = axes
+        self.node_perms = node_perms
+        ends = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        n_edges = len(ends)
+
+        # Image of every member under every group element, and whether the
+        # image is traversed j -> i (tail mapped onto the higher index)
+        images = np.empty((len(node_perms), n_edges), dtype=np.int64)
+        flipped = np.empty((len(node_perms), n_edges), dtype=bool)
+        for g, perm in enumerate(node_perms):
+            images[g], flipped[g] = _map_edges(perm, ends)
+
+        # Orbit representative: smallest member index in the orbit
+        rep = images.min(axis=0)
+        _, self.orbit = np.unique(rep, return_inverse=True)
+        self.n_orbits = int(self.orbit.max()) + 1 if n_edges else 0
+        self.sizes = np.bincount(self.orbit, minlength=self.n_orbits)
+
+        # Orientation relative to the representative: the first group element
+        # mapping the member onto its representative tells whether it is flipped
+        first = (images == rep[np.newaxis, :]).argmax(axis=0)
+        flip = flipped[first, np.arange(n_edges)]
+        rows = np.arange(n_edges)
+        self.same = sp.csr_matrix((np.ones(int((~flip).sum())), (rows[~flip], self.orbit[~flip])),
+                                  shape=(n_edges, self.n_orbits))
+        self.flip = sp.csr_matrix((np.ones(int(flip.sum())), (rows[flip], self.orbit[flip])),
+                                  shape=(n_edges, self.n_orbits))
+        # Member values from orbit values: x = expand @ x_orbit
+        self.expand = (self.same + self.flip).tocsr()
+
+        fixed = np.ones(len(node_perms[0]), dtype=bool)
+        for perm in node_perms:
+            fixed &= perm == np.arange(len(perm))
+        self.fixed_nodes = fixed
+
+    @property
+    def order(self):
+        """Number of group elements"""
+        return len(self.node_perms)
+
+
+def _map_edges(perm, ends):
+    """Indices of the images of members (i, j) under a node permutation (-1 if not a member)"""
+    n = len(perm)
+    keys = ends[:, 0] * n + ends[:, 1]
+    order = np.argsort(keys)
+    mapped = perm[ends]
+    flipped = mapped[:, 0] > mapped[:, 1]
+    mapped.sort(axis=1)
+    mapped_keys = mapped[:, 0] * n + mapped[:, 1]
+    pos = np.searchsorted(keys, mapped_keys, sorter=order)
+    pos = np.minimum(pos, len(keys) - 1)
+    found = keys[order[pos]] == mapped_keys
+    return np.where(found, order[pos], -1), flipped
+
+
+def _reflect(xy, axis, center):
+    d = xy - center
+    if axis == VERTICAL:
+        d = d * [-1.0, 1.0]
+    elif axis == HORIZONTAL:
+        d = d * [1.0, -1.0]
+    elif axis == DIAGONAL:
+        d = d[:, ::-1]
+    else:
+        d = -d[:, ::-1]
+    return center + d
+
+
+def _node_permutation(xy, mirrored, tol):
+    """Permutation sending each node to the node at its mirrored position, or None"""
+    index = {tuple(k): i for i, k in enumerate(np.round(xy / tol).astype(np.int64).tolist())}
+    if len(index) != len(xy):
+        return None
+    perm = [index.get(tuple(k)) for k in np.round(mirrored / tol).astype(np.int64).tolist()]
+    if any(p is None for p in perm):
+        return None
+    return np.array(perm, dtype=np.int64)
+
+
+def _preserves(perm, axis, supports, cases, ends, tol):
+    supports = np.asarray(supports, dtype=bool)
+    if not np.array_equal(supports[perm], supports):
+        return False
+    R = _LINEAR[axis]
+    for case in cases:
+        if {int(perm[v]) for v in case} != set(case):
+            return False
+        for v, vec in case.items():
+            if not np.allclose(R @ np.asarray(vec, dtype=float),
+                               case[int(perm[v])], atol=tol * max(1.0, np.abs(vec).max())):
+                return False
+    return len(ends) == 0 or bool((_map_edges(perm, ends)[0] >= 0).all())
+
+
+def _closure(perms):
+    """All compositions of the generator permutations, identity first"""
+    n = len(perms[0]) if perms else 0
+    group = {tuple(range(n)): np.arange(n)}
+    frontier = list(group.values())
+    while frontier:
+        new = []
+        for g in frontier:
+            for h in perms:
+                gh = g[h]
+                key = tuple(gh.tolist())
+                if key not in group:
+                    group[key] = gh
+                    new.append(gh)
+        frontier = new
+    return list(group.values())
+
+
+def detect_symmetry(nodes, edges, supports, cases, tol=1e-6):
+    """
+    Reflection symmetries of a truss problem.
+
+    Args:
+        nodes: List of (x, y)
+        edges: Candidate members (i, j), i < j
+        supports: List of bool
+        cases: Load cases as {node: (Fx, Fy)} dicts
+        tol: Coordinate matching tolerance
+
+    Returns:
+        TrussSymmetry, or None when no reflection leaves the problem unchanged
+    """
+    xy = np.asarray(nodes, dtype=float).reshape(-1, 2)
+    if len(xy) < 2:
+        return None
+    ends = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    lo, hi = xy.min(axis=0), xy.max(axis=0)
+    center = (lo + hi) / 2
+    axes = [VERTICAL, HORIZONTAL]
+    if np.isclose(hi[0] - lo[0], hi[1] - lo[1], atol=tol):
+        axes += [DIAGONAL, ANTI_DIAGONAL]
+
+    found, perms = [], []
+    for axis in axes:
+        perm = _node_permutation(xy, _reflect(xy, axis, center), tol)
+        if perm is None or (perm == np.arange(len(xy))).all():
+            continue
+        if _preserves(perm, axis, supports, cases, ends, tol):
+            found.append(axis)
+            perms.append(perm)
+    if not found:
+        return None
+    return TrussSymmetry(found, _closure(perms), edges)
@@ -0,0 +1,256 @@
+"""
+Solver backends for linear models in matrix form.
+
+A LinearModel holds a MILP as SciPy sparse data:
+
+    minimize / maximize   c x + constant
+    subject to            row_lb <= A x <= row_ub
+                          lb <= x <= ub, x integer where flagged
+
+Variables are added by blocks (add_vars returns their column indices) and
+constraints by sparse row blocks over all columns. The same model can be
+solved by HiGHS through scipy.optimize.milp, which needs no license and
+has no size limit, or by Gurobi through the matrix API.
+"""
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import Bounds, LinearConstraint, milp
+
+from shared.telemetry import DONE
+
+try:
+    import gurobipy as gp
+    from gurobipy import GRB
+    GUROBI_AVAILABLE = True
+except ImportError:
+    gp = None
+    GRB = None
+    GUROBI_AVAILABLE = False
+
+# Backends
+GUROBI = 'gurobi'
+HIGHS = 'highs'
+
+# Objective senses
+MINIMIZE = 1
+MAXIMIZE = -1
+
+# Solution statuses
+OPTIMAL = 'optimal'
+FEASIBLE = 'feasible'        # stopped early (time limit...) with a solution
+INFEASIBLE = 'infeasible'
+NO_SOLUTION = 'no_solution'  # stopped without a solution, unbounded or failed
+
+
+def default_backend():
+    """Gurobi when gurobipy is installed, HiGHS otherwise"""
+    return GUROBI if GUROBI_AVAILABLE else HIGHS
+
+
+class LinearSolution:
+    """Result of LinearModel.solve"""
+
+    def __init__(self, backend, status, x=None, objective=None, bound=None,
+                 runtime=0.0, message=''):
+        self.backend = backend
+        self.status = status
+        self.x = x
+        self.objective = objective
+        self.bound = bound
+        self.runtime = runtime
+        self.message = message
+
+    @property
+    def has_solution(self):
+        return self.x is not None
+
+    @property
+    def gap(self):
+        if self.objective is None or self.bound is None:
+            return None
+        if self.objective == 0:
+            return 0.0 if self.bound == 0 else None
+        return abs(self.objective - self.bound) / abs(self.objective)
+
+
+class LinearModel:
+    """MILP in matrix form, solved by HiGHS or Gurobi"""
+
+    def __init__(self, name='model', sense=MINIMIZE):
+        self.name = name
+        self.sense = sense
+        self.constant = 0.0  # objective constant
+        self._lb, self._ub, self._integer, self._obj = [], [], [], []
+        self._blocks = []  # (A, row_lb, row_ub), A over the columns existing when added
+        self.num_vars = 0
+        self.num_rows = 0
+
+    def add_vars(self, n, lb=0.0, ub=np.inf, integer=False, obj=0.0):
+        """
+        Add n variables.
+
+        Returns:
+            Array of their column indices
+        """
+        self._lb.append(np.broadcast_to(np.asarray(lb, dtype=float), (n,)))
+        self._ub.append(np.broadcast_to(np.asarray(ub, dtype=float), (n,)))
+        self._integer.append(np.full(n, bool(integer)))
+        self._obj.append(np.broadcast_to(np.asarray(obj, dtype=float), (n,)).copy())
+        idx = np.arange(self.num_vars, self.num_vars + n)
+        self.num_vars += n
+        return idx
+
+    def add_binary(self, n, obj=0.0):
+        return self.add_vars(n, 0.0, 1.0, integer=True, obj=obj)
+
+    def add_constrs(self, A, lb=-np.inf, ub=np.inf):
+        """
+        Add rows lb <= A x <= ub.
+
+        Args:
+            A: Sparse matrix with one row per constraint, columns indexed by
+               the variable indices (it may have fewer columns than the model)
+            lb, ub: Row bounds, scalars or arrays
+        """
+        A = sp.csr_matrix(A)
+        n_rows = A.shape[0]
+        if n_rows == 0:
+            return
+        lb = np.broadcast_to(np.asarray(lb, dtype=float), (n_rows,))
+        ub = np.broadcast_to(np.asarray(ub, dtype=float), (n_rows,))
+        self._blocks.append((A, lb, ub))
+        self.num_rows += n_rows
+
+    def objective_vector(self):
+        return np.concatenate(self._obj) if self._obj else np.zeros(0)
+
+    def matrix(self):
+        """Constraint matrix (csr) and row bounds over all columns"""
+        if not self._blocks:
+            return sp.csr_matrix((0, self.num_vars)), np.zeros(0), np.zeros(0)
+        blocks = []
+        for A, _, _ in self._blocks:
+            if A.shape[1] < self.num_vars:
+                A = sp.hstack([A, sp.csr_matrix((A.shape[0], self.num_vars - A.shape[1]))])
+            blocks.append(A)
+        return (sp.vstack(blocks, format='csr'),
+                np.concatenate([b[1] for b in self._blocks]),
+                np.concatenate([b[2] for b in self._blocks]))
+
+    def sizes(self):
+        """Rows, columns and nonzeros, as in the timings block"""
+        return {'rows': self.num_rows, 'cols': self.num_vars,
+                'nonzeros': int(sum(A.nnz for A, _, _ in self._blocks))}
+
+    def solve(self, backend=None, time_limit=None, mip_gap=None, verbose=False, progress=None):
+        """
+        Args:
+            backend: HIGHS, GUROBI or None (default_backend())
+            time_limit: Seconds, None for no limit
+            mip_gap: Relative MIP gap, None for the backend default
+            progress: Optional shared.telemetry.SolverProgress; HiGHS has no
+                progress callback through SciPy, so it only gets the final event
+
+        Returns:
+            LinearSolution
+        """
+        backend = backend or default_backend()
+        if backend == HIGHS:
+            solution = self._solve_highs(time_limit, mip_gap, verbose)
+            if progress is not None:
+                progress.emit(self._done_event(solution))
+            return solution
+        if backend == GUROBI:
+            return self._solve_gurobi(time_limit, mip_gap, verbose, progress)
+        raise ValueError(f"Unknown backend: {backend}")
+
+    def _solve_highs(self, time_limit, mip_gap, verbose):
+        A, row_lb, row_ub = self.matrix()
+        integrality = np.concatenate(self._integer).astype(np.uint8) if self._integer else None
+        options = {'disp': verbose}
+        if time_limit is not None:
+            options['time_limit'] = float(time_limit)
+        if mip_gap is not None:
+            options['mip_rel_gap'] = float(mip_gap)
+        constraints = [LinearConstraint(A, row_lb, row_ub)] if A.shape[0] else []
+
+        start = time.perf_counter()
+        res = milp(self.sense * self.objective_vector(), integrality=integrality,
+                   bounds=Bounds(np.concatenate(self._lb), np.concatenate(self._ub)),
+                   constraints=constraints, options=options)
+        runtime = time.perf_counter() - start
+
+        # scipy status: 0 optimal, 1 time/iteration limit, 2 infeasible, 3 unbounded, 4 other
+        x = res.x
+        objective = bound = None
+        if x is not None:
+            objective = self.sense * float(res.fun) + self.constant
+            dual = getattr(res, 'mip_dual_bound', None)
+            bound = self.sense * float(dual) + self.constant if dual is not None else objective
+        if res.status == 0:
+            status = OPTIMAL
+        elif res.status == 2:
+            status = INFEASIBLE
+        else:
+            status = FEASIBLE if x is not None else NO_SOLUTION
+        return LinearSolution(HIGHS, status, x, objective, bound, runtime, res.message)
+
+    def to_gurobi(self, env=None):
+        """Gurobi model of this LinearModel and its MVar (on the pooled env if env is None)"""
+        if gp is None:
+            raise RuntimeError("Gurobi not available")
+        from shared.gurobi_utils import create_model
+
+        m = gp.Model(self.name, env=env) if env is not None else create_model(self.name)
+        vtype = np.where(np.concatenate(self._integer), GRB.INTEGER, GRB.CONTINUOUS) \
+            if self._integer else []
+        x = m.addMVar(self.num_vars, lb=np.concatenate(self._lb), ub=np.concatenate(self._ub),
+                      vtype=vtype, obj=self.objective_vector(), name="x")
+        m.ObjCon = self.constant
+        m.ModelSense = GRB.MINIMIZE if self.sense == MINIMIZE else GRB.MAXIMIZE
+        A, row_lb, row_ub = self.matrix()
+        equal = row_lb == row_ub
+        upper = ~equal & np.isfinite(row_ub)
+        lower = ~equal & np.isfinite(row_lb)
+        if equal.any():
+            m.addConstr(A[equal] @ x == row_ub[equal], name="eq")
+        if upper.any():
+            m.addConstr(A[upper] @ x <= row_ub[upper], name="ub")
+        if lower.any():
+            m.addConstr(A[lower] @ x >= row_lb[lower], name="lb")
+        return m, x
+
+    def _solve_gurobi(self, time_limit, mip_gap, verbose, progress):
+        from shared.gurobi_utils import optimize
+
+        m, x = self.to_gurobi()
+        if not verbose:
+            m.setParam('OutputFlag', 0)
+        if time_limit is not None:
+            m.setParam('TimeLimit', float(time_limit))
+        if mip_gap is not None:
+            m.setParam('MIPGap', float(mip_gap))
+        optimize(m, progress)
+
+        values = x.X if m.SolCount > 0 else None
+        objective = bound = None
+        if values is not None:
+            objective = m.ObjVal
+            bound = m.ObjBound if m.IsMIP else objective
+        if m.Status == GRB.OPTIMAL:
+            status = OPTIMAL
+        elif m.Status in (GRB.INFEASIBLE, GRB.INF_OR_UNBD):
+            status = INFEASIBLE
+        else:
+            status = FEASIBLE if values is not None else NO_SOLUTION
+        solution = LinearSolution(GUROBI, status, values, objective, bound, m.Runtime,
+                                  f"Gurobi status {m.Status}")
+        m.dispose()
+        return solution
+
+    def _done_event(self, solution):
+        return {'model': self.name, 'phase': DONE, 'time': round(solution.runtime, 4),
+                'incumbent': solution.objective, 'bound': solution.bound,
+                'gap': solution.gap, 'nodes': None, 'status': solution.status}
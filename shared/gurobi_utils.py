@@ -1,7 +1,190 @@
-import gurobipy as gp
+"""
+Gurobi helpers shared by the solvers.
+
+Models are created on pooled environments: every thread takes one gp.Env
+on its first model and reuses it for all the models it builds, so a solve
+does not re-read the license or start a new environment. When the thread
+ends, its environment goes back to the pool for the next thread (models
+kept from a finished thread must not be solved at the same time as the
+new owner's). close_envs() disposes of them all (also done at exit).
+
+Parameters come from three levels, the last one winning:
+
+    solver defaults   create_model(name, defaults={'MIPGap': 0.01, 'TimeLimit': 30})
+    shared profile    set_profile(MIPGap=0.05, OutputFlag=0)
+    explicit params   create_model(name, TimeLimit=time_limit)
+
+The profile's Threads entry is a thread budget rather than a parameter:
+optimize() splits it between the solves running at the same time, so
+concurrent solves do not oversubscribe the cores.
+
+set_starts() hands heuristic solutions to a model as MIP starts, so that
+the solve begins with an incumbent.
+"""
+import atexit
+import os
+import threading
+import weakref
+
+import numpy as np
+
+try:
+    import gurobipy as gp
+except ImportError:
+    gp = None
+
+# Shared parameter profile, see set_profile()
+_profile = {}
+
+_OUTPUT_PARAMS = ('OutputFlag', 'LogToConsole')
+
+# Total thread budget of the running solves (Threads in the profile overrides it)
+DEFAULT_THREADS = os.cpu_count() or 1
+
+_local = threading.local()
+_lock = threading.Lock()
+_envs = []   # every pooled environment
+_idle = []   # environments of finished threads
+_running = 0
+
+
+def set_profile(**params):
+    """
+    Set parameters of the shared profile, applied to every model created
+    afterwards over the solver defaults (e.g. MIPGap=0.05, TimeLimit=10,
+    OutputFlag=0). Threads sets the thread budget. A None value removes
+    the entry.
+    """
+    for name, value in params.items():
+        if value is None:
+            _profile.pop(name, None)
+        else:
+            _profile[name] = value
+
+
+def get_profile():
+    return dict(_profile)
+
+
+def resolve_params(defaults=None, **params):
+    """Solver defaults, overridden by the profile (except Threads), then by params"""
+    resolved = dict(defaults or {})
+    resolved.update((name, value) for name, value in _profile.items() if name != 'Threads')
+    resolved.update(params)
+    return resolved
+
+
+def thread_budget():
+    return int(_profile.get('Threads') or DEFAULT_THREADS)
+
+
+def get_env():
+    """The calling thread's pooled environment, taken from the pool on first use"""
+    env = getattr(_local, 'env', None)
+    if env is None:
+        with _lock:
+            env = _idle.pop() if _idle else None
+        if env is None:
+            env = gp.Env()
+            with _lock:
+                _envs.append(env)
+        _local.env = env
+        weakref.finalize(threading.current_thread(), _release, env)
+    return env
+
+
+def _release(env):
+    with _lock:
+        if any(e is env for e in _envs):
+            _idle.append(env)
+
+
+def close_envs():
+    """Dispose of the pooled environments (their models must be gone)"""
+    with _lock:
+        envs = list(_envs)
+        _envs.clear()
+        _idle.clear()
+    for env in envs:
+        env.dispose()
+    _local.__dict__.pop('env', None)
+
+
+atexit.register(close_envs)
+
+
+def create_model(name="optimization_model", defaults=None, **params):
+    """
+    Gurobi model on the calling thread's pooled environment.
+
+    Args:
+        name: Model name
+        defaults: Solver default parameters, overridden by the shared profile
+        params: Parameters set as given, over the profile
+    """
+    model = gp.Model(name, env=get_env())
+    set_params(model, resolve_params(defaults, **params))
+    return model
+
+
+def set_params(model, params):
+    """Set a dict of parameters, output ones first so that they also silence the others"""
+    for param in sorted(params, key=lambda p: p not in _OUTPUT_PARAMS):
+        model.setParam(param, params[param])
+
+
+def set_starts(model, variables, starts):
+    """
+    MIP starts of a model.
+
+    Args:
+        model: Gurobi model
+        variables: MVar or list of Vars
+        starts: Arrays of values in the order of variables (flattened), one
+            per start; NaN leaves a variable out of a start, which Gurobi
+            then completes (partial start). Several starts use NumStart.
+    """
+    if hasattr(variables, 'tolist'):
+        variables = np.array(variables.tolist(), dtype=object).ravel().tolist()
+    starts = [np.asarray(start, dtype=float).ravel() for start in starts]
+    if not starts:
+        return
+    model.NumStart = len(starts)
+    for number, start in enumerate(starts):
+        model.Params.StartNumber = number
+        model.setAttr('Start', variables, np.where(np.isnan(start), gp.GRB.UNDEFINED, start).tolist())
+    model.Params.StartNumber = 0
 
-def create_model(name="optimization_model"):
-    return gp.Model(name)
 
 def suppress_gurobi_output(model):
     model.setParam("OutputFlag", 0)
+
+
+def optimize(model, progress=None, callback=None):
+    """
+    model.optimize(callback), reporting to a SolverProgress when one is given.
+
+    Threads is set to this solve's share of the thread budget: the budget
+    divided by the number of solves running, this one included (a Threads
+    value set on the model lowers it further). Solves already running keep
+    the share they started with.
+    """
+    global _running
+    with _lock:
+        _running += 1
+        share = max(1, thread_budget() // _running)
+    # Threads set before the first optimize(); later ones see the share set here
+    if not hasattr(model, '_threads'):
+        model._threads = model.Params.Threads
+    if model._threads > 0:
+        share = min(share, model._threads)
+    model.setParam('Threads', share)
+    try:
+        if progress is None:
+            model.optimize(callback)
+            return
+        model.optimize(progress.chain(callback))
+        progress.finish(model)
+    finally:
+        with _lock:
+            _running -= 1
@@ -0,0 +1,167 @@
+"""
+Level-of-detail rendering for large matplotlib plots.
+
+A ViewportLayer owns one group of points on an Axes and re-renders it every
+time the view limits change:
+- only the points inside the current viewport are handed to the renderer,
+- when too many points are visible they are binned into a density image
+  (datashader-style, plain NumPy) instead of being drawn one by one,
+- labels are only created once the view is zoomed in far enough.
+"""
+import numpy as np
+from matplotlib.colors import LinearSegmentedColormap, LogNorm, to_rgba
+from matplotlib.image import AxesImage
+
+# Beyond this many visible points a layer switches to a density image
+DENSITY_THRESHOLD = 20000
+
+# Labels are only drawn when at most this many points are visible
+LABEL_THRESHOLD = 150
+
+# Screen pixels covered by one density bin
+PIXELS_PER_BIN = 3
+
+
+def visible_mask(xy, xlim, ylim):
+    """Boolean mask of the points of an (n, 2) array lying inside the limits"""
+    x0, x1 = sorted(xlim)
+    y0, y1 = sorted(ylim)
+    return ((xy[:, 0] >= x0) & (xy[:, 0] <= x1) &
+            (xy[:, 1] >= y0) & (xy[:, 1] <= y1))
+
+
+def density_grid(xy, xlim, ylim, shape):
+    """Count points per bin over the given limits, returned as a (ny, nx) grid"""
+    nx, ny = shape
+    counts, _, _ = np.histogram2d(xy[:, 1], xy[:, 0], bins=(ny, nx),
+                                  range=[sorted(ylim), sorted(xlim)])
+    return counts
+
+
+def enable_scroll_zoom(canvas, factor=1.25):
+    """Zoom the axes under the cursor with the mouse wheel"""
+    def on_scroll(event):
+        ax = event.inaxes
+        if ax is None or event.xdata is None or event.ydata is None:
+            return
+        scale = 1 / factor if event.button == 'up' else factor
+        x0, x1 = ax.get_xlim()
+        y0, y1 = ax.get_ylim()
+        ax.set_xlim(event.xdata - (event.xdata - x0) * scale,
+                    event.xdata + (x1 - event.xdata) * scale)
+        ax.set_ylim(event.ydata - (event.ydata - y0) * scale,
+                    event.ydata + (y1 - event.ydata) * scale)
+        canvas.draw_idle()
+
+    return canvas.mpl_connect('scroll_event', on_scroll)
+
+
+class ViewportLayer:
+    """Points (and optional labels) re-rendered for the visible viewport only"""
+
+    def __init__(self, ax, xy, sizes=None, colors=None, labels=None,
+                 label_kwargs=None, density_color=None, points=True,
+                 density_threshold=DENSITY_THRESHOLD,
+                 label_threshold=LABEL_THRESHOLD, **scatter_kwargs):
+        """
+        Args:
+            ax: Axes to draw on
+            xy: Point coordinates, array-like of shape (n, 2)
+            sizes: Per-point marker sizes (optional)
+            colors: Per-point colors, array of shape (n, 4) (optional)
+            labels: Per-point label strings (optional)
+            label_kwargs: Keyword arguments forwarded to ax.annotate
+            density_color: Color of the density image; None disables it
+            points: False for a labels-only layer
+            **scatter_kwargs: Static keyword arguments forwarded to ax.scatter
+        """
+        self.ax = ax
+        self.xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+        self.sizes = None if sizes is None else np.asarray(sizes, dtype=float)
+        self.colors = None if colors is None else np.asarray(colors, dtype=float)
+        self.labels = labels
+        self.label_kwargs = label_kwargs or {}
+        self.density_threshold = density_threshold
+        self.label_threshold = label_threshold
+        self.zorder = scatter_kwargs.get('zorder', 2)
+
+        self.density_cmap = None
+        if density_color is not None:
+            rgba = to_rgba(density_color)
+            self.density_cmap = LinearSegmentedColormap.from_list(
+                'density', [rgba[:3] + (0.25,), rgba[:3] + (1.0,)])
+
+        # The scatter is created with every point so that data limits and the
+        # legend handle see the full layer; update() then trims it to the view.
+        self.scatter = None
+        if points:
+            if self.sizes is not None:
+                scatter_kwargs['s'] = self.sizes
+            if self.colors is not None:
+                scatter_kwargs['c'] = self.colors
+            self.scatter = ax.scatter(self.xy[:, 0], self.xy[:, 1], **scatter_kwargs)
+        elif len(self.xy):
+            ax.update_datalim(self.xy)
+
+        self._image = None
+        self._annotations = []
+        self.update()
+
+        # Plain closures are held strongly by the callback registry, which
+        # keeps the layer alive as long as its Axes.
+        ax.callbacks.connect('xlim_changed', lambda _ax: self.update())
+        ax.callbacks.connect('ylim_changed', lambda _ax: self.update())
+
+    def update(self):
+        """Re-render the layer for the current view limits"""
+        xlim, ylim = self.ax.get_xlim(), self.ax.get_ylim()
+        mask = visible_mask(self.xy, xlim, ylim)
+        count = int(mask.sum())
+
+        self._clear()
+
+        if self.scatter is not None:
+            if self.density_cmap is not None and count > self.density_threshold:
+                self.scatter.set_offsets(np.empty((0, 2)))
+                self._draw_density(self.xy[mask], xlim, ylim)
+            else:
+                self._draw_points(mask)
+
+        if self.labels is not None and count <= self.label_threshold:
+            self._draw_labels(np.flatnonzero(mask))
+
+    def _clear(self):
+        if self._image is not None:
+            self._image.remove()
+            self._image = None
+        for annotation in self._annotations:
+            annotation.remove()
+        self._annotations = []
+
+    def _draw_points(self, mask):
+        self.scatter.set_offsets(self.xy[mask])
+        if self.sizes is not None:
+            self.scatter.set_sizes(self.sizes[mask])
+        if self.colors is not None:
+            self.scatter.set_facecolor(self.colors[mask])
+
+    def _draw_density(self, xy, xlim, ylim):
+        bbox = self.ax.bbox
+        shape = (max(1, int(bbox.width / PIXELS_PER_BIN)),
+                 max(1, int(bbox.height / PIXELS_PER_BIN)))
+        counts = density_grid(xy, xlim, ylim, shape)
+
+        # AxesImage is built directly: imshow/set_extent would autoscale the view
+        # and feed back into the limit callbacks.
+        self._image = AxesImage(self.ax, cmap=self.density_cmap,
+                                norm=LogNorm(vmin=1, vmax=max(2.0, counts.max())),
+                                origin='lower', interpolation='nearest',
+                                extent=(*sorted(xlim), *sorted(ylim)))
+        self._image.set_data(np.ma.masked_equal(counts, 0))
+        self._image.set_zorder(self.zorder)
+        self.ax.add_image(self._image)
+
+    def _draw_labels(self, indices):
+        for i in indices:
+            self._annotations.append(
+                self.ax.annotate(self.labels[i], xy=tuple(self.xy[i]), **self.label_kwargs))
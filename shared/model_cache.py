@@ -0,0 +1,139 @@
+"""
+On-disk cache of built Gurobi models.
+
+Assembling a large model in Python can take longer than solving it. A
+ModelCache writes a built model under a key hashed from the instance data,
+and repeat runs on the same instance read it back with gp.read instead of
+rebuilding it. Every entry has three files:
+
+    <key>.mps.bz2   the model (variables, constraints, objective and sense)
+    <key>.prm       the parameters it was built with
+    <key>.json      variable-index map and metadata (model name, sizes,
+                    Gurobi and Python versions, creation date)
+
+The variable-index map gives, for every named group of variables (e.g.
+'x', 'y'), its shape and column indices, so a reloaded model hands back the
+same groups as MVars. The three files are also a self-contained
+reproduction of a solve for bug reports: gp.read('<key>.mps.bz2') with
+the .prm parameters gives the model exactly as the solver built it.
+"""
+import datetime
+import hashlib
+import json
+import os
+import platform
+
+import numpy as np
+
+from shared.gurobi_utils import get_env, resolve_params, set_params
+
+try:
+    import gurobipy as gp
+except ImportError:
+    gp = None
+
+# Bump when the layout of the cached files changes
+CACHE_FORMAT = 1
+
+
+def _jsonable(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if hasattr(value, 'toarray'):  # scipy sparse matrix
+        return value.toarray().tolist()
+    raise TypeError(f"Cannot hash {type(value).__name__}")
+
+
+def instance_key(name, *data):
+    """
+    Hash of a model name and the instance data it is built from (lists,
+    dicts, numbers, strings, NumPy arrays); infinite and NaN values allowed
+    """
+    payload = json.dumps([CACHE_FORMAT, name, data], sort_keys=True, default=_jsonable)
+    return f"{name}-{hashlib.sha256(payload.encode()).hexdigest()[:20]}"
+
+
+def _group_indices(group):
+    """Shape and column indices of an MVar or a (nested) list of Vars"""
+    items = np.array(group.tolist() if hasattr(group, 'tolist') else group, dtype=object)
+    return list(items.shape), [var.index for var in items.ravel()]
+
+
+class ModelCache:
+    """Built models stored in a directory, keyed by instance_key()"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key, ext):
+        return os.path.join(self.directory, key + ext)
+
+    def __contains__(self, key):
+        return all(os.path.exists(self._path(key, ext)) for ext in ('.mps.bz2', '.prm', '.json'))
+
+    def store(self, key, model, variables, **meta):
+        """
+        Write a built model.
+
+        Args:
+            key: instance_key() of the instance
+            model: Gurobi model, built but not necessarily solved
+            variables: Dict of name -> MVar or nested list of Vars
+            meta: Extra JSON metadata (e.g. the solver inputs that are not
+                in the model)
+        """
+        model.update()
+        groups = {}
+        for name, group in variables.items():
+            shape, indices = _group_indices(group)
+            groups[name] = {'shape': shape, 'indices': indices}
+        model.write(self._path(key, '.mps.bz2'))
+        model.write(self._path(key, '.prm'))
+        info = {
+            'format': CACHE_FORMAT,
+            'key': key,
+            'model': model.ModelName,
+            'rows': model.NumConstrs,
+            'cols': model.NumVars,
+            'nonzeros': model.NumNZs,
+            'gurobi': '.'.join(map(str, gp.gurobi.version())),
+            'python': platform.python_version(),
+            'created': datetime.datetime.now().isoformat(timespec='seconds'),
+            'variables': groups,
+            'meta': meta,
+        }
+        with open(self._path(key, '.json'), 'w', encoding='utf-8') as f:
+            json.dump(info, f, default=_jsonable)
+
+    def load(self, key, defaults=None, **params):
+        """
+        Read a cached model on the pooled environment.
+
+        The stored parameters are read first, then the resolved parameters
+        of shared.gurobi_utils (defaults, profile, params) are applied, as
+        create_model() would.
+
+        Returns:
+            (model, variables, meta) with variables as name -> MVar, or None
+            when the key is not cached
+        """
+        if key not in self:
+            return None
+        with open(self._path(key, '.json'), encoding='utf-8') as f:
+            info = json.load(f)
+        if info.get('format') != CACHE_FORMAT:
+            return None
+        model = gp.read(self._path(key, '.mps.bz2'), get_env())
+        model.read(self._path(key, '.prm'))
+        set_params(model, resolve_params(defaults, **params))
+        columns = model.getVars()
+        variables = {
+            name: gp.MVar.fromlist([columns[i] for i in group['indices']]).reshape(group['shape'])
+            for name, group in info['variables'].items()
+        }
+        return model, variables, info['meta']
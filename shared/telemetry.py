@@ -0,0 +1,254 @@
+"""
+Solver progress telemetry.
+
+A SolverProgress object is a Gurobi callback that turns the solver state
+into structured progress events and hands them to pluggable sinks. An event
+is a plain dict:
+
+    {'model': 'Antenna_Placement', 'phase': 'mip', 'time': 1.52,
+     'incumbent': 1234.0, 'bound': 1180.5, 'gap': 0.0434, 'nodes': 310}
+
+incumbent, bound and gap are None while they are unknown. A sink is any
+callable taking an event: RingBufferSink keeps the last events in memory,
+JsonlSink appends them to a JSON-lines file, StatusBarSink shows them in
+a Qt status bar or label and MilestoneSink records the time to the first
+feasible solution and to a target gap.
+"""
+import json
+import time
+from collections import deque
+
+try:
+    from gurobipy import GRB
+except ImportError:
+    GRB = None
+
+# Event phases
+PRESOLVE = 'presolve'
+SIMPLEX = 'simplex'
+MIP = 'mip'
+SOLUTION = 'solution'  # new incumbent (never throttled)
+DONE = 'done'          # end of optimize(), with the final model attributes
+
+# Gurobi reports objective values at or beyond this as "none yet"
+_NO_VALUE = 1e100
+
+
+def _value(x):
+    return None if x is None or abs(x) >= _NO_VALUE else float(x)
+
+
+def relative_gap(incumbent, bound):
+    """Gap |incumbent - bound| / |incumbent| as Gurobi defines it, or None"""
+    if incumbent is None or bound is None:
+        return None
+    if incumbent == 0:
+        return 0.0 if bound == 0 else None
+    return abs(incumbent - bound) / abs(incumbent)
+
+
+class SolverProgress:
+    """Gurobi callback emitting progress events to sinks"""
+
+    def __init__(self, sinks=(), interval=0.5, callback=None):
+        """
+        Args:
+            sinks: Callables receiving every event
+            interval: Minimum time (s) between two presolve/simplex/MIP events
+            callback: Model callback to run before emitting (e.g. lazy cuts)
+        """
+        self.sinks = list(sinks)
+        self.interval = interval
+        self.callback = callback
+        self._last = None
+
+    def chain(self, callback):
+        """Copy of this progress object running callback first (None: self)"""
+        if callback is None:
+            return self
+        return SolverProgress(self.sinks, self.interval, callback)
+
+    def emit(self, event):
+        for sink in self.sinks:
+            sink(event)
+
+    def __call__(self, model, where):
+        if self.callback is not None:
+            self.callback(model, where)
+
+        C = GRB.Callback
+        if where == C.MIPSOL:
+            # MIPSOL_OBJBST may not include the solution being reported yet
+            incumbent = _value(model.cbGet(C.MIPSOL_OBJ))
+            best = _value(model.cbGet(C.MIPSOL_OBJBST))
+            if best is not None and model.ModelSense * (best - incumbent) < 0:
+                incumbent = best
+            bound = _value(model.cbGet(C.MIPSOL_OBJBND))
+            self._emit(model, SOLUTION, model.cbGet(C.RUNTIME), incumbent, bound,
+                       model.cbGet(C.MIPSOL_NODCNT))
+            return
+        if where not in (C.PRESOLVE, C.SIMPLEX, C.MIP):
+            return
+
+        runtime = model.cbGet(C.RUNTIME)
+        if self._last is not None and runtime - self._last < self.interval:
+            return
+        if where == C.MIP:
+            self._emit(model, MIP, runtime, _value(model.cbGet(C.MIP_OBJBST)),
+                       _value(model.cbGet(C.MIP_OBJBND)), model.cbGet(C.MIP_NODCNT))
+        elif where == C.SIMPLEX:
+            self._emit(model, SIMPLEX, runtime, _value(model.cbGet(C.SPX_OBJVAL)), None, None)
+        else:
+            self._emit(model, PRESOLVE, runtime, None, None, None)
+
+    def _emit(self, model, phase, runtime, incumbent, bound, nodes):
+        self._last = runtime
+        self.emit({
+            'model': model.ModelName,
+            'phase': phase,
+            'time': round(float(runtime), 4),
+            'incumbent': incumbent,
+            'bound': bound,
+            'gap': relative_gap(incumbent, bound),
+            'nodes': None if nodes is None else int(nodes),
+        })
+
+    def finish(self, model):
+        """Emit the DONE event of a finished optimize()"""
+        incumbent = _value(model.ObjVal) if model.SolCount > 0 else None
+        bound = None
+        if model.IsMIP:
+            try:
+                bound = _value(model.ObjBound)
+            except AttributeError:
+                pass
+        elif incumbent is not None:
+            bound = incumbent
+        event = {
+            'model': model.ModelName,
+            'phase': DONE,
+            'time': round(float(model.Runtime), 4),
+            'incumbent': incumbent,
+            'bound': bound,
+            'gap': relative_gap(incumbent, bound),
+            'nodes': int(model.NodeCount) if model.IsMIP else None,
+            'status': int(model.Status),
+        }
+        self._last = None
+        self.emit(event)
+
+
+class RingBufferSink:
+    """Keeps the last events in memory"""
+
+    def __init__(self, capacity=1000):
+        self.buffer = deque(maxlen=capacity)
+
+    def __call__(self, event):
+        self.buffer.append(event)
+
+    @property
+    def events(self):
+        return list(self.buffer)
+
+    def clear(self):
+        self.buffer.clear()
+
+
+class JsonlSink:
+    """Appends events to a JSON-lines file, one object per line"""
+
+    def __init__(self, path, run=None):
+        """
+        Args:
+            path: Output file (appended to)
+            run: Optional run label stored in every line, to tell runs apart
+        """
+        self.file = open(path, 'a', encoding='utf-8')
+        self.run = run
+
+    def __call__(self, event):
+        record = dict(event, wall=time.time())
+        if self.run is not None:
+            record['run'] = self.run
+        self.file.write(json.dumps(record) + '\n')
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MilestoneSink:
+    """
+    Time (s, solver runtime) of the first feasible solution and of the first
+    incumbent within a target gap. Backends without a callback (HiGHS) only
+    send the DONE event, whose time then counts for both.
+    """
+
+    def __init__(self, gap=0.01):
+        self.gap = gap
+        self.clear()
+
+    def __call__(self, event):
+        # Simplex events carry the LP objective, not an incumbent
+        if event['incumbent'] is None or event['phase'] == SIMPLEX:
+            return
+        if self.first_solution is None:
+            self.first_solution = event['time']
+            self.first_objective = event['incumbent']
+        if self.time_to_gap is None and event['gap'] is not None and event['gap'] <= self.gap:
+            self.time_to_gap = event['time']
+
+    def clear(self):
+        self.first_solution = None
+        self.first_objective = None
+        self.time_to_gap = None
+
+    def summary(self):
+        return {
+            'first_solution': self.first_solution,
+            'first_objective': self.first_objective,
+            'time_to_gap': self.time_to_gap,
+            'gap_target': self.gap,
+        }
+
+
+def format_event(event):
+    """One-line text of an event, for status bars"""
+    parts = [f"{event['model']} [{event['phase']}] {event['time']:.1f}s"]
+    if event['incumbent'] is not None:
+        parts.append(f"incumbent {event['incumbent']:.6g}")
+    if event['bound'] is not None:
+        parts.append(f"bound {event['bound']:.6g}")
+    if event['gap'] is not None:
+        parts.append(f"gap {100 * event['gap']:.2f}%")
+    if event['nodes'] is not None:
+        parts.append(f"{event['nodes']} nodes")
+    return " | ".join(parts)
+
+
+class StatusBarSink:
+    """
+    Shows events in a Qt status bar (showMessage) or label (setText).
+
+    Solves run in the GUI thread, so pending paint events are processed after
+    every message to keep the display live; user input stays queued until the
+    solve returns.
+    """
+
+    def __init__(self, widget):
+        self.show = getattr(widget, 'showMessage', None) or widget.setText
+
+    def __call__(self, event):
+        self.show(format_event(event))
+        try:
+            from PySide6.QtCore import QCoreApplication, QEventLoop
+        except ImportError:
+            return
+        QCoreApplication.processEvents(QEventLoop.ExcludeUserInputEvents)
@@ -0,0 +1,101 @@
+"""
+Phase timings of a solve.
+
+A PhaseTimer measures consecutive phases of a solve: start(name) ends the
+running phase and starts the next one. report() gives the 'timings' block
+every solver adds to its result:
+
+    {'phases': {'data': {'wall': 0.002, 'cpu': 0.002},
+                'build': {...}, 'heuristic': {...}, 'optimize': {...},
+                'extract': {...}},
+     'wall': 1.31, 'cpu': 4.87,
+     'rows': 812, 'cols': 440, 'nonzeros': 2936,
+     'peak_memory': 5242880}
+
+cpu is the process CPU time, Gurobi's worker threads included, so it can
+exceed wall during optimize. Model sizes are only present once a Gurobi
+model was recorded, peak_memory (bytes, tracemalloc) only with
+trace_memory=True.
+"""
+import time
+import tracemalloc
+
+# Solve phases
+DATA = 'data'            # problem data: distances, costs, adjacency...
+BUILD = 'build'          # variables and constraints
+HEURISTIC = 'heuristic'  # heuristic solutions given as MIP starts
+OPTIMIZE = 'optimize'
+EXTRACT = 'extract'      # solution and metrics
+
+
+class PhaseTimer:
+    """Wall and CPU time per phase, model sizes and optional tracemalloc peak"""
+
+    def __init__(self, trace_memory=False):
+        self.phases = {}
+        self.sizes = {}
+        self.trace_memory = trace_memory
+        self._current = None
+        self._started_tracing = False
+        if trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+
+    def start(self, name):
+        """End the running phase and start the named one (times add up on re-entry)"""
+        self.stop()
+        self._current = (name, time.perf_counter(), time.process_time())
+
+    def stop(self):
+        if self._current is None:
+            return
+        name, wall, cpu = self._current
+        self._current = None
+        self.add(name, time.perf_counter() - wall, time.process_time() - cpu)
+
+    def add(self, name, wall, cpu):
+        phase = self.phases.setdefault(name, {'wall': 0.0, 'cpu': 0.0})
+        phase['wall'] += wall
+        phase['cpu'] += cpu
+
+    def include(self, other):
+        """Add the phases measured by another timer (e.g. data built in __init__)"""
+        if other is None:
+            return
+        for name, phase in other.phases.items():
+            self.add(name, phase['wall'], phase['cpu'])
+
+    def record_model(self, model):
+        """
+        Sizes of a Gurobi model: rows, columns and nonzeros (quadratic ones
+        included), or of a shared.backends.LinearModel
+        """
+        if hasattr(model, 'sizes'):
+            self.sizes = model.sizes()
+            return
+        model.update()
+        self.sizes = {
+            'rows': model.NumConstrs + model.NumQConstrs + model.NumGenConstrs,
+            'cols': model.NumVars,
+            'nonzeros': model.NumNZs + model.NumQCNZs,
+        }
+
+    def report(self):
+        """End the running phase and return the timings block"""
+        self.stop()
+        phases = {name: {'wall': round(p['wall'], 6), 'cpu': round(p['cpu'], 6)}
+                  for name, p in self.phases.items()}
+        timings = {
+            'phases': phases,
+            'wall': round(sum(p['wall'] for p in self.phases.values()), 6),
+            'cpu': round(sum(p['cpu'] for p in self.phases.values()), 6),
+        }
+        timings.update(self.sizes)
+        if self.trace_memory:
+            timings['peak_memory'] = tracemalloc.get_traced_memory()[1]
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+        return timings
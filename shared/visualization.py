@@ -1,5 +1,52 @@
-import matplotlib.patches as patches
 import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import EllipseCollection, LineCollection
+from matplotlib.colors import to_rgba
+
+from shared.level_of_detail import ViewportLayer
+
+# Au-delà de ce nombre de points, les marqueurs sont tracés sans contour :
+# le trait blanc double le coût de rastérisation Agg sans rester lisible.
+DENSE_POINTS = 5000
+
+
+def _coords(items, x_key='x', y_key='y', default=None):
+    """Extraire les coordonnées d'une liste de dicts en un tableau (n, 2)"""
+    if default is None:
+        xy = [(item[x_key], item[y_key]) for item in items]
+    else:
+        xy = [(item.get(x_key, default), item.get(y_key, default)) for item in items]
+    return np.asarray(xy, dtype=float).reshape(-1, 2)
+
+
+def _rgba(color, alphas):
+    """Couleurs RGBA (n, 4) d'une teinte unique avec une transparence par point"""
+    rgba = np.tile(to_rgba(color), (len(alphas), 1))
+    rgba[:, 3] = alphas
+    return rgba
+
+
+def _add_circles(ax, centers, radius, colors, fill_alpha, edge_alpha,
+                 linewidth=1, linestyle='-'):
+    """Dessiner des zones de couverture (remplissage + contour) en deux collections"""
+    if len(centers) == 0:
+        return
+    diameters = np.full(len(centers), 2 * radius)
+    common = dict(units='xy', offsets=centers, offset_transform=ax.transData)
+
+    fill = EllipseCollection(diameters, diameters, np.zeros(len(centers)),
+                             facecolors=colors, edgecolors='none',
+                             alpha=fill_alpha, zorder=1, **common)
+    ax.add_collection(fill)
+
+    edge = EllipseCollection(diameters, diameters, np.zeros(len(centers)),
+                             facecolors='none', edgecolors=colors,
+                             linewidths=linewidth, linestyles=linestyle,
+                             alpha=edge_alpha, zorder=1, **common)
+    ax.add_collection(edge)
+
+    # Les collections ne comptent que les centres dans les limites : ajouter les rayons
+    ax.update_datalim(np.vstack([centers - radius, centers + radius]))
 
 
 def plot_mailbox_solution(demand_points, mailbox_locations, coverage_info, radius):
@@ -13,65 +60,65 @@ def plot_mailbox_solution(demand_points, mailbox_locations, coverage_info, radiu
         'uncovered_demand': '#8D99AE'
     }
 
-    demand_x = [p.get('x', 0) for p in demand_points]
-    demand_y = [p.get('y', 0) for p in demand_points]
-    populations = [p.get('population', 1) for p in demand_points]
-    demands = [p.get('demand', 1) for p in demand_points]
-
-    max_pop = max(populations) if populations else 1
-    max_demand = max(demands) if demands else 1
-    demand_sizes = [40 + 200 * (pop/max_pop) for pop in populations]
-    demand_alphas = [0.3 + 0.7 * (d/max_demand) for d in demands]
-
-    covered_indices = [i for i, info in enumerate(coverage_info)
-                      if info.get('coverage_level', 0) > 0]
-    uncovered_indices = [i for i in range(len(demand_points))
-                        if i not in covered_indices]
-
-    if uncovered_indices:
-        unc_x = [demand_x[i] for i in uncovered_indices]
-        unc_y = [demand_y[i] for i in uncovered_indices]
-        unc_sizes = [demand_sizes[i] for i in uncovered_indices]
-        unc_alphas = [demand_alphas[i] for i in uncovered_indices]
-        ax.scatter(unc_x, unc_y, s=unc_sizes, alpha=unc_alphas,
-                  color=colors['uncovered_demand'], edgecolors='white', linewidth=1,
-                  label=f'Uncovered ({len(uncovered_indices)})', zorder=2)
-
-    if covered_indices:
-        cov_x = [demand_x[i] for i in covered_indices]
-        cov_y = [demand_y[i] for i in covered_indices]
-        cov_sizes = [demand_sizes[i] for i in covered_indices]
-        cov_alphas = [demand_alphas[i] for i in covered_indices]
-        ax.scatter(cov_x, cov_y, s=cov_sizes, alpha=cov_alphas,
-                  color=colors['covered_demand'], edgecolors='white', linewidth=1.5,
-                  label=f'Covered ({len(covered_indices)})', zorder=3)
-
-    mailbox_colors = []
-    for i, loc in enumerate(mailbox_locations):
-        if loc.get('built', False):
-            color = plt.cm.RdYlBu(i / max(1, len(mailbox_locations)))
-            mailbox_colors.append(color)
-
-            ax.scatter(loc['x'], loc['y'], s=400, marker='*',
-                      color=color, edgecolors='black', linewidth=2,
-                      label=f'Mailbox {i+1}' if i == 0 else "", zorder=5)
-
-            coverage = patches.Circle(
-                (loc['x'], loc['y']), radius,
-                fill=True, alpha=0.15, color=color,
-                linestyle='--', linewidth=1
-            )
-            ax.add_patch(coverage)
-
-            boundary = patches.Circle(
-                (loc['x'], loc['y']), radius,
-                fill=False, alpha=0.8, color=color,
-                linewidth=2, linestyle='-'
-            )
-            ax.add_patch(boundary)
-
+    n_points = len(demand_points)
+    demand_xy = _coords(demand_points, default=0)
+    populations = np.array([p.get('population', 1) for p in demand_points], dtype=float)
+    demands = np.array([p.get('demand', 1) for p in demand_points], dtype=float)
+
+    max_pop = populations.max() if n_points and populations.max() else 1
+    max_demand = demands.max() if n_points and demands.max() else 1
+    demand_sizes = 40 + 200 * (populations / max_pop)
+    demand_alphas = np.clip(0.3 + 0.7 * (demands / max_demand), 0, 1)
+
+    coverage_levels = np.zeros(n_points)
+    for i, info in enumerate(coverage_info[:n_points]):
+        coverage_levels[i] = info.get('coverage_level', 0)
+    covered_mask = coverage_levels > 0
+    num_covered = int(covered_mask.sum())
+    num_uncovered = n_points - num_covered
+
+    dense = n_points > DENSE_POINTS
+    # Réduire les marqueurs des grandes instances pour ne pas repeindre tout le canevas
+    marker_scale = np.sqrt(DENSE_POINTS / n_points) if dense else 1.0
+    demand_sizes *= marker_scale
+
+    # Points rendus par vue : densité quand trop de points sont visibles
+    if num_uncovered:
+        unc = ~covered_mask
+        ViewportLayer(ax, demand_xy[unc], sizes=demand_sizes[unc],
+                      colors=_rgba(colors['uncovered_demand'], demand_alphas[unc]),
+                      density_color=colors['uncovered_demand'],
+                      edgecolors='none' if dense else 'white', linewidth=1,
+                      label=f'Uncovered ({num_uncovered})', zorder=2)
+
+    if num_covered:
+        ViewportLayer(ax, demand_xy[covered_mask], sizes=demand_sizes[covered_mask],
+                      colors=_rgba(colors['covered_demand'], demand_alphas[covered_mask]),
+                      density_color=colors['covered_demand'],
+                      edgecolors='none' if dense else 'white', linewidth=1.5,
+                      label=f'Covered ({num_covered})', zorder=3)
+
+    # Boîtes aux lettres construites (indices d'origine conservés pour served_by)
+    built_idx = np.array([i for i, loc in enumerate(mailbox_locations)
+                          if loc.get('built', False)], dtype=int)
+    mailbox_xy = _coords(mailbox_locations)
+    mailbox_colors = plt.cm.RdYlBu(np.arange(len(mailbox_locations)) /
+                                   max(1, len(mailbox_locations)))
+
+    if len(built_idx):
+        built_xy = mailbox_xy[built_idx]
+        built_colors = mailbox_colors[built_idx]
+
+        ax.scatter(built_xy[:, 0], built_xy[:, 1], s=400, marker='*',
+                  color=built_colors, edgecolors='black', linewidth=2,
+                  label='Mailbox', zorder=5)
+
+        _add_circles(ax, built_xy, radius, built_colors,
+                     fill_alpha=0.15, edge_alpha=0.8, linewidth=2)
+
+        for i in built_idx:
             ax.annotate(f'M{i+1}',
-                       xy=(loc['x'], loc['y']),
+                       xy=tuple(mailbox_xy[i]),
                        xytext=(0, 10),
                        textcoords='offset points',
                        ha='center', va='center',
@@ -82,33 +129,45 @@ def plot_mailbox_solution(demand_points, mailbox_locations, coverage_info, radiu
                                 alpha=0.8,
                                 edgecolor='black'))
 
-    for i, info in enumerate(coverage_info):
-        if info.get('coverage_level', 0) > 1:
-            ax.annotate(f'{int(info["coverage_level"])}',
-                       xy=(demand_x[i], demand_y[i]),
-                       xytext=(5, 5),
-                       textcoords='offset points',
-                       fontsize=8, fontweight='bold',
-                       color='red',
-                       bbox=dict(boxstyle='circle,pad=0.2',
-                                facecolor='white',
-                                alpha=0.8))
-
-    for i, loc in enumerate(mailbox_locations):
-        if loc.get('built', False):
-            for info in coverage_info:
-                if i in info.get('served_by', []):
-                    point_idx = info.get('point', 0)
-                    ax.plot([loc['x'], demand_x[point_idx]],
-                           [loc['y'], demand_y[point_idx]],
-                           color=mailbox_colors[i], alpha=0.3,
-                           linewidth=1, linestyle=':', zorder=1)
-
+    # Niveaux de couverture > 1, étiquetés seulement une fois zoomé
+    multi_idx = np.flatnonzero(coverage_levels > 1)
+    if len(multi_idx):
+        ViewportLayer(ax, demand_xy[multi_idx],
+                      labels=[f'{int(level)}' for level in coverage_levels[multi_idx]],
+                      label_kwargs=dict(xytext=(5, 5),
+                                        textcoords='offset points',
+                                        fontsize=8, fontweight='bold',
+                                        color='red',
+                                        bbox=dict(boxstyle='circle,pad=0.2',
+                                                  facecolor='white',
+                                                  alpha=0.8)),
+                      points=False)
+
+    # Lignes de service : un segment par couple (boîte, point) en une seule collection
+    built_set = set(built_idx.tolist())
+    seg_mailbox, seg_point = [], []
+    for info in coverage_info:
+        point_idx = info.get('point', 0)
+        for k in info.get('served_by', []):
+            if k in built_set:
+                seg_mailbox.append(k)
+                seg_point.append(point_idx)
+
+    if seg_mailbox:
+        seg_mailbox = np.asarray(seg_mailbox, dtype=int)
+        seg_point = np.asarray(seg_point, dtype=int)
+        segments = np.stack([mailbox_xy[seg_mailbox], demand_xy[seg_point]], axis=1)
+        ax.add_collection(LineCollection(segments, colors=mailbox_colors[seg_mailbox],
+                                         alpha=0.3, linewidths=1,
+                                         linestyles='-' if dense else ':',
+                                         zorder=1))
+
+    covered_pct = num_covered / n_points * 100 if n_points else 0.0
     stats_text = f"""
     Statistics:
-    • Total Points: {len(demand_points)}
-    • Covered: {len(covered_indices)} ({len(covered_indices)/len(demand_points)*100:.1f}%)
-    • Mailboxes: {sum(1 for loc in mailbox_locations if loc.get('built', False))}/{len(mailbox_locations)}
+    • Total Points: {n_points}
+    • Covered: {num_covered} ({covered_pct:.1f}%)
+    • Mailboxes: {len(built_idx)}/{len(mailbox_locations)}
     • Radius: {radius:.1f}
     """
 
@@ -129,14 +188,15 @@ def plot_mailbox_solution(demand_points, mailbox_locations, coverage_info, radiu
     ax.set_axisbelow(True)
     ax.set_aspect('equal', adjustable='box')
 
-    all_x = demand_x + [loc['x'] for loc in mailbox_locations if loc.get('built', False)]
-    all_y = demand_y + [loc['y'] for loc in mailbox_locations if loc.get('built', False)]
+    all_xy = np.vstack([demand_xy, mailbox_xy[built_idx]])
 
-    if all_x and all_y:
-        x_padding = max(radius, (max(all_x) - min(all_x)) * 0.1)
-        y_padding = max(radius, (max(all_y) - min(all_y)) * 0.1)
-        ax.set_xlim(min(all_x) - x_padding, max(all_x) + x_padding)
-        ax.set_ylim(min(all_y) - y_padding, max(all_y) + y_padding)
+    if len(all_xy):
+        x_min, y_min = all_xy.min(axis=0)
+        x_max, y_max = all_xy.max(axis=0)
+        x_padding = max(radius, (x_max - x_min) * 0.1)
+        y_padding = max(radius, (y_max - y_min) * 0.1)
+        ax.set_xlim(x_min - x_padding, x_max + x_padding)
+        ax.set_ylim(y_min - y_padding, y_max + y_padding)
 
     handles, labels = ax.get_legend_handles_labels()
     if handles:
@@ -150,64 +210,52 @@ def plot_telecom_solution(nodes, selected_links, demands=None):
     fig, ax = plt.subplots(figsize=(10, 8), dpi=100)
 
     # Tracer les nœuds
-    node_x = [node['x'] for node in nodes]
-    node_y = [node['y'] for node in nodes]
+    node_xy = _coords(nodes)
     node_names = [node['name'] for node in nodes]
 
-    ax.scatter(node_x, node_y, s=300, c='lightblue', edgecolors='darkblue', linewidth=2, zorder=5)
-
-    # Annoter les nœuds
-    for i, (x, y, name) in enumerate(zip(node_x, node_y, node_names)):
-        ax.annotate(f"{name}\n({i})",
-                   xy=(x, y),
-                   xytext=(0, 10),
-                   textcoords='offset points',
-                   ha='center', va='center',
-                   fontsize=9, fontweight='bold',
-                   bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.8))
-
-    # Tracer les liaisons
-    for link in selected_links:
-        if link.get('built', False):
-            from_node = link['from']
-            to_node = link['to']
-
-            # Trouver les coordonnées
-            from_x, from_y = nodes[from_node]['x'], nodes[from_node]['y']
-            to_x, to_y = nodes[to_node]['x'], nodes[to_node]['y']
-
-            # Largeur proportionnelle à la capacité
-            capacity = link.get('capacity', 100)
-            linewidth = 1 + (capacity / 1000) * 3
-
-            # Couleur proportionnelle à l'utilisation
-            utilization = link.get('utilization', 0)
-            if utilization < 0.5:
-                color = 'green'
-            elif utilization < 0.8:
-                color = 'orange'
-            else:
-                color = 'red'
-
-            # Tracer la ligne
-            ax.plot([from_x, to_x], [from_y, to_y],
-                   color=color, linewidth=linewidth, alpha=0.7, zorder=3)
-
-            # Ajouter l'étiquette
-            mid_x = (from_x + to_x) / 2
-            mid_y = (from_y + to_y) / 2
-
-            label = f"{capacity}G\n({utilization*100:.0f}%)"
-            ax.annotate(label,
-                       xy=(mid_x, mid_y),
-                       xytext=(0, 0),
-                       textcoords='offset points',
-                       ha='center', va='center',
-                       fontsize=8,
-                       bbox=dict(boxstyle='round,pad=0.2',
-                                facecolor='white',
-                                alpha=0.8,
-                                edgecolor='gray'))
+    # Nœuds annotés seulement quand peu sont visibles
+    ViewportLayer(ax, node_xy,
+                  labels=[f"{name}\n({i})" for i, name in enumerate(node_names)],
+                  label_kwargs=dict(xytext=(0, 10),
+                                    textcoords='offset points',
+                                    ha='center', va='center',
+                                    fontsize=9, fontweight='bold',
+                                    bbox=dict(boxstyle='round,pad=0.3',
+                                              facecolor='white', alpha=0.8)),
+                  density_color='darkblue',
+                  s=300, c='lightblue', edgecolors='darkblue', linewidth=2, zorder=5)
+
+    # Tracer les liaisons construites en une seule collection
+    built = [link for link in selected_links if link.get('built', False)]
+    if built:
+        ends = np.array([(link['from'], link['to']) for link in built], dtype=int)
+        capacity = np.array([link.get('capacity', 100) for link in built], dtype=float)
+        utilization = np.array([link.get('utilization', 0) for link in built], dtype=float)
+
+        # Largeur proportionnelle à la capacité
+        linewidths = 1 + (capacity / 1000) * 3
+
+        # Couleur proportionnelle à l'utilisation
+        link_colors = np.where(utilization < 0.5, 'green',
+                               np.where(utilization < 0.8, 'orange', 'red'))
+
+        segments = node_xy[ends]
+        ax.add_collection(LineCollection(segments, colors=link_colors.tolist(),
+                                         linewidths=linewidths, alpha=0.7, zorder=3))
+
+        # Étiquettes au milieu des liaisons visibles
+        ViewportLayer(ax, segments.mean(axis=1),
+                      labels=[f"{cap:g}G\n({util*100:.0f}%)"
+                              for cap, util in zip(capacity, utilization)],
+                      label_kwargs=dict(xytext=(0, 0),
+                                        textcoords='offset points',
+                                        ha='center', va='center',
+                                        fontsize=8,
+                                        bbox=dict(boxstyle='round,pad=0.2',
+                                                  facecolor='white',
+                                                  alpha=0.8,
+                                                  edgecolor='gray')),
+                      points=False)
 
     # Configuration du graphique
     ax.set_xlabel('Position X', fontsize=12, fontweight='bold')
@@ -246,82 +294,77 @@ def plot_antenna_solution(users, selected_sites, coverage_radius):
     }
 
     # Tracer les utilisateurs
-    user_x = [u['x'] for u in users]
-    user_y = [u['y'] for u in users]
-    user_demands = [u.get('demand', 1) for u in users]
+    user_xy = _coords(users)
+    user_demands = np.array([u.get('demand', 1) for u in users], dtype=float)
 
     # Taille proportionnelle à la demande
-    max_demand = max(user_demands) if user_demands else 1
-    user_sizes = [20 + 80 * (d / max_demand) for d in user_demands]
-
-    # Identifier les utilisateurs couverts
-    covered_users = set()
-    for site in selected_sites:
-        if site.get('built', False):
-            site_x, site_y = site['x'], site['y']
-            # Vérifier quels utilisateurs sont dans le rayon
-            for i, user in enumerate(users):
-                distance = ((user['x'] - site_x)**2 + (user['y'] - site_y)**2) ** 0.5
-                if distance <= coverage_radius:
-                    covered_users.add(i)
+    max_demand = user_demands.max() if len(users) and user_demands.max() else 1
+    user_sizes = 20 + 80 * (user_demands / max_demand)
+    dense = len(users) > DENSE_POINTS
+    if dense:
+        user_sizes *= np.sqrt(DENSE_POINTS / len(users))
+    user_edges = 'none' if dense else 'face'
+
+    # Identifier les utilisateurs couverts (distance au carré, site par site)
+    built_sites = [site for site in selected_sites if site.get('built', False)]
+    site_xy = _coords(built_sites)
+    covered_mask = np.zeros(len(users), dtype=bool)
+    radius_sq = coverage_radius ** 2
+    for sx, sy in site_xy:
+        covered_mask |= ((user_xy[:, 0] - sx) ** 2 + (user_xy[:, 1] - sy) ** 2) <= radius_sq
+    num_covered = int(covered_mask.sum())
+    num_uncovered = len(users) - num_covered
 
     # Tracer utilisateurs non couverts
-    uncovered_indices = [i for i in range(len(users)) if i not in covered_users]
-    if uncovered_indices:
-        unc_x = [user_x[i] for i in uncovered_indices]
-        unc_y = [user_y[i] for i in uncovered_indices]
-        unc_sizes = [user_sizes[i] for i in uncovered_indices]
-        ax.scatter(unc_x, unc_y, s=unc_sizes, color=colors['uncovered_users'],
-                  alpha=0.6, label=f'Non Couverts ({len(uncovered_indices)})', zorder=2)
+    if num_uncovered:
+        unc = ~covered_mask
+        ViewportLayer(ax, user_xy[unc], sizes=user_sizes[unc],
+                      density_color=colors['uncovered_users'],
+                      color=colors['uncovered_users'], edgecolors=user_edges,
+                      alpha=0.6, label=f'Non Couverts ({num_uncovered})', zorder=2)
 
     # Tracer utilisateurs couverts
-    if covered_users:
-        cov_x = [user_x[i] for i in covered_users]
-        cov_y = [user_y[i] for i in covered_users]
-        cov_sizes = [user_sizes[i] for i in covered_users]
-        ax.scatter(cov_x, cov_y, s=cov_sizes, color=colors['covered_users'],
-                  alpha=0.8, label=f'Couverts ({len(covered_users)})', zorder=3)
+    if num_covered:
+        ViewportLayer(ax, user_xy[covered_mask], sizes=user_sizes[covered_mask],
+                      density_color=colors['covered_users'],
+                      color=colors['covered_users'], edgecolors=user_edges,
+                      alpha=0.8, label=f'Couverts ({num_covered})', zorder=3)
 
     # Tracer les sites sélectionnés
-    for site in selected_sites:
-        if site.get('built', False):
-            # Site avec antenne
-            ax.scatter(site['x'], site['y'], s=300, marker='^',
-                      color=colors['selected_sites'], edgecolors='black',
-                      linewidth=2, label='Antenne' if not ax.get_legend() else "", zorder=5)
-
-            # Zone de couverture
-            circle = plt.Circle((site['x'], site['y']), coverage_radius,
-                              fill=True, alpha=0.1, color=colors['selected_sites'])  # Use hex color
-            ax.add_patch(circle)
-
-            # Ligne de couverture
-            circle_edge = plt.Circle((site['x'], site['y']), coverage_radius,
-                                   fill=False, alpha=0.5, color=colors['selected_sites'],
-                                   linestyle='--', linewidth=1)
-            ax.add_patch(circle_edge)
-
-            # Étiquette du site
-            capacity = site.get('capacity', 0)
-            num_users = site.get('num_users', 0)
-            label = f"{site.get('name', f'Site')}\nCap: {capacity}\nUsers: {num_users}"
-
-            ax.annotate(label,
-                       xy=(site['x'], site['y']),
-                       xytext=(0, 15),
-                       textcoords='offset points',
-                       ha='center', va='center',
-                       fontsize=8,
-                       bbox=dict(boxstyle='round,pad=0.3',
-                                facecolor='white',
-                                alpha=0.9,
-                                edgecolor='black'))
-
-            # Lignes vers les utilisateurs affectés
-            for user in site.get('assigned_users', []):
-                ax.plot([site['x'], user['x']], [site['y'], user['y']],
-                       color=colors['selected_sites'], alpha=0.3,
-                       linewidth=1, linestyle='-', zorder=1)
+    if built_sites:
+        # Sites avec antenne
+        ax.scatter(site_xy[:, 0], site_xy[:, 1], s=300, marker='^',
+                  color=colors['selected_sites'], edgecolors='black',
+                  linewidth=2, label='Antenne', zorder=5)
+
+        # Zones de couverture
+        _add_circles(ax, site_xy, coverage_radius, colors['selected_sites'],
+                     fill_alpha=0.1, edge_alpha=0.5, linestyle='--')
+
+        # Étiquettes des sites visibles
+        ViewportLayer(ax, site_xy,
+                      labels=[f"{site.get('name', f'Site')}\nCap: {site.get('capacity', 0)}"
+                              f"\nUsers: {site.get('num_users', 0)}"
+                              for site in built_sites],
+                      label_kwargs=dict(xytext=(0, 15),
+                                        textcoords='offset points',
+                                        ha='center', va='center',
+                                        fontsize=8,
+                                        bbox=dict(boxstyle='round,pad=0.3',
+                                                  facecolor='white',
+                                                  alpha=0.9,
+                                                  edgecolor='black')),
+                      points=False)
+
+        # Lignes vers les utilisateurs affectés (assigned_users: leurs indices)
+        members = [np.asarray(site.get('assigned_users', []), dtype=np.int64) for site in built_sites]
+        counts = np.array([len(m) for m in members], dtype=np.int64)
+        if counts.sum():
+            segments = np.stack([np.repeat(site_xy, counts, axis=0),
+                                 user_xy[np.concatenate(members)]], axis=1)
+            ax.add_collection(LineCollection(segments, colors=colors['selected_sites'],
+                                             alpha=0.3, linewidths=1, linestyles='-',
+                                             zorder=1))
 
     # Configuration
     ax.set_xlabel('Position X', fontsize=12, fontweight='bold')
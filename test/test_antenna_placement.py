@@ -0,0 +1,94 @@
+import pytest
+
+from modules.subject_antenna_placement.lagrangian import solve_lagrangian
+from modules.subject_antenna_placement.solver import AntennaPlacementSolver
+from shared.backends import HIGHS, NO_SOLUTION
+
+# Données d'exemple de l'application (onglet antennes)
+USERS = [(1, 1), (2, 3), (4, 2), (3, 5), (5, 4), (6, 1), (2, 6), (4, 7), (7, 3), (8, 5)]
+SITES = [(2, 2), (3, 6), (4, 4), (6, 2), (7, 5), (1, 4)]
+SETUP_COSTS = [50000, 55000, 60000, 52000, 58000, 48000]
+CAPACITIES = [50.0, 100.0, 150.0, 200.0]
+
+
+def make_solver(users, sites, setup_costs, radius, max_antennas, capacities=CAPACITIES):
+    return AntennaPlacementSolver(
+        [{'id': i, 'x': x, 'y': y, 'demand': 1} for i, (x, y) in enumerate(users)],
+        [{'id': j, 'x': x, 'y': y, 'name': f"Site {j}"} for j, (x, y) in enumerate(sites)],
+        setup_costs=list(setup_costs), capacities=list(capacities), coverage_radius=radius,
+        max_antennas=max_antennas)
+
+
+def test_lagrangian_feasible_relaxation_keeps_incumbent():
+    # La relaxation affecte chaque utilisateur une fois dès les premières
+    # itérations (sous-gradient nul): l'arrêt doit garder cette solution
+    data = make_solver(USERS, SITES, SETUP_COSTS, radius=5, max_antennas=5).model_data
+    relaxed = solve_lagrangian(data.connection_costs, data.setup_costs, data.capacities,
+                               max_antennas=data.max_antennas,
+                               min_coverage=int(data.num_users * 0.8))
+    assert relaxed['status'] != NO_SOLUTION
+    assert (relaxed['site_of'] >= 0).all()
+    assert relaxed['objective'] == pytest.approx(62761.23, abs=0.01)
+    assert relaxed['objective'] == pytest.approx(relaxed['lower_bound'])
+
+
+def test_tile_without_relaxed_solution_is_left_unassigned(monkeypatch):
+    from modules.subject_antenna_placement import tiling
+
+    # PLNE et relaxation de la tuile sans solution
+    monkeypatch.setattr(AntennaPlacementSolver, '_solve_arrays', lambda *args, **kwargs: None)
+    monkeypatch.setattr(tiling, 'solve_lagrangian',
+                        lambda *args, **kwargs: {'status': NO_SOLUTION, 'site_of': None})
+    solver = make_solver(USERS, SITES, SETUP_COSTS, radius=5, max_antennas=5)
+    d = solver.model_data
+    task = (d.users, d.candidate_sites, d.setup_costs, d.connection_costs, d.capacities,
+            d.coverage_radius, d.max_antennas, HIGHS, False)
+    assert (tiling._solve_tile(task) == -1).all()
+
+
+def test_tiled_falls_back_without_repaired_solution(monkeypatch, capsys):
+    from modules.subject_antenna_placement import solver as antenna_solver
+
+    monkeypatch.setattr(antenna_solver, 'repair_boundary', lambda *args, **kwargs: None)
+    monkeypatch.setattr(antenna_solver, 'solve_lagrangian',
+                        lambda *args, **kwargs: {'status': NO_SOLUTION, 'site_of': None})
+    solver = make_solver(USERS, SITES, SETUP_COSTS, radius=5, max_antennas=5)
+    result = solver.solve_tiled(tile_size=5.0, workers=1, backend=HIGHS)
+    assert result['status'] == "Fallback"
+    assert "after boundary repair" in capsys.readouterr().out
+
+
+@pytest.fixture(scope='module')
+def seeded():
+    from benchmarks.generators import antenna
+
+    instance = antenna(60, seed=2)
+    solver = AntennaPlacementSolver(instance['users'], instance['candidate_sites'],
+                                    coverage_radius=instance['coverage_radius'])
+    return solver, solver.solve(backend=HIGHS)
+
+
+def test_lagrangian_matches_milp(seeded):
+    solver, milp = seeded
+    result = solver.solve_lagrangian()
+    assert result['objective'] == pytest.approx(milp['objective'], rel=1e-6)
+    assert result['lower_bound'] <= milp['objective'] + 1e-6
+
+
+def test_tiled_matches_milp(seeded):
+    solver, milp = seeded
+    # Tuiles par défaut: l'instance tient dans une seule tuile
+    result = solver.solve_tiled(workers=1, backend=HIGHS)
+    assert result['tiles'] == 1
+    assert result['objective'] == pytest.approx(milp['objective'], rel=1e-6)
+
+
+def test_small_tiles_stay_feasible(seeded):
+    solver, milp = seeded
+    d = solver.model_data
+    result = solver.solve_tiled(tile_size=2 * d.coverage_radius, workers=1, backend=HIGHS)
+    assert result['tiles'] > 1 and result['status'] == "Feasible"
+    assert result['objective'] >= milp['objective'] - 1e-6
+    assert result['covered_users'] >= int(d.num_users * 0.8)
+    for site in result['selected_sites']:
+        assert site['num_users'] <= site['capacity']
@@ -0,0 +1,35 @@
+import numpy as np
+
+from benchmarks.generators import mis
+from modules.subject_mis_scheduling.model import MISModel
+from modules.subject_mis_scheduling.solver import MISSolver
+from shared.backends import HIGHS
+
+
+def test_neighbour_lists_match_conflicts():
+    tasks = [{'id': i, 'priority': 1} for i in range(6)]
+    # Doublons, ordre inversé, boucle et indice hors bornes ignorés
+    model = MISModel(tasks, [(0, 1), (1, 0), (2, 5), (3, 3), (4, 9), (1, 4)])
+    np.testing.assert_array_equal(model.conflict_pairs, [[0, 1], [1, 4], [2, 5]])
+    assert model.get_task_conflicts(1) == [0, 4]
+    assert model.get_task_conflicts(3) == []
+    assert model.get_task_degree(1) == 2
+    assert model.are_conflicting(5, 2) and not model.are_conflicting(0, 4)
+
+
+def test_highs_extraction_from_neighbours():
+    instance = mis(300, seed=1)
+    solver = MISSolver(**instance)
+    result = solver.solve(backend=HIGHS)
+    assert result['status'] == "Optimal" and result['is_valid']
+    model = solver.model_data
+    for task in result['selected_tasks']:
+        i = task['id']
+        expected = sorted({b for a, b in model.conflicts if a == i}
+                          | {a for a, b in model.conflicts if b == i})
+        assert task['conflicting_tasks'] == expected
+
+    # Deux tâches en conflit sélectionnées: solution invalide
+    values = np.zeros(model.num_tasks)
+    values[model.conflict_pairs[0]] = 1.0
+    assert not solver._extract_solution(values, 0.0, False)['is_valid']
@@ -0,0 +1,39 @@
+import pytest
+
+from benchmarks.generators import telecom
+from modules.subject_telecom_network.solver import TelecomNetworkSolver
+from shared.backends import GUROBI
+
+CITIES = ["Tunis", "Sfax", "Sousse", "Kairouan", "Bizerte", "Gabès", "Gafsa", "Tozeur"]
+
+
+def tunisian(links):
+    nodes = [{'id': i, 'name': name, 'x': i, 'y': 0} for i, name in enumerate(CITIES)]
+    potential_links = [{'from': i, 'to': j, 'distance': 1.0} for i, j in links]
+    demands = [[0 if i == j else 10 for j in range(len(CITIES))] for i in range(len(CITIES))]
+    return TelecomNetworkSolver(nodes, potential_links, demands)
+
+
+def test_key_links_only_for_the_tunisian_example():
+    links = [(0, 1), (0, 2), (1, 5), (5, 7), (6, 7), (2, 4)]
+    star, extra = tunisian(links)._star_links()
+    assert star == [0, 1] and extra == [2, 3, 4]
+
+    # Mêmes indices de nœuds, autres villes: pas de liaisons clés
+    instance = telecom(10, seed=0)
+    instance['potential_links'] = [{'from': i, 'to': j, 'distance': 1.0} for i, j in links]
+    star, extra = TelecomNetworkSolver(**instance)._star_links()
+    assert star == [0, 1] and extra == []
+
+
+def test_warm_start_runs_past_the_first_solution():
+    pytest.importorskip('gurobipy')
+    from shared.telemetry import MilestoneSink, SolverProgress
+
+    instance = telecom(10, seed=0)
+    sink = MilestoneSink(0.1)
+    result = TelecomNetworkSolver(**instance).solve(SolverProgress([sink], interval=0.05),
+                                                    backend=GUROBI)
+    summary = sink.summary()
+    assert summary['time_to_gap'] is not None
+    assert result['objective'] <= summary['first_objective']
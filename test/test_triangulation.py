@@ -0,0 +1,142 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from scipy.optimize import Bounds, LinearConstraint, milp
+
+from modules.subject_triangulation.candidates import candidate_triangles
+from modules.subject_triangulation.partition import (RTree, _boxes_overlap, _distinct_rows,
+                                                     bounding_boxes, conflict_matrix,
+                                                     interiors_overlap, overlapping_pairs)
+from modules.subject_triangulation.set_cover import incidence, solve_set_cover
+
+
+def cover_optimum(vertices, costs):
+    """Optimal cover cost by the MILP (HiGHS)"""
+    A = incidence(vertices)
+    A = A[np.flatnonzero(np.diff(A.indptr))]
+    res = milp(costs, constraints=LinearConstraint(A, lb=1.0), integrality=np.ones(len(costs)),
+               bounds=Bounds(0, 1))
+    assert res.status == 0
+    return res.fun
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('exact', [False, True])
+def test_set_cover_lower_bound_below_milp(seed, exact):
+    rng = np.random.default_rng(seed)
+    n, m = 30, 120
+    vertices = np.array([rng.choice(n, 3, replace=False) for _ in range(m)])
+    costs = rng.uniform(1.0, 10.0, size=m)
+    result = solve_set_cover(vertices, costs, exact_bound=exact)
+    optimum = cover_optimum(vertices, costs)
+    assert result['uncovered'] == 0
+    assert result['lower_bound'] <= optimum + 1e-9
+    assert result['cost'] >= optimum - 1e-9
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('node_size', [2, 4, 16])
+def test_rtree_pairs_match_all_pairs(seed, node_size):
+    rng = np.random.default_rng(seed)
+    n = 300
+    # Coordinates on a coarse grid so that boxes often touch without overlapping
+    low = rng.integers(0, 40, size=(n, 2)).astype(float)
+    boxes = np.hstack([low, low + rng.integers(0, 6, size=(n, 2))])
+    i, j = np.triu_indices(n, k=1)
+    expected = np.column_stack([i, j])[_boxes_overlap(boxes[i], boxes[j])]
+    found = RTree(boxes, node_size=node_size).overlapping_pairs()
+    assert (found[:, 0] < found[:, 1]).all()
+    assert sorted(map(tuple, found.tolist())) == sorted(map(tuple, expected.tolist()))
+
+
+def cross(u, v):
+    return u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]
+
+
+def clip(subject, clipper):
+    """Sutherland-Hodgman clipping of a polygon by a counter-clockwise convex polygon"""
+    polygon = list(subject)
+    for a, b in zip(clipper, np.roll(clipper, -1, axis=0)):
+        inside = [cross(b - a, p - a) >= 0 for p in polygon]
+        clipped = []
+        for k, p in enumerate(polygon):
+            q, q_inside = polygon[k - 1], inside[k - 1]
+            if inside[k] != q_inside:
+                d = p - q
+                t = cross(b - a, a - q) / cross(b - a, d)
+                clipped.append(q + t * d)
+            if inside[k]:
+                clipped.append(p)
+        polygon = clipped
+        if not polygon:
+            break
+    return np.array(polygon).reshape(-1, 2)
+
+
+def polygon_area(polygon):
+    if len(polygon) < 3:
+        return 0.0
+    x, y = polygon[:, 0], polygon[:, 1]
+    return 0.5 * abs(x @ np.roll(y, -1) - y @ np.roll(x, -1))
+
+
+def counter_clockwise(triangle):
+    a, b, c = triangle
+    return triangle if cross(b - a, c - a) > 0 else triangle[::-1]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_interiors_overlap_matches_clipping(seed):
+    rng = np.random.default_rng(seed)
+    # Points of a small grid: shared vertices, shared edges, collinear edges
+    # and containment all show up among the pairs
+    xy = np.array([(x, y) for x in range(5) for y in range(5)], dtype=float)
+    triangles = np.array([rng.choice(len(xy), 3, replace=False) for _ in range(80)])
+    corners = xy[triangles]
+    area = cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    triangles = triangles[area != 0]
+    i, j = np.triu_indices(len(triangles), k=1)
+    pairs = np.column_stack([i, j])
+
+    overlap = interiors_overlap(xy, triangles, pairs)
+    expected = np.array([
+        polygon_area(clip(xy[triangles[a]], counter_clockwise(xy[triangles[b]]))) > 1e-9
+        for a, b in pairs])
+    assert expected.any() and not expected.all()
+    np.testing.assert_array_equal(overlap, expected)
+
+    # The R-tree join keeps every overlapping pair
+    candidates = RTree(bounding_boxes(xy, triangles)).overlapping_pairs()
+    kept = {tuple(p) for p in candidates.tolist()}
+    assert {tuple(p) for p in pairs[expected].tolist()} <= kept
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_clique_rows_cover_every_overlapping_pair(seed):
+    xy = np.random.default_rng(seed).uniform(0, 10, size=(40, 2))
+    triangles = candidate_triangles(xy, order=2)
+    pairs = overlapping_pairs(xy, triangles)
+    conflicts = conflict_matrix(xy, triangles, pairs)
+    pairwise = conflict_matrix(xy, triangles, pairs, cliques=False)
+    assert conflicts.shape[0] < pairwise.shape[0]
+
+    # Every overlapping pair shares a row, and every two triangles of a row overlap
+    together = (conflicts.T @ conflicts).tocsr()
+    assert (np.asarray(together[pairs[:, 0], pairs[:, 1]]).ravel() > 0).all()
+    shared = sp.triu(together, k=1).tocoo()
+    assert {(a, b) for a, b in zip(shared.row.tolist(), shared.col.tolist())} \
+        <= {tuple(p) for p in pairs.tolist()}
+
+    # No clique row twice
+    rows = {tuple(conflicts.indices[conflicts.indptr[r]:conflicts.indptr[r + 1]].tolist())
+            for r in range(conflicts.shape[0])}
+    assert len(rows) == conflicts.shape[0]
+
+
+def test_distinct_rows_keeps_first_occurrences():
+    rows = [[0, 2], [1], [0, 2], [0, 1, 2], [1], [2, 0]]
+    matrix = sp.csr_matrix((np.ones(sum(map(len, rows))),
+                            (np.repeat(np.arange(len(rows)), [len(r) for r in rows]),
+                             np.concatenate(rows))), shape=(len(rows), 3))
+    matrix.sort_indices()
+    np.testing.assert_array_equal(_distinct_rows(matrix), [0, 1, 3])
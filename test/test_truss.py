@@ -0,0 +1,30 @@
+import pytest
+
+pytest.importorskip('gurobipy')
+
+from modules.subject_truss.ground_structure import full_edges, window_edges  # noqa: E402
+from modules.subject_truss.solver import (MEMBER_ADDING, MILP,  # noqa: E402
+                                          solve_member_adding, solve_physical_truss)
+
+# 5x5 grid, supported at the bottom corners, loaded at the top middle node
+NODES = [(float(i), float(j)) for j in range(5) for i in range(5)]
+SUPPORTS = [i in (0, 4) for i in range(len(NODES))]
+LOAD_NODE = 22
+LOAD = (0.0, -1000.0)
+
+
+@pytest.mark.parametrize('mode', [MILP, MEMBER_ADDING])
+@pytest.mark.parametrize('edges', [window_edges, full_edges])
+def test_grid_volume(mode, edges):
+    result = solve_physical_truss(NODES, edges(NODES), SUPPORTS, LOAD_NODE, LOAD, mode=mode)
+    assert result['objective'] == pytest.approx(0.157, rel=1e-6)
+
+
+def test_member_adding_reports_convergence():
+    edges = full_edges(NODES)
+    result = solve_member_adding(NODES, edges, SUPPORTS, LOAD_NODE, LOAD)
+    assert result['converged']
+    # One LP on the nearest-neighbour members, stopped before pricing
+    stopped = solve_member_adding(NODES, edges, SUPPORTS, LOAD_NODE, LOAD, max_iterations=1)
+    assert stopped['iterations'] == 1 and not stopped['converged']
+    assert stopped['lp_objective'] >= result['lp_objective'] - 1e-9